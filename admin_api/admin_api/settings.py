@@ -53,6 +53,7 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    "api_v1.replica.ReplicaRoutingMiddleware",
     "django.middleware.security.SecurityMiddleware",
     "django.contrib.sessions.middleware.SessionMiddleware",
     "django.middleware.common.CommonMiddleware",
@@ -90,9 +91,77 @@ DATABASES = {
     "default": {
         "ENGINE": "django.db.backends.sqlite3",
         "NAME": BASE_DIR / "db.sqlite3",
+        # Lets signal receivers merge the events of a request into one
+        # event per entity, published when the request's transaction commits.
+        "ATOMIC_REQUESTS": True,
+        # Reuse connections across requests instead of reopening the file
+        # and reapplying SQLITE_PRAGMAS on every request.
+        "CONN_MAX_AGE": 600,
+        "CONN_HEALTH_CHECKS": True,
+        "OPTIONS": {
+            # Take the write lock when a transaction begins, so busy_timeout
+            # applies. A deferred transaction that reads and then writes
+            # fails at once with "database is locked" if another connection
+            # wrote in between. Read-only views opt out of ATOMIC_REQUESTS
+            # so that they don't take the lock.
+            "transaction_mode": "IMMEDIATE",
+        },
     }
 }
 
+# Catalog reads of the views using ReplicaReadMixin go to the "replica"
+# database when REPLICA_DB_NAME is set (see api_v1.replica). A local
+# replica can be refreshed from the primary with the sync_replica command.
+if os.getenv("REPLICA_DB_NAME"):
+    DATABASES["replica"] = {
+        **DATABASES["default"],
+        "NAME": os.getenv("REPLICA_DB_NAME"),
+        "TEST": {"MIRROR": "default"},
+    }
+
+DATABASE_ROUTERS = ["api_v1.replica.ReplicaRouter"]
+
+# Seconds for which a client that wrote to the catalog reads it from the
+# primary, the most the replica is expected to lag behind.
+REPLICA_PIN_SECONDS = 5
+
+# Applied to every new SQLite connection (see api_v1.sqlite). The web
+# server and the runrabbitmq consumer write the same database file.
+SQLITE_PRAGMAS = {
+    # Readers don't block the writer, and commits append to the WAL
+    # instead of rewriting database pages.
+    "journal_mode": "wal",
+    # With WAL, NORMAL only fsyncs at checkpoints. A power loss may lose the
+    # last commits but can't corrupt the database.
+    "synchronous": "normal",
+    "mmap_size": 256 * 1024 * 1024,
+    # Negative sizes are in KiB.
+    "cache_size": -64 * 1024,
+    # Milliseconds to wait for the write lock before "database is locked".
+    "busy_timeout": 5000,
+    "temp_store": "memory",
+}
+
+# Borrows moved from BorrowedBook to BorrowedBookHistory by the
+# archive_borrows command (see api_v1.archive): returned borrows due
+# more than RETURNED_DAYS ago, and any borrow due more than DAYS ago.
+BORROW_ARCHIVE = {
+    "RETURNED_DAYS": 30,
+    "DAYS": 365,
+    "CHUNK_SIZE": 1000,
+}
+
+# Optional single-writer group commit (see api_v1.writer). When enabled,
+# writes made through run_write() are committed by one writer thread per
+# process, in transactions of up to MAX_WRITES writes or of the writes
+# submitted within MAX_DELAY_MS of the first one. With 0, a group is the
+# writes queued while the previous group was committing.
+GROUP_COMMIT = {
+    "ENABLED": False,
+    "MAX_WRITES": 64,
+    "MAX_DELAY_MS": 0,
+}
+
 
 # Password validation
 # https://docs.djangoproject.com/en/5.1/ref/settings/#auth-password-validators
@@ -142,10 +211,10 @@ AUTHENTICATION_BACKENDS = [
 
 REST_FRAMEWORK = {
     "DEFAULT_SCHEMA_CLASS": "drf_spectacular.openapi.AutoSchema",
-    "DEFAULT_PAGINATION_CLASS": "rest_framework.pagination.LimitOffsetPagination",
+    "DEFAULT_PAGINATION_CLASS": "api_v1.pagination.KeysetPagination",
     "PAGE_SIZE": 10,
     "DEFAULT_AUTHENTICATION_CLASSES": (
-        "rest_framework_simplejwt.authentication.JWTAuthentication",
+        "api_v1.authentication.CachedJWTAuthentication",
     ),
 }
 
@@ -157,6 +226,29 @@ SPECTACULAR_SETTINGS = {
     "COMPONENT_SPLIT_REQUEST": True,
 }
 
+# Users authenticated by CachedJWTAuthentication are cached by each process
+# for TTL_SECONDS (see api_v1.authentication). Saves and deletes drop them
+# from the cache of their own process, and the other processes drop all
+# their users within SYNC_SECONDS.
+JWT_USER_CACHE = {
+    "MAX_SIZE": 10000,
+    "TTL_SECONDS": 60,
+    "SYNC_SECONDS": 5,
+}
+
+# Blacklisted refresh tokens (see api_v1.blacklist). Each process checks
+# tokens against a Bloom filter of the blacklisted jtis first, with a
+# FILTER_ERROR_RATE of false positives that query the database. It reads
+# the tokens other processes blacklisted every SYNC_SECONDS. The
+# prune_tokens command deletes expired tokens, PRUNE_CHUNK_SIZE per
+# transaction.
+TOKEN_BLACKLIST = {
+    "FILTER_CAPACITY": 100000,
+    "FILTER_ERROR_RATE": 0.001,
+    "SYNC_SECONDS": 60,
+    "PRUNE_CHUNK_SIZE": 1000,
+}
+
 SIMPLE_JWT = {
     "ACCESS_TOKEN_LIFETIME": timedelta(minutes=100),
     "REFRESH_TOKEN_LIFETIME": timedelta(minutes=400),
@@ -0,0 +1,60 @@
+from datetime import timedelta
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Q
+from django.utils import timezone
+
+from api_v1.filters import is_returned
+from api_v1.models import BorrowedBook, BorrowedBookHistory
+
+ARCHIVED_FIELDS = (
+    "id",
+    "created_at",
+    "updated_at",
+    "user_id",
+    "book_id",
+    "borrowed_date",
+    "due_date",
+)
+
+
+def get_archivable_borrows(now=None):
+    """
+    Return the borrows to archive: returned borrows due more than
+    `BORROW_ARCHIVE["RETURNED_DAYS"]` days ago, and any borrow due more than
+    `BORROW_ARCHIVE["DAYS"]` days ago, oldest due first.
+    """
+    now = now or timezone.now()
+    options = settings.BORROW_ARCHIVE
+    returned_before = now - timedelta(days=options["RETURNED_DAYS"])
+    due_before = now - timedelta(days=options["DAYS"])
+
+    return (
+        BorrowedBook.objects.filter(due_date__lt=returned_before)
+        .filter(Q(due_date__lt=due_before) | is_returned())
+        .order_by("due_date", "id")
+    )
+
+
+def archive_borrows(chunk_size=None, now=None):
+    """
+    Move the archivable borrows to BorrowedBookHistory, `chunk_size` borrows
+    per transaction so that the write lock is only held briefly. Return the
+    number of borrows archived.
+    """
+    chunk_size = chunk_size or settings.BORROW_ARCHIVE["CHUNK_SIZE"]
+    borrows = get_archivable_borrows(now).values_list(*ARCHIVED_FIELDS)
+
+    archived = 0
+    while True:
+        with transaction.atomic():
+            chunk = list(borrows[:chunk_size])
+            if not chunk:
+                return archived
+
+            BorrowedBookHistory.objects.bulk_create(
+                BorrowedBookHistory(**dict(zip(ARCHIVED_FIELDS, row))) for row in chunk
+            )
+            BorrowedBook.objects.filter(id__in=[row[0] for row in chunk]).delete()
+
+        archived += len(chunk)
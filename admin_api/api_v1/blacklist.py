@@ -0,0 +1,163 @@
+import math
+import time
+import hashlib
+import threading
+from django.conf import settings
+from django.db import transaction
+from django.utils import timezone
+from django.utils.translation import gettext_lazy as _
+from rest_framework_simplejwt import tokens
+from rest_framework_simplejwt.exceptions import TokenError
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.token_blacklist.models import (
+    BlacklistedToken,
+    OutstandingToken,
+)
+
+
+class BloomFilter:
+    """
+    Set of strings answering "maybe" or "no" in constant memory: about
+    1.44 * log2(1 / error_rate) bits per string for `capacity` strings.
+    """
+
+    def __init__(self, capacity, error_rate):
+        self.capacity = capacity
+        bits = -capacity * math.log(error_rate) / math.log(2) ** 2
+        self.size = max(8, math.ceil(bits))
+        self.hash_count = max(1, round(self.size / capacity * math.log(2)))
+        self.bits = bytearray((self.size + 7) // 8)
+        self.count = 0
+
+    def positions(self, key):
+        # Double hashing: the bit positions are h1 + i * h2.
+        digest = hashlib.blake2b(key.encode(), digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], "little")
+        h2 = int.from_bytes(digest[8:], "little") | 1
+        return ((h1 + i * h2) % self.size for i in range(self.hash_count))
+
+    def add(self, key):
+        for position in self.positions(key):
+            self.bits[position >> 3] |= 1 << (position & 7)
+        self.count += 1
+
+    def __contains__(self, key):
+        return all(
+            self.bits[position >> 3] & (1 << (position & 7))
+            for position in self.positions(key)
+        )
+
+
+class BlacklistFilter:
+    """
+    Bloom filter of the jtis of the unexpired blacklisted tokens, so that
+    checking a token that isn't blacklisted doesn't query the database.
+
+    It is built from BlacklistedToken on first use and rebuilt, twice as
+    large, once it holds more than its capacity. Every
+    `TOKEN_BLACKLIST["SYNC_SECONDS"]` it reads the tokens blacklisted since,
+    by other processes. A token blacklisted in between is caught when it is
+    blacklisted again (see RefreshToken.blacklist).
+    """
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.filter = None
+        self.last_id = 0
+        self.synced_at = None
+
+    def rebuild(self):
+        options = settings.TOKEN_BLACKLIST
+        rows = list(
+            BlacklistedToken.objects.filter(token__expires_at__gt=timezone.now())
+            .order_by("id")
+            .values_list("id", "token__jti")
+        )
+        self.filter = BloomFilter(
+            max(options["FILTER_CAPACITY"], 2 * len(rows)),
+            options["FILTER_ERROR_RATE"],
+        )
+        self.last_id = 0
+        self.add_rows(rows)
+
+    def sync(self):
+        rows = (
+            BlacklistedToken.objects.filter(id__gt=self.last_id)
+            .order_by("id")
+            .values_list("id", "token__jti")
+        )
+        self.add_rows(rows)
+
+    def add_rows(self, rows):
+        for blacklisted_id, jti in rows:
+            self.filter.add(jti)
+            self.last_id = blacklisted_id
+        self.synced_at = time.monotonic()
+
+    def might_contain(self, jti):
+        sync_seconds = settings.TOKEN_BLACKLIST["SYNC_SECONDS"]
+        with self.lock:
+            if self.filter is None or self.filter.count > self.filter.capacity:
+                self.rebuild()
+            elif time.monotonic() - self.synced_at >= sync_seconds:
+                self.sync()
+            return jti in self.filter
+
+    def add(self, jti):
+        with self.lock:
+            if self.filter is not None:
+                self.filter.add(jti)
+
+    def clear(self):
+        with self.lock:
+            self.filter = None
+
+
+blacklist_filter = BlacklistFilter()
+
+
+class RefreshToken(tokens.RefreshToken):
+    """RefreshToken checking `blacklist_filter` before the blacklist."""
+
+    def check_blacklist(self):
+        if blacklist_filter.might_contain(self.payload[api_settings.JTI_CLAIM]):
+            super().check_blacklist()
+
+    def blacklist(self):
+        """
+        Blacklist the token, raising TokenError if it already was. This
+        catches the tokens the filter of this process doesn't have yet.
+        """
+        blacklisted, created = super().blacklist()
+        if not created:
+            raise TokenError(_("Token is blacklisted"))
+
+        blacklist_filter.add(self.payload[api_settings.JTI_CLAIM])
+        return blacklisted, created
+
+
+def prune_tokens(chunk_size=None, now=None):
+    """
+    Delete the expired outstanding tokens, and their BlacklistedToken rows,
+    `chunk_size` tokens per transaction so that the write lock is only held
+    briefly. Return the number of tokens deleted.
+    """
+    chunk_size = chunk_size or settings.TOKEN_BLACKLIST["PRUNE_CHUNK_SIZE"]
+    now = now or timezone.now()
+    # Expired tokens are the oldest, so scanning by id finds them first.
+    expired = (
+        OutstandingToken.objects.filter(expires_at__lte=now)
+        .order_by("id")
+        .values_list("id", flat=True)
+    )
+
+    deleted = 0
+    while True:
+        with transaction.atomic():
+            chunk = list(expired[:chunk_size])
+            if not chunk:
+                return deleted
+
+            OutstandingToken.objects.filter(id__in=chunk).delete()
+
+        deleted += len(chunk)
@@ -0,0 +1,27 @@
+from api_v1.ids import uuid7
+from api_v1.models import CacheGeneration
+
+# Generation of the admins, replaced when one is updated or deleted.
+USER_GENERATION = "users"
+
+
+def get_generation(name, using=None):
+    """
+    Return the current generation of `name`, or None until it first
+    changes, read from the database `using`.
+    """
+    generations = CacheGeneration.objects.using(using).filter(name=name)
+    try:
+        return generations.values_list("generation", flat=True).get()
+    except CacheGeneration.DoesNotExist:
+        return None
+
+
+def bump_generation(name):
+    """Invalidate the cache entries of `name` by starting a new generation."""
+    generation = uuid7()
+    if not CacheGeneration.objects.filter(name=name).update(generation=generation):
+        CacheGeneration.objects.bulk_create(
+            [CacheGeneration(name=name, generation=generation)],
+            ignore_conflicts=True,
+        )
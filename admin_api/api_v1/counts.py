@@ -0,0 +1,128 @@
+from collections import Counter
+from django.db import transaction
+from django.db.models import Count, F, Sum
+from django_filters.constants import EMPTY_VALUES
+from rest_framework.settings import api_settings
+
+from api_v1.models import Book, BookCount
+from api_v1.filters import ASCII_LOWERCASE
+
+# Book fields BookCount is keyed by, which are also the filters it answers.
+COUNTED_FIELDS = ("is_available", "category", "publisher")
+
+
+def get_count_key(is_available, category, publisher):
+    """
+    Return the BookCount key of a book. Category and publisher are lowered
+    like the case-insensitive filters on them, which only lower ASCII letters.
+    """
+    return (
+        bool(is_available),
+        category.translate(ASCII_LOWERCASE),
+        publisher.translate(ASCII_LOWERCASE),
+    )
+
+
+def get_book_count_key(book):
+    return get_count_key(*(getattr(book, field) for field in COUNTED_FIELDS))
+
+
+def adjust_book_count(key, delta):
+    """Add `delta` to the number of books with the BookCount key `key`."""
+    if not delta:
+        return
+
+    lookup = dict(zip(COUNTED_FIELDS, key))
+    with transaction.atomic():
+        BookCount.objects.bulk_create([BookCount(**lookup)], ignore_conflicts=True)
+        BookCount.objects.filter(**lookup).update(count=F("count") + delta)
+
+
+def move_book_count(old_key, new_key):
+    """Move one book from the BookCount key `old_key` to `new_key`."""
+    if old_key == new_key:
+        return
+
+    if old_key is not None:
+        adjust_book_count(old_key, -1)
+    if new_key is not None:
+        adjust_book_count(new_key, 1)
+
+
+def update_books(queryset, **values):
+    """
+    `queryset.update(**values)` for writes that bypass the model signals,
+    moving the updated books between BookCount keys.
+    """
+    if not set(values) & set(COUNTED_FIELDS):
+        return queryset.update(**values)
+
+    with transaction.atomic():
+        old_keys = Counter(
+            get_count_key(*row)
+            for row in queryset.values_list(*COUNTED_FIELDS).iterator()
+        )
+        updated = queryset.update(**values)
+
+        for old_key, count in old_keys.items():
+            new_key = get_count_key(
+                *(
+                    values.get(field, value)
+                    for field, value in zip(COUNTED_FIELDS, old_key)
+                )
+            )
+            if new_key != old_key:
+                adjust_book_count(old_key, -count)
+                adjust_book_count(new_key, count)
+
+    return updated
+
+
+def count_books(**filters):
+    """Return the number of books matching `filters` on COUNTED_FIELDS."""
+    for field in ("category", "publisher"):
+        if field in filters:
+            filters[field] = filters[field].translate(ASCII_LOWERCASE)
+
+    total = BookCount.objects.filter(**filters).aggregate(total=Sum("count"))
+    return total["total"] or 0
+
+
+def count_filtered_books(view, request, **filters):
+    """
+    Return the number of books a list view returns for `request` from
+    BookCount, or None if the request filters on something else.
+    """
+    if request.query_params.get(api_settings.SEARCH_PARAM):
+        return None
+
+    filterset = view.filterset_class(request.query_params, request=request)
+    if not filterset.is_valid():
+        return None
+
+    for name, value in filterset.form.cleaned_data.items():
+        if value in EMPTY_VALUES:
+            continue
+        if name not in COUNTED_FIELDS:
+            return None
+        if name in filters and filters[name] != value:
+            return 0
+        filters[name] = value
+
+    return count_books(**filters)
+
+
+def rebuild_book_counts():
+    """Recompute BookCount from the book table. Returns the number of keys."""
+    counts = Counter()
+    rows = Book.objects.order_by().values(*COUNTED_FIELDS).annotate(n=Count("id"))
+    for row in rows.iterator():
+        counts[get_count_key(*(row[field] for field in COUNTED_FIELDS))] += row["n"]
+
+    with transaction.atomic():
+        BookCount.objects.all().delete()
+        BookCount.objects.bulk_create(
+            BookCount(**dict(zip(COUNTED_FIELDS, key)), count=count)
+            for key, count in counts.items()
+        )
+    return len(counts)
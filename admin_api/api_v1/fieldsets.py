@@ -0,0 +1,94 @@
+from drf_spectacular.utils import OpenApiParameter
+from rest_framework import serializers
+from rest_framework.permissions import SAFE_METHODS
+
+from api_v1.values import get_serializer_columns
+
+SPARSE_FIELDSET_PARAMETERS = [
+    OpenApiParameter(
+        name="fields",
+        type=str,
+        description="Comma-separated list of the fields to return.",
+    ),
+    OpenApiParameter(
+        name="exclude",
+        type=str,
+        description="Comma-separated list of fields to leave out.",
+    ),
+]
+
+
+def parse_field_names(value):
+    return {name.strip() for name in value.split(",") if name.strip()}
+
+
+class SparseFieldsetMixin:
+    """
+    Model serializer mixin narrowing the output of read requests to the
+    fields named in `?fields=` and not named in `?exclude=`.
+
+    Only the top-level serializer of a response is narrowed; nested
+    serializers always render all their fields.
+    """
+
+    def is_response_root(self):
+        parent = self.parent
+        if isinstance(parent, serializers.ListSerializer):
+            parent = parent.parent
+        return parent is None
+
+    def get_fields(self):
+        fields = super().get_fields()
+
+        request = self.context.get("request")
+        if (
+            request is None
+            or request.method not in SAFE_METHODS
+            or not self.is_response_root()
+        ):
+            return fields
+
+        only = parse_field_names(request.query_params.get("fields", ""))
+        exclude = parse_field_names(request.query_params.get("exclude", ""))
+
+        if only:
+            fields = {name: field for name, field in fields.items() if name in only}
+        for name in exclude:
+            fields.pop(name, None)
+
+        return fields
+
+
+class ColumnPruningMixin:
+    """
+    View mixin restricting the queryset with `.only()` to the columns the
+    view's serializer renders, including the ones narrowed out by sparse
+    fieldsets.
+    """
+
+    def get_queryset(self):
+        return self.prune_columns(super().get_queryset())
+
+    def prune_columns(self, queryset):
+        if self.request.method in SAFE_METHODS:
+            columns = get_serializer_columns(self.get_serializer())
+            if columns is not None:
+                queryset = self.prune_select_related(queryset, columns)
+                queryset = queryset.only(*columns)
+
+        return queryset
+
+    @staticmethod
+    def prune_select_related(queryset, columns):
+        """Stop joining relations whose columns were narrowed out."""
+        select_related = queryset.query.select_related
+        if not isinstance(select_related, dict):
+            return queryset
+
+        queryset = queryset.select_related(None)
+
+        kept = [name for name in select_related if name in columns]
+        if kept:
+            queryset = queryset.select_related(*kept)
+
+        return queryset
@@ -1,12 +1,93 @@
-from django_filters import FilterSet, CharFilter
+import string
+from django.utils import timezone
+from django.db.models import Exists, OuterRef, Q
+from django.db.models.lookups import Exact
+from django.db.models.functions import Lower
+from django_filters.constants import EMPTY_VALUES
+from django_filters import (
+    FilterSet,
+    BooleanFilter,
+    CharFilter,
+    IsoDateTimeFilter,
+    UUIDFilter,
+)
 
-from api_v1.models import Book
+from api_v1.models import Book, BorrowedBook, BorrowedBookHistory
+
+
+# SQLite's LOWER() and LIKE only fold the case of ASCII letters.
+ASCII_LOWERCASE = str.maketrans(string.ascii_uppercase, string.ascii_lowercase)
+
+
+class LowerExactFilter(CharFilter):
+    """
+    Case-insensitive exact match written as `LOWER(field) = value`, which can
+    use a `Lower(field)` index. On SQLite `iexact` compiles to `LIKE`, which
+    can't. Like both, it only ignores the case of ASCII letters.
+    """
+
+    def filter(self, qs, value):
+        if value in EMPTY_VALUES:
+            return qs
+
+        if self.distinct:
+            qs = qs.distinct()
+        value = value.translate(ASCII_LOWERCASE)
+        return self.get_method(qs)(Exact(Lower(self.field_name), value))
 
 
 class BookFilter(FilterSet):
-    category = CharFilter(field_name="category", lookup_expr="iexact")
-    publisher = CharFilter(field_name="publisher", lookup_expr="iexact")
+    category = LowerExactFilter(field_name="category")
+    publisher = LowerExactFilter(field_name="publisher")
+    available_before = IsoDateTimeFilter(field_name="available_on", lookup_expr="lte")
 
     class Meta:
         model = Book
         fields = ["category", "publisher", "is_available"]
+
+
+def is_returned():
+    """
+    Returns aren't recorded: a borrow is returned once its book is
+    available again, or once the book was borrowed again, by a borrow in
+    progress or one already archived.
+    """
+    later = Q(book=OuterRef("book"), borrowed_date__gt=OuterRef("borrowed_date"))
+    return (
+        Q(book__is_available=True)
+        | Q(Exists(BorrowedBook.objects.filter(later)))
+        | Q(Exists(BorrowedBookHistory.objects.filter(later)))
+    )
+
+
+class BorrowedBookFilter(FilterSet):
+    """
+    Active borrows are the ones not returned yet whose due date hasn't
+    passed, and overdue borrows the ones not returned whose due date has.
+    Both read a range of the due date index.
+    """
+
+    active = BooleanFilter(method="filter_active")
+    overdue = BooleanFilter(method="filter_overdue")
+
+    class Meta:
+        model = BorrowedBook
+        fields = ["user"]
+
+    def filter_active(self, queryset, name, value):
+        due = Q(due_date__gte=timezone.now())
+        if value:
+            return queryset.filter(due).exclude(is_returned())
+        return queryset.filter(~due | is_returned())
+
+    def filter_overdue(self, queryset, name, value):
+        due = Q(due_date__lt=timezone.now())
+        if value:
+            return queryset.filter(due).exclude(is_returned())
+        return queryset.filter(~due | is_returned())
+
+
+class BorrowHistoryFilter(FilterSet):
+    """Filters the borrows of BorrowedBook and of BorrowedBookHistory alike."""
+
+    user = UUIDFilter(field_name="user")
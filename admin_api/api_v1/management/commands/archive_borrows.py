@@ -0,0 +1,21 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from api_v1.archive import archive_borrows
+
+
+class Command(BaseCommand):
+    help = "Moves the borrows that are over from BorrowedBook to BorrowedBookHistory"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--chunk-size",
+            type=int,
+            default=settings.BORROW_ARCHIVE["CHUNK_SIZE"],
+            help="Number of borrows moved per transaction.",
+        )
+
+    def handle(self, *args, **options):
+        archived = archive_borrows(chunk_size=options["chunk_size"])
+
+        self.stdout.write(self.style.SUCCESS(f"Archived {archived} borrow(s)."))
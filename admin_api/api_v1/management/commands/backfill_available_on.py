@@ -0,0 +1,67 @@
+from datetime import timedelta
+from django.db.models import Max, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+from django.core.management.base import BaseCommand
+
+from api_v1.models import Book, BorrowedBookHistory
+
+
+class Command(BaseCommand):
+    help = "Fills Book.available_on from the due dates of borrowed books"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=500,
+            help="Number of books updated per query.",
+        )
+
+    def handle(self, *args, **options):
+        batch_size = options["batch_size"]
+
+        cleared = Book.objects.filter(
+            is_available=True, available_on__isnull=False
+        ).update(available_on=None)
+
+        # Borrows overdue for long enough have been moved to the history.
+        last_archived_due_date = (
+            BorrowedBookHistory.objects.filter(book=OuterRef("pk"))
+            .order_by("-due_date")
+            .values("due_date")[:1]
+        )
+        books = (
+            Book.objects.filter(is_available=False)
+            .annotate(
+                last_due_date=Coalesce(
+                    Max("borrowedbook__due_date"), Subquery(last_archived_due_date)
+                )
+            )
+            .only("id", "available_on")
+        )
+
+        updated = 0
+        batch = []
+        for book in books.iterator(chunk_size=batch_size):
+            if book.last_due_date is None:
+                available_on = None
+            else:
+                available_on = book.last_due_date + timedelta(days=1)
+
+            if book.available_on != available_on:
+                book.available_on = available_on
+                batch.append(book)
+
+            if len(batch) == batch_size:
+                updated += Book.objects.bulk_update(batch, ["available_on"])
+                batch = []
+
+        if batch:
+            updated += Book.objects.bulk_update(batch, ["available_on"])
+
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Updated available_on of {updated} borrowed book(s), "
+                f"cleared it on {cleared} available book(s)."
+            )
+        )
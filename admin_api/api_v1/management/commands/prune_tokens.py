@@ -0,0 +1,21 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from api_v1.blacklist import prune_tokens
+
+
+class Command(BaseCommand):
+    help = "Deletes the expired outstanding and blacklisted tokens"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--chunk-size",
+            type=int,
+            default=settings.TOKEN_BLACKLIST["PRUNE_CHUNK_SIZE"],
+            help="Number of tokens deleted per transaction.",
+        )
+
+    def handle(self, *args, **options):
+        deleted = prune_tokens(chunk_size=options["chunk_size"])
+
+        self.stdout.write(self.style.SUCCESS(f"Pruned {deleted} token(s)."))
@@ -0,0 +1,26 @@
+from django.db import DEFAULT_DB_ALIAS, connections
+from django.core.management.base import BaseCommand
+
+from api_v1.search import book_search_index
+
+
+class Command(BaseCommand):
+    help = "Rebuilds the full-text search index of books, e.g. after a VACUUM"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--database",
+            default=DEFAULT_DB_ALIAS,
+            help="Database whose index is rebuilt.",
+        )
+
+    def handle(self, *args, **options):
+        connection = connections[options["database"]]
+        if connection.vendor != "sqlite":
+            self.stdout.write("Full-text search is only indexed on SQLite.")
+            return
+
+        book_search_index.install(connection)
+        book_search_index.rebuild(connection)
+
+        self.stdout.write(self.style.SUCCESS("Rebuilt the book search index."))
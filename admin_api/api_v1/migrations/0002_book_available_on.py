@@ -0,0 +1,18 @@
+# Generated by Django 5.1.1 on 2026-10-19 12:41
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api_v1', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='book',
+            name='available_on',
+            field=models.DateTimeField(blank=True, db_index=True, null=True),
+        ),
+    ]
@@ -0,0 +1,30 @@
+# Generated by Django 5.1.1 on 2026-10-19 12:46
+
+import django.db.models.functions.text
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api_v1', '0002_book_available_on'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='book',
+            index=models.Index(condition=models.Q(('is_available', True)), fields=['-updated_at', '-created_at'], name='book_available_updated_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='book',
+            index=models.Index(django.db.models.functions.text.Lower('category'), name='book_category_lower_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='book',
+            index=models.Index(django.db.models.functions.text.Lower('publisher'), name='book_publisher_lower_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='borrowedbook',
+            index=models.Index(fields=['book', 'due_date'], name='borrowedbook_book_due_idx'),
+        ),
+    ]
@@ -0,0 +1,33 @@
+# Generated by Django 5.1.1 on 2026-10-19 12:55
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api_v1', '0003_access_path_indexes'),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='book',
+            name='book_available_updated_idx',
+        ),
+        migrations.AddIndex(
+            model_name='book',
+            index=models.Index(fields=['-updated_at', '-id'], name='book_updated_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='book',
+            index=models.Index(condition=models.Q(('is_available', True)), fields=['-updated_at', '-id'], name='book_available_updated_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='borrowedbook',
+            index=models.Index(fields=['-updated_at', '-id'], name='borrowedbook_updated_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='user',
+            index=models.Index(fields=['-updated_at', '-id'], name='user_updated_idx'),
+        ),
+    ]
@@ -0,0 +1,25 @@
+# Generated by Django 5.1.1 on 2026-10-19 13:33
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api_v1', '0006_compact_time_ordered_ids'),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='borrowedbook',
+            name='borrowedbook_updated_idx',
+        ),
+        migrations.AddIndex(
+            model_name='borrowedbook',
+            index=models.Index(fields=['user', '-due_date', '-id'], name='borrowedbook_user_due_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='borrowedbook',
+            index=models.Index(fields=['-due_date', '-id'], name='borrowedbook_due_idx'),
+        ),
+    ]
@@ -0,0 +1,29 @@
+# Generated by Django 5.1.1 on 2026-10-19 13:38
+
+import api_v1.ids
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api_v1', '0007_borrow_list_indexes'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='BorrowedBookHistory',
+            fields=[
+                ('id', api_v1.ids.CompactUUIDField(editable=False, primary_key=True, serialize=False)),
+                ('borrowed_date', models.DateTimeField()),
+                ('due_date', models.DateTimeField()),
+                ('archived_at', models.DateTimeField(auto_now_add=True)),
+                ('book', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to='api_v1.book')),
+                ('user', models.ForeignKey(db_index=False, on_delete=django.db.models.deletion.CASCADE, to='api_v1.user')),
+            ],
+            options={
+                'indexes': [models.Index(fields=['user', '-due_date', '-id'], name='borrowhistory_user_due_idx'), models.Index(fields=['-due_date', '-id'], name='borrowhistory_due_idx')],
+            },
+        ),
+    ]
@@ -0,0 +1,35 @@
+# Generated by Django 5.1.1 on 2026-10-19 14:50
+
+import django.utils.timezone
+from django.db import migrations, models
+
+
+def set_archived_timestamps(apps, schema_editor):
+    # The timestamps of the borrows archived so far weren't kept.
+    BorrowedBookHistory = apps.get_model("api_v1", "BorrowedBookHistory")
+    BorrowedBookHistory.objects.using(schema_editor.connection.alias).update(
+        created_at=models.F("borrowed_date"), updated_at=models.F("borrowed_date")
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api_v1', '0009_rekey_bookcount'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='borrowedbookhistory',
+            name='created_at',
+            field=models.DateTimeField(default=django.utils.timezone.now),
+            preserve_default=False,
+        ),
+        migrations.AddField(
+            model_name='borrowedbookhistory',
+            name='updated_at',
+            field=models.DateTimeField(default=django.utils.timezone.now),
+            preserve_default=False,
+        ),
+        migrations.RunPython(set_archived_timestamps, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,21 @@
+# Generated by Django 5.1.1 on 2026-10-19 14:59
+
+import api_v1.ids
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api_v1', '0010_borrowedbookhistory_timestamps'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='CacheGeneration',
+            fields=[
+                ('name', models.CharField(max_length=50, primary_key=True, serialize=False)),
+                ('generation', api_v1.ids.CompactUUIDField(default=api_v1.ids.uuid7)),
+            ],
+        ),
+    ]
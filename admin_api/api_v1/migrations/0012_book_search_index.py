@@ -0,0 +1,45 @@
+# Generated by Django 5.1.1 on 2026-10-19 16:20
+
+from django.db import migrations
+
+
+# Full-text index of the books, see api_v1.search.SearchIndex. The index is
+# keyed by the rowids of api_v1_book, which migrations recreating the table
+# renumber: those migrations must end with these operations, which also
+# adopt an index created by earlier versions.
+INDEX_SQL = [
+    "CREATE VIRTUAL TABLE IF NOT EXISTS api_v1_book_fts USING fts5("
+    "title, author, content='api_v1_book', content_rowid='rowid', "
+    "prefix='2 3', tokenize='unicode61 remove_diacritics 2')",
+    "CREATE TRIGGER IF NOT EXISTS api_v1_book_fts_ai AFTER INSERT ON api_v1_book "
+    "BEGIN INSERT INTO api_v1_book_fts(rowid, title, author) "
+    "VALUES (new.rowid, new.title, new.author); END",
+    "CREATE TRIGGER IF NOT EXISTS api_v1_book_fts_ad AFTER DELETE ON api_v1_book "
+    "BEGIN INSERT INTO api_v1_book_fts(api_v1_book_fts, rowid, title, author) "
+    "VALUES ('delete', old.rowid, old.title, old.author); END",
+    "CREATE TRIGGER IF NOT EXISTS api_v1_book_fts_au "
+    "AFTER UPDATE OF title, author ON api_v1_book "
+    "BEGIN INSERT INTO api_v1_book_fts(api_v1_book_fts, rowid, title, author) "
+    "VALUES ('delete', old.rowid, old.title, old.author); "
+    "INSERT INTO api_v1_book_fts(rowid, title, author) "
+    "VALUES (new.rowid, new.title, new.author); END",
+    "INSERT INTO api_v1_book_fts(api_v1_book_fts) VALUES ('rebuild')",
+]
+
+DROP_INDEX_SQL = [
+    "DROP TRIGGER IF EXISTS api_v1_book_fts_ai",
+    "DROP TRIGGER IF EXISTS api_v1_book_fts_ad",
+    "DROP TRIGGER IF EXISTS api_v1_book_fts_au",
+    "DROP TABLE IF EXISTS api_v1_book_fts",
+]
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api_v1', '0011_cachegeneration'),
+    ]
+
+    operations = [
+        migrations.RunSQL(INDEX_SQL, DROP_INDEX_SQL),
+    ]
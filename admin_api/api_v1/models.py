@@ -1,13 +1,14 @@
-import uuid
 from django.db import models
+from django.db.models.functions import Lower
 from django.utils import timezone
 from django.contrib.auth.models import AbstractBaseUser
 
+from api_v1.ids import CompactUUIDField, uuid7
 from api_v1.utils import LowercaseCharField
 
 
 class BaseModel(models.Model):
-    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    id = CompactUUIDField(primary_key=True, default=uuid7, editable=False)
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
@@ -23,6 +24,11 @@ class User(BaseModel):
     is_active = models.BooleanField(null=True)
     last_login = models.DateTimeField(null=True)
 
+    class Meta(BaseModel.Meta):
+        indexes = [
+            models.Index(fields=["-updated_at", "-id"], name="user_updated_idx"),
+        ]
+
 
 class Admin(AbstractBaseUser, BaseModel):
     email = models.EmailField(unique=True)
@@ -40,16 +46,106 @@ class Book(BaseModel):
     publisher = models.CharField(max_length=50)
     category = LowercaseCharField(max_length=50)
     is_available = models.BooleanField(default=True)
+    # Date the book is available again while it is borrowed; maintained from
+    # borrow events (see api_v1.signals) and cleared when it is returned.
+    available_on = models.DateTimeField(null=True, blank=True, db_index=True)
+
+    class Meta(BaseModel.Meta):
+        indexes = [
+            # Pages of books in the KeysetPagination order.
+            models.Index(fields=["-updated_at", "-id"], name="book_updated_idx"),
+            # Pages of available books (ListBooksView). Django renders
+            # `is_available=True` as a bare `WHERE "is_available"`, which
+            # SQLite only matches against a partial index.
+            models.Index(
+                fields=["-updated_at", "-id"],
+                condition=models.Q(is_available=True),
+                name="book_available_updated_idx",
+            ),
+            # Case-insensitive category/publisher filters (BookFilter).
+            models.Index(Lower("category"), name="book_category_lower_idx"),
+            models.Index(Lower("publisher"), name="book_publisher_lower_idx"),
+        ]
 
     def __str__(self):
         return self.title
 
 
+class BookCount(models.Model):
+    """
+    Number of books per (is_available, category, publisher), maintained on
+    every book write (see api_v1.counts) so lists can be counted without
+    `COUNT(*)`. Category and publisher are stored lowercased.
+    """
+
+    is_available = models.BooleanField()
+    category = models.CharField(max_length=50)
+    publisher = models.CharField(max_length=50)
+    count = models.IntegerField(default=0)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=["is_available", "category", "publisher"],
+                name="bookcount_key_unique",
+            ),
+        ]
+
+
+class CacheGeneration(models.Model):
+    """
+    Generation of a cached data set, replaced by a new time-ordered id on
+    every change to it (see api_v1.caching). Cache entries are keyed by the
+    generation they were built at, so a change invalidates all of them.
+    """
+
+    name = models.CharField(primary_key=True, max_length=50)
+    generation = CompactUUIDField(default=uuid7)
+
+
 class BorrowedBook(BaseModel):
     user = models.ForeignKey(User, on_delete=models.CASCADE)
     book = models.ForeignKey(Book, on_delete=models.CASCADE)
     borrowed_date = models.DateTimeField(default=timezone.now)
     due_date = models.DateTimeField()
 
+    class Meta(BaseModel.Meta):
+        indexes = [
+            models.Index(fields=["book", "due_date"], name="borrowedbook_book_due_idx"),
+            # Borrow lists, paginated by DueDatePagination: a user's borrows,
+            # and the borrows due in a range of dates (active, overdue).
+            models.Index(
+                fields=["user", "-due_date", "-id"], name="borrowedbook_user_due_idx"
+            ),
+            models.Index(fields=["-due_date", "-id"], name="borrowedbook_due_idx"),
+        ]
+
     def __str__(self):
         return f"{self.user.email} borrowed {self.book.title}"
+
+
+class BorrowedBookHistory(models.Model):
+    """
+    Borrows moved out of BorrowedBook once they are over (see
+    api_v1.archive), so that the queries on borrows in progress don't read
+    past ones. Rows keep their BorrowedBook id and timestamps, and only the
+    columns of the borrow itself.
+    """
+
+    id = CompactUUIDField(primary_key=True, editable=False)
+    created_at = models.DateTimeField()
+    updated_at = models.DateTimeField()
+    # Indexed by borrowhistory_user_due_idx.
+    user = models.ForeignKey(User, on_delete=models.CASCADE, db_index=False)
+    book = models.ForeignKey(Book, on_delete=models.CASCADE)
+    borrowed_date = models.DateTimeField()
+    due_date = models.DateTimeField()
+    archived_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        indexes = [
+            models.Index(
+                fields=["user", "-due_date", "-id"], name="borrowhistory_user_due_idx"
+            ),
+            models.Index(fields=["-due_date", "-id"], name="borrowhistory_due_idx"),
+        ]
@@ -0,0 +1,53 @@
+from operator import attrgetter
+from django.core.exceptions import FieldDoesNotExist
+
+from api_v1.models import Book
+
+
+class EventProjection:
+    """
+    Declarative projection of a model instance into an event payload.
+
+    Subclasses set `model` and optionally `fields` or `exclude`; when
+    `fields` is omitted every concrete model field not in `exclude` is
+    projected. The attribute read for each field is resolved once, when the
+    subclass is defined, so projecting an instance only reads its
+    attributes: no queries and no serializer fields. Foreign keys are
+    projected as their primary key value.
+    """
+
+    model = None
+    fields = None
+    exclude = ()
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+
+        if cls.fields is None:
+            cls.fields = [
+                field.name
+                for field in cls.model._meta.concrete_fields
+                if field.name not in cls.exclude
+            ]
+
+        attnames = [cls.get_attname(name) for name in cls.fields]
+        getter = attrgetter(*attnames)
+        cls._read = getter if len(attnames) > 1 else lambda obj: (getter(obj),)
+
+    @classmethod
+    def get_attname(cls, name):
+        try:
+            return cls.model._meta.get_field(name).attname
+        except FieldDoesNotExist:
+            # Plain model attributes (e.g. properties) are read as is.
+            return name
+
+    @classmethod
+    def project(cls, instance):
+        return dict(zip(cls.fields, cls._read(instance)))
+
+
+class BookProjection(EventProjection):
+    model = Book
+    # Only admin_api tracks when a borrowed book is due back.
+    exclude = ["available_on"]
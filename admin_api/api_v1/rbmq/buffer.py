@@ -0,0 +1,141 @@
+import copy
+from django.db import DEFAULT_DB_ALIAS, connections, transaction
+
+
+def merge_actions(previous, action):
+    """
+    Merge two consecutive actions on the same entity into the one that
+    describes the net change, or None if the entity never left the transaction.
+    """
+    if previous == "created":
+        return None if action == "deleted" else "created"
+
+    if previous == "deleted" and action == "created":
+        return "updated"
+
+    return action
+
+
+def is_prefix(savepoints, of):
+    return of[: len(savepoints)] == savepoints
+
+
+class PendingEvent:
+    def __init__(self, pending, key, instance, action, publish, savepoints):
+        self.pending = pending
+        self.key = key
+        self.instance = instance
+        self.action = action
+        self.publish = publish
+        # The savepoints the event was recorded in, outermost first.
+        self.savepoints = savepoints
+        self.committed = False
+
+    def commit(self):
+        self.committed = True
+        self.pending.commit(self)
+
+
+class PendingEvents:
+    """
+    Events recorded during a transaction, merged into one per entity when
+    it commits. Events recorded in a savepoint that was rolled back are
+    dropped.
+
+    Each event is committed by its own on_commit callback, which Django
+    drops along with the savepoint the event was recorded in. Callbacks run
+    in the order the events were recorded, and the last one publishes the
+    merged events. A callback can't tell whether the ones of the events
+    recorded later in other savepoints will run, so it publishes the events
+    committed so far, and those later events are published after them when
+    they don't just repeat what was published.
+    """
+
+    def __init__(self):
+        self.events = []
+        # The last event published for each entity, as (instance, action).
+        self.published = {}
+        self.flushed = False
+
+    def add(self, instance, action, publish, using):
+        key = (instance._meta.label, instance.pk)
+
+        if action == "deleted":
+            # Django clears the primary key of deleted instances once the
+            # delete completes, so keep a copy that still carries it.
+            instance = copy.copy(instance)
+
+        # Atomic blocks without a savepoint are rolled back with their parent.
+        savepoints = tuple(sid for sid in connections[using].savepoint_ids if sid)
+        event = PendingEvent(self, key, instance, action, publish, savepoints)
+        self.events.append(event)
+        transaction.on_commit(event.commit, using=using, robust=True)
+
+    def commit(self, event):
+        index = self.events.index(event)
+        # The callback of an event recorded later in the same savepoints, or
+        # in fewer of them, runs too, since none of them was rolled back.
+        if any(
+            is_prefix(later.savepoints, event.savepoints)
+            for later in self.events[index + 1 :]
+        ):
+            return
+
+        # The events before it that weren't committed were rolled back.
+        committed = [event for event in self.events[: index + 1] if event.committed]
+        del self.events[: index + 1]
+        self.flush(committed)
+
+    def merge(self, committed):
+        events = {}
+        for event in committed:
+            action = event.action
+            previous = events.pop(event.key, None)
+            if previous is not None:
+                action = merge_actions(previous[1], action)
+
+            if action is not None:
+                events[event.key] = (event.instance, action, event.publish)
+        return events
+
+    def flush(self, committed):
+        self.flushed = True
+        for key, (instance, action, publish) in self.merge(committed).items():
+            published = self.published.get(key)
+            if (
+                published is not None
+                and published[0] is instance
+                and merge_actions(published[1], action) == published[1]
+            ):
+                # The published event already carries the final state.
+                continue
+
+            self.published[key] = (instance, action)
+            publish(instance, action)
+
+
+def publish_on_commit(instance, action, publish):
+    """
+    Defer `publish(instance, action)` until the current transaction commits.
+
+    Events recorded for the same entity within a transaction are merged, so
+    only one event carrying the final state is published per entity. Events
+    recorded in a savepoint that is rolled back are not published. Outside
+    of a transaction the event is published immediately.
+    """
+    using = instance._state.db or DEFAULT_DB_ALIAS
+    connection = connections[using]
+
+    if not connection.in_atomic_block:
+        publish(instance, action)
+        return
+
+    pending = getattr(connection, "pending_events", None)
+    if pending is None or pending.flushed:
+        # First event of this transaction. Events are only flushed once the
+        # transaction they were recorded in has committed, and those of a
+        # rolled back transaction are never committed.
+        pending = PendingEvents()
+        connection.pending_events = pending
+
+    pending.add(instance, action, publish, using)
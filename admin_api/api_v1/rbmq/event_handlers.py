@@ -1,10 +1,12 @@
 import json
 import logging
+from api_v1.rbmq.context import replicated_event_handler
 from api_v1.models import Book, BorrowedBook, User
 
 logger = logging.getLogger("api_v1")
 
 
+@replicated_event_handler
 def handle_book_updated(ch, method, properties, body):
     event_data = json.loads(body)
     book_data = event_data.get("book")
@@ -12,6 +14,9 @@ def handle_book_updated(ch, method, properties, body):
     try:
         book = Book.objects.get(id=book_data["id"])
         book.is_available = book_data["is_available"]
+        if book.is_available:
+            # The book was returned.
+            book.available_on = None
         book.save()
         logger.info(
             f"Book with ID {book.id} updated (is_available = {book.is_available})"
@@ -22,6 +27,7 @@ def handle_book_updated(ch, method, properties, body):
         )
 
 
+@replicated_event_handler
 def handle_borrowed_book_created(ch, method, properties, body):
     event_data = json.loads(body)
     borrowed_book_data = event_data.get("borrowed_book")
@@ -48,6 +54,7 @@ def handle_borrowed_book_created(ch, method, properties, body):
         )
 
 
+@replicated_event_handler
 def handle_user_event(ch, method, properties, body):
     event_data = json.loads(body)
     user_data = event_data.get("user")
@@ -0,0 +1,157 @@
+import time
+import contextvars
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS, connections
+from rest_framework.permissions import SAFE_METHODS
+
+REPLICA_DATABASE = "replica"
+
+# Models whose reads may be served by the replica.
+CATALOG_MODELS = {"api_v1.book", "api_v1.bookcount"}
+
+
+class RoutingState:
+    """
+    How the current request's queries are routed. It is shared with the
+    contexts copied from the request's, like the ones writes run in on the
+    group-commit writer thread, so their writes are recorded here too.
+    """
+
+    def __init__(self, pinned=False):
+        self.pinned = pinned
+        self.replica_reads = False
+        self.wrote = False
+
+    def reads_from_replica(self, model):
+        return (
+            self.replica_reads
+            and not self.pinned
+            and not self.wrote
+            and model._meta.label_lower in CATALOG_MODELS
+        )
+
+
+_routing_state = contextvars.ContextVar("routing_state", default=None)
+
+
+def get_routing_state():
+    return _routing_state.get()
+
+
+def has_replica():
+    return REPLICA_DATABASE in connections.settings
+
+
+def get_primary(hints):
+    # An instance read from the replica is written to, and its relations
+    # read from, the primary rather than the database it came from.
+    instance = hints.get("instance")
+    if instance is not None and instance._state.db == REPLICA_DATABASE:
+        return DEFAULT_DB_ALIAS
+    return None
+
+
+class ReplicaRouter:
+    """
+    Sends the catalog reads of views using `ReplicaReadMixin` to the
+    replica database, when one is configured, and everything else to the
+    primary. Once a request writes to the catalog, its reads and the
+    client's next requests for `REPLICA_PIN_SECONDS` go to the primary, so
+    that the client reads its own writes while the replica catches up.
+    """
+
+    def db_for_read(self, model, **hints):
+        state = get_routing_state()
+        if state is not None and has_replica() and state.reads_from_replica(model):
+            return REPLICA_DATABASE
+        return get_primary(hints)
+
+    def db_for_write(self, model, **hints):
+        state = get_routing_state()
+        if state is not None and model._meta.label_lower in CATALOG_MODELS:
+            state.wrote = True
+        return get_primary(hints)
+
+    def allow_relation(self, obj1, obj2, **hints):
+        databases = {DEFAULT_DB_ALIAS, REPLICA_DATABASE}
+        if {obj1._state.db, obj2._state.db} <= databases:
+            return True
+        return None
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        # The replica is a copy of the primary, schema included.
+        if db == REPLICA_DATABASE:
+            return False
+        return None
+
+
+class ReplicaRoutingMiddleware:
+    """
+    Tracks the routing of each request's queries, and pins clients that
+    wrote to the catalog to the primary with a cookie holding the time of
+    their last write.
+    """
+
+    cookie_name = "primary_pin"
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        state = RoutingState(pinned=self.is_pinned(request))
+        token = _routing_state.set(state)
+        try:
+            response = self.get_response(request)
+        finally:
+            _routing_state.reset(token)
+
+        if state.wrote:
+            response.set_cookie(
+                self.cookie_name,
+                str(time.time()),
+                max_age=settings.REPLICA_PIN_SECONDS,
+                httponly=True,
+                samesite="Lax",
+            )
+        return response
+
+    def is_pinned(self, request):
+        try:
+            wrote_at = float(request.COOKIES[self.cookie_name])
+        except (KeyError, ValueError):
+            return False
+        return time.time() - wrote_at < settings.REPLICA_PIN_SECONDS
+
+
+class ReplicaReadMixin:
+    """
+    Reads the view's catalog from the replica on the requests for which
+    `reads_from_replica()` is true, by default the safe ones.
+    """
+
+    def reads_from_replica(self, request):
+        return request.method in SAFE_METHODS
+
+    def initial(self, request, *args, **kwargs):
+        super().initial(request, *args, **kwargs)
+
+        state = get_routing_state()
+        if state is not None and self.reads_from_replica(request):
+            state.replica_reads = True
+
+    def get_queryset(self):
+        queryset = super().get_queryset()
+        # Bind the database now, so that a response streamed after the
+        # request's routing state is gone reads from the same database.
+        return queryset.using(queryset.db)
+
+
+def copy_to_replica(using=DEFAULT_DB_ALIAS, replica=REPLICA_DATABASE):
+    """
+    Copy the SQLite database `using` into `replica` with SQLite's online
+    backup, for running with a local replica.
+    """
+    source, target = connections[using], connections[replica]
+    source.ensure_connection()
+    target.ensure_connection()
+    source.connection.backup(target.connection)
@@ -1,11 +1,15 @@
-from datetime import timedelta
+from datetime import datetime
 from django.utils import timezone
 from rest_framework import serializers
 from rest_framework.validators import UniqueValidator
+from rest_framework_simplejwt.serializers import TokenRefreshSerializer
 from django.contrib.auth import authenticate
 from django.contrib.auth.password_validation import validate_password
 
-from api_v1.models import Admin, Book, BorrowedBook, User
+from api_v1.models import Admin, Book, BorrowedBook, BorrowedBookHistory, User
+from api_v1.blacklist import RefreshToken
+from api_v1.values import ValuesListSerializer
+from api_v1.fieldsets import SparseFieldsetMixin
 
 
 class AdminSerializer(serializers.ModelSerializer):
@@ -14,32 +18,33 @@ class AdminSerializer(serializers.ModelSerializer):
         fields = ["id", "email", "first_name", "last_name", "is_active", "last_login"]
 
 
-class BookSerializer(serializers.ModelSerializer):
+def get_available_on(available_on):
+    """Return when a book is available, given its stored `available_on`."""
+    return available_on or timezone.now()
+
+
+class BookSerializer(SparseFieldsetMixin, serializers.ModelSerializer):
     available_on = serializers.SerializerMethodField()
 
     class Meta:
         model = Book
         fields = "__all__"
+        list_serializer_class = ValuesListSerializer
+        values_fields = {"available_on": ("available_on", get_available_on)}
 
-    def get_available_on(self, book):
+    def get_available_on(self, book) -> datetime:
         """Calculate the date when the book will be available again."""
-        if not book.is_available:
-            borrowed_book = BorrowedBook.objects.filter(book=book).first()
-            if borrowed_book:
-                due_date = borrowed_book.due_date
-                date_available = due_date + timedelta(days=1)
-                return date_available
+        return get_available_on(book.available_on)
 
-        return timezone.now()
 
-
-class UserSerializer(serializers.ModelSerializer):
+class UserSerializer(SparseFieldsetMixin, serializers.ModelSerializer):
     class Meta:
         model = User
         fields = "__all__"
+        list_serializer_class = ValuesListSerializer
 
 
-class BorrowedBookSerializer(serializers.ModelSerializer):
+class BorrowedBookSerializer(SparseFieldsetMixin, serializers.ModelSerializer):
     book = BookSerializer()
     user = UserSerializer()
 
@@ -48,6 +53,22 @@ class BorrowedBookSerializer(serializers.ModelSerializer):
         fields = "__all__"
 
 
+class BorrowHistorySerializer(SparseFieldsetMixin, serializers.ModelSerializer):
+    """Renders borrows of both BorrowedBook and BorrowedBookHistory."""
+
+    book = BookSerializer()
+    user = UserSerializer()
+    archived = serializers.SerializerMethodField()
+
+    class Meta:
+        model = BorrowedBookHistory
+        fields = ["id", "user", "book", "borrowed_date", "due_date", "archived"]
+        columnless_fields = ["archived"]
+
+    def get_archived(self, borrow) -> bool:
+        return isinstance(borrow, BorrowedBookHistory)
+
+
 class RegisterSerializer(serializers.ModelSerializer):
     email = serializers.EmailField(
         required=True, validators=[UniqueValidator(queryset=Admin.objects.all())]
@@ -126,3 +147,7 @@ class LoginSerializer(serializers.Serializer):
 
 class LogoutSerializer(serializers.Serializer):
     refresh = serializers.CharField()
+
+
+class JWTRefreshSerializer(TokenRefreshSerializer):
+    token_class = RefreshToken
@@ -1,14 +1,27 @@
 import sys
 import logging
 import signal
+from datetime import timedelta
+from django.utils import timezone
 from django.dispatch import Signal
 from django.dispatch import receiver
-from django.db.models.signals import post_save, post_delete
-
-from api_v1.models import Book
-from api_v1.serializers import BookSerializer
+from django.db import transaction
+from django.db.models.signals import pre_save, post_save, post_delete
+
+from api_v1.models import Admin, Book, BorrowedBook
+from api_v1.authentication import invalidate_cached_user
+from api_v1.caching import USER_GENERATION, bump_generation
+from api_v1.counts import (
+    COUNTED_FIELDS,
+    adjust_book_count,
+    get_book_count_key,
+    get_count_key,
+    move_book_count,
+)
+from api_v1.projections import BookProjection
 from api_v1.rbmq.manager import get_rbmq_client
-from api_v1.utils import convert_to_serializable
+from api_v1.rbmq.context import is_replicating
+from api_v1.rbmq.buffer import publish_on_commit
 
 logger = logging.getLogger("api_v1")
 rbmq_client = get_rbmq_client(exchange_name="admin_api")
@@ -16,37 +29,91 @@ rbmq_client = get_rbmq_client(exchange_name="admin_api")
 
 @receiver(post_save, sender=Book)
 def publish_book_created_updated_event(sender, instance, created, **kwargs):
-    serializer = BookSerializer(instance)
-    book_data = convert_to_serializable(serializer.data)
-    book_data.pop("available_on")
-
-    event_data = {"book": book_data}
-
-    if created:
-        event_data["action"] = "created"
-        routing_key = "book.created"
-    else:
-        event_data["action"] = "updated"
-        routing_key = "book.updated"
+    if is_replicating():
+        # Replicated write; the originating service already published it.
+        return
 
-    ok = rbmq_client.publish_event(event_data=event_data, routing_key=routing_key)
-    if not ok:
-        logger.error(f"Failed to publish {routing_key} event for {instance.id}")
+    action = "created" if created else "updated"
+    publish_on_commit(instance, action, publish_book_event)
 
 
 @receiver(post_delete, sender=Book)
 def publish_book_deleted_event(sender, instance, **kwargs):
-    serializer = BookSerializer(instance)
-    book_data = convert_to_serializable(serializer.data)
+    if is_replicating():
+        return
 
-    event_data = {"book": book_data, "action": "deleted"}
-    routing_key = "book.deleted"
+    publish_on_commit(instance, "deleted", publish_book_event)
+
+
+def publish_book_event(instance, action):
+    event_data = {"book": BookProjection.project(instance), "action": action}
+    routing_key = f"book.{action}"
 
     ok = rbmq_client.publish_event(event_data=event_data, routing_key=routing_key)
     if not ok:
         logger.error(f"Failed to publish {routing_key} event for {instance.id}")
 
 
+@receiver(post_save, sender=BorrowedBook)
+def update_book_available_on(sender, instance, created, **kwargs):
+    """Store the date the borrowed book is available again on the book."""
+    if not created:
+        return
+
+    # Borrows replicated from events carry their dates as strings.
+    due_date = sender._meta.get_field("due_date").to_python(instance.due_date)
+    available_on = due_date + timedelta(days=1)
+    updated_at = timezone.now()
+
+    # Update the row directly so that the book isn't re-published.
+    Book.objects.filter(id=instance.book_id).update(
+        available_on=available_on, updated_at=updated_at
+    )
+    if BorrowedBook.book.is_cached(instance):
+        instance.book.available_on = available_on
+        instance.book.updated_at = updated_at
+
+
+@receiver(pre_save, sender=Book)
+def remember_book_count_key(sender, instance, update_fields=None, **kwargs):
+    """Remember the BookCount key of the row a book save overwrites."""
+    instance._count_key = None
+    if update_fields is not None and not set(update_fields) & set(COUNTED_FIELDS):
+        return
+
+    row = sender.objects.filter(pk=instance.pk).values_list(*COUNTED_FIELDS).first()
+    if row is not None:
+        instance._count_key = get_count_key(*row)
+
+
+@receiver(post_save, sender=Book)
+def update_book_count(sender, instance, update_fields=None, **kwargs):
+    if update_fields is not None and not set(update_fields) & set(COUNTED_FIELDS):
+        return
+
+    move_book_count(instance._count_key, get_book_count_key(instance))
+
+
+@receiver(post_delete, sender=Book)
+def update_deleted_book_count(sender, instance, **kwargs):
+    adjust_book_count(get_book_count_key(instance), -1)
+
+
+@receiver(post_save, sender=Admin)
+@receiver(post_delete, sender=Admin)
+def drop_cached_admin(sender, instance, created=False, **kwargs):
+    """
+    Drop the admin from the JWT user cache of this process, and from the
+    caches of the others by starting a new USER_GENERATION. New admins
+    aren't cached anywhere yet.
+    """
+    user_id = instance.pk
+    transaction.on_commit(lambda: invalidate_cached_user(user_id))
+
+    if not created:
+        bump_generation(USER_GENERATION)
+
+
 # Custom signal to indicate Django app termination
 sigterm_received = Signal()
 
@@ -0,0 +1,18 @@
+from django.conf import settings
+
+
+def apply_pragmas(cursor, pragmas):
+    for name, value in pragmas.items():
+        cursor.execute(f"PRAGMA {name} = {value}")
+
+
+def configure_sqlite_connection(sender, connection, **kwargs):
+    """
+    `connection_created` receiver applying `settings.SQLITE_PRAGMAS` to
+    every new connection to an SQLite database file.
+    """
+    if connection.vendor != "sqlite" or connection.is_in_memory_db():
+        return
+
+    with connection.cursor() as cursor:
+        apply_pragmas(cursor, getattr(settings, "SQLITE_PRAGMAS", {}))
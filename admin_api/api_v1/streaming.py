@@ -0,0 +1,78 @@
+from django.http import StreamingHttpResponse
+from drf_spectacular.utils import OpenApiParameter
+from rest_framework.settings import api_settings
+from rest_framework.utils.encoders import JSONEncoder
+
+from api_v1.values import ValuesListSerializer
+
+STREAM_PARAMETER = OpenApiParameter(
+    name="stream",
+    type=bool,
+    description=(
+        "Stream every matching row as a JSON array instead of returning a "
+        "paginated page. Intended for exports."
+    ),
+)
+
+
+def stream_json_array(rows, serialize, chunk_size):
+    """
+    Yield the JSON array of the serialized `rows`, `chunk_size` rows at a time.
+    """
+    encode = JSONEncoder(
+        ensure_ascii=not api_settings.UNICODE_JSON,
+        separators=(",", ":") if api_settings.COMPACT_JSON else (", ", ": "),
+    ).encode
+
+    yield "["
+
+    separator = ""
+    batch = []
+    for row in rows:
+        batch.append(encode(serialize(row)))
+        if len(batch) == chunk_size:
+            yield separator + ",".join(batch)
+            separator = ","
+            batch = []
+
+    if batch:
+        yield separator + ",".join(batch)
+
+    yield "]"
+
+
+class StreamingListModelMixin:
+    """
+    Stream the whole filtered queryset as a JSON array when the request has
+    `?stream=true`.
+
+    Rows are fetched with `.iterator(chunk_size=...)` and serialized one at a
+    time, so memory use doesn't grow with the number of rows and the first
+    bytes are sent before the last row is read.
+    """
+
+    stream_param = "stream"
+    stream_chunk_size = 500
+
+    def is_streaming(self, request):
+        value = request.query_params.get(self.stream_param, "")
+        return value.lower() in ("1", "true", "yes")
+
+    def list(self, request, *args, **kwargs):
+        if not self.is_streaming(request):
+            return super().list(request, *args, **kwargs)
+
+        queryset = self.filter_queryset(self.get_queryset())
+
+        list_serializer = self.get_serializer([], many=True)
+        if isinstance(list_serializer, ValuesListSerializer):
+            queryset = list_serializer.values_queryset(queryset)
+            serialize = list_serializer.get_reader().read
+        else:
+            serialize = list_serializer.child.to_representation
+
+        rows = queryset.iterator(chunk_size=self.stream_chunk_size)
+        return StreamingHttpResponse(
+            stream_json_array(rows, serialize, self.stream_chunk_size),
+            content_type="application/json",
+        )
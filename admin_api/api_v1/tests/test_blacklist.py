@@ -0,0 +1,87 @@
+from io import StringIO
+from django.urls import reverse
+from django.db import connection
+from django.utils import timezone
+from django.core.management import call_command
+from django.test.utils import CaptureQueriesContext
+from rest_framework import status
+from rest_framework.test import APITestCase
+from rest_framework_simplejwt.token_blacklist.models import (
+    BlacklistedToken,
+    OutstandingToken,
+)
+
+from api_v1.models import Admin
+from api_v1.blacklist import BloomFilter, RefreshToken, blacklist_filter
+
+
+class BloomFilterTest(APITestCase):
+    def test_added_keys_are_contained(self):
+        bloom = BloomFilter(capacity=1000, error_rate=0.01)
+        for i in range(1000):
+            bloom.add(f"key {i}")
+
+        self.assertTrue(all(f"key {i}" in bloom for i in range(1000)))
+        false_positives = sum(f"other {i}" in bloom for i in range(10000))
+        self.assertLess(false_positives, 200)
+
+
+class TokenBlacklistTest(APITestCase):
+    def setUp(self):
+        blacklist_filter.clear()
+        self.addCleanup(blacklist_filter.clear)
+        self.user = Admin.objects.create(email="user@example.com")
+        self.refresh_url = reverse("refresh_jwt")
+        self.logout_url = reverse("logout")
+
+    def test_tokens_not_blacklisted_are_checked_without_queries(self):
+        token = str(RefreshToken.for_user(self.user))
+        RefreshToken(token)
+
+        with CaptureQueriesContext(connection) as queries:
+            RefreshToken(token)
+
+        self.assertEqual(len(queries), 0)
+
+    def test_rotated_and_logged_out_tokens_are_rejected(self):
+        token = str(RefreshToken.for_user(self.user))
+
+        response = self.client.post(self.refresh_url, {"refresh": token})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        response = self.client.post(self.refresh_url, {"refresh": token})
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+
+        token = str(RefreshToken.for_user(self.user))
+        response = self.client.post(self.logout_url, {"refresh": token})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        response = self.client.post(self.logout_url, {"refresh": token})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_tokens_blacklisted_by_other_processes_are_rejected(self):
+        token = RefreshToken.for_user(self.user)
+        RefreshToken(str(token))
+        # Blacklisted behind the back of this process's filter.
+        outstanding = OutstandingToken.objects.get(jti=token["jti"])
+        BlacklistedToken.objects.create(token=outstanding)
+
+        response = self.client.post(self.refresh_url, {"refresh": str(token)})
+
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+
+    def test_prune_tokens(self):
+        expired = [RefreshToken.for_user(self.user) for _ in range(2)]
+        expired[0].blacklist()
+        kept = RefreshToken.for_user(self.user)
+        OutstandingToken.objects.exclude(jti=kept["jti"]).update(
+            expires_at=timezone.now() - timezone.timedelta(minutes=1)
+        )
+
+        out = StringIO()
+        call_command("prune_tokens", "--chunk-size", "1", stdout=out)
+
+        self.assertIn("Pruned 2 token(s)", out.getvalue())
+        self.assertEqual(
+            list(OutstandingToken.objects.values_list("jti", flat=True)),
+            [kept["jti"]],
+        )
+        self.assertFalse(BlacklistedToken.objects.exists())
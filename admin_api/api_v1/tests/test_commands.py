@@ -0,0 +1,42 @@
+from io import StringIO
+from datetime import datetime, timedelta
+from django.test import TestCase
+from django.utils import timezone
+from django.core.management import call_command
+
+from api_v1.models import Book, BorrowedBook, User
+
+
+class BackfillAvailableOnTest(TestCase):
+    def setUp(self):
+        self.user = User.objects.create(
+            email="borrower@example.com", first_name="John", last_name="Doe"
+        )
+        self.book_data = {
+            "author": "John Doe",
+            "published_date": datetime.date(datetime.today()),
+            "publisher": "Doe John",
+            "category": "test",
+        }
+
+    def test_backfill_available_on(self):
+        borrowed = Book.objects.create(
+            title="Borrowed", is_available=False, **self.book_data
+        )
+        due_date = timezone.now() + timedelta(days=7)
+        BorrowedBook.objects.create(
+            book=borrowed, user=self.user, due_date=due_date - timedelta(days=7)
+        )
+        BorrowedBook.objects.create(book=borrowed, user=self.user, due_date=due_date)
+        returned = Book.objects.create(title="Returned", **self.book_data)
+
+        Book.objects.update(available_on=timezone.now())
+
+        out = StringIO()
+        call_command("backfill_available_on", batch_size=1, stdout=out)
+
+        borrowed.refresh_from_db()
+        returned.refresh_from_db()
+        self.assertEqual(borrowed.available_on, due_date + timedelta(days=1))
+        self.assertIsNone(returned.available_on)
+        self.assertIn("Updated available_on of 1 borrowed book(s)", out.getvalue())
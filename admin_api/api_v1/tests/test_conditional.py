@@ -0,0 +1,56 @@
+from django.urls import reverse
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from api_v1.models import Book
+
+
+class ConditionalBookViewTest(APITestCase):
+    def setUp(self):
+        self.book = Book.objects.create(
+            title="Tagged",
+            author="Author",
+            published_date="2024-01-01",
+            publisher="Publisher",
+            category="Fiction",
+        )
+        self.detail_url = reverse("book-detail", kwargs={"pk": self.book.id})
+        self.list_url = reverse("book-list")
+
+    def get_revalidated(self, url, params=None):
+        etag = self.client.get(url, params)["ETag"]
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(url, params, HTTP_IF_NONE_MATCH=etag)
+        return response, queries
+
+    def test_unchanged_book_is_not_modified(self):
+        response, queries = self.get_revalidated(self.detail_url)
+
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+        # Only updated_at is read; BookView runs in a request transaction.
+        selects = [q["sql"] for q in queries if q["sql"].startswith("SELECT")]
+        self.assertEqual(len(selects), 1)
+        self.assertIn('SELECT "api_v1_book"."updated_at"', selects[0])
+
+    def test_unchanged_list_is_not_modified(self):
+        response, queries = self.get_revalidated(self.list_url, {"limit": 5})
+
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+        # The rows aren't loaded.
+        self.assertFalse(any('"api_v1_book"."title"' in q["sql"] for q in queries))
+
+    def test_changed_book_is_sent(self):
+        book_etag = self.client.get(self.detail_url)["ETag"]
+        list_etag = self.client.get(self.list_url)["ETag"]
+
+        self.book.title = "Retagged"
+        self.book.save()
+
+        response = self.client.get(self.detail_url, HTTP_IF_NONE_MATCH=book_etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data["title"], "Retagged")
+
+        response = self.client.get(self.list_url, HTTP_IF_NONE_MATCH=list_etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
@@ -0,0 +1,71 @@
+import json
+from django.urls import reverse
+from django.test import TestCase
+from django.utils import timezone
+from rest_framework.test import APITestCase
+
+from api_v1.models import Book, BookCount
+from api_v1.counts import count_books, rebuild_book_counts
+from api_v1.rbmq.event_handlers import handle_book_updated
+
+
+def create_book(**kwargs):
+    defaults = {
+        "title": "Book",
+        "author": "Author",
+        "published_date": "2024-01-01",
+        "publisher": "Penguin",
+        "category": "fiction",
+    }
+    defaults.update(kwargs)
+    return Book.objects.create(**defaults)
+
+
+class BookCountTest(TestCase):
+    def test_counts_follow_writes(self):
+        book = create_book()
+        create_book(publisher="Vintage")
+
+        body = json.dumps({"book": {"id": str(book.id), "is_available": False}})
+        handle_book_updated(None, None, None, body)
+        self.assertEqual(count_books(is_available=False, publisher="PENGUIN"), 1)
+
+        Book.objects.filter(id=book.id).delete()
+        self.assertEqual(count_books(), 1)
+
+    def test_rebuild(self):
+        create_book()
+        create_book(publisher="PENGUIN", is_available=False)
+        BookCount.objects.all().delete()
+
+        self.assertEqual(rebuild_book_counts(), 2)
+        self.assertEqual(count_books(publisher="penguin"), 2)
+
+
+class BookViewCountTest(APITestCase):
+    def setUp(self):
+        create_book()
+        create_book(is_available=False, available_on=timezone.now())
+        create_book(category="history", is_available=False)
+
+    def get_count(self, **params):
+        response = self.client.get(reverse("book-list"), {"limit": 1, **params})
+        return response.data["count"], response.data["count_is_exact"]
+
+    def test_counts_from_book_counts(self):
+        self.assertEqual(self.get_count(), (3, True))
+        self.assertEqual(self.get_count(is_available="false"), (2, True))
+        self.assertEqual(
+            self.get_count(is_available="false", category="History"), (1, True)
+        )
+
+    def test_uncounted_filter_falls_back_to_counting_rows(self):
+        self.assertEqual(
+            self.get_count(available_before=timezone.now().isoformat()), (1, True)
+        )
+
+    def test_count_ignores_case_of_ascii_letters_only(self):
+        create_book(publisher="Ångström Press")
+
+        self.assertEqual(self.get_count(publisher="ångström press"), (0, True))
+        self.assertEqual(self.get_count(publisher="Ångström PRESS"), (1, True))
@@ -1,9 +1,11 @@
+import uuid
 from django.test import TestCase
 from django.utils import timezone
 from datetime import timedelta
 from django.contrib.auth.hashers import make_password
 
 from api_v1.models import User, Admin, Book, BorrowedBook
+from api_v1.filters import BookFilter, BorrowedBookFilter
 
 
 class BaseModelTest(TestCase):
@@ -149,3 +151,44 @@ class BorrowedBookModelTest(TestCase):
         borrowed_book_id = self.borrowed_book.id
         self.borrowed_book.delete()
         self.assertFalse(BorrowedBook.objects.filter(id=borrowed_book_id).exists())
+
+
+class AccessPathIndexTest(TestCase):
+    def assertUsesIndex(self, queryset, index_name):
+        self.assertIn(f"INDEX {index_name}", queryset.explain())
+
+    def test_available_filter_uses_partial_index(self):
+        queryset = BookFilter({"is_available": "true"}, Book.objects.all()).qs
+        self.assertUsesIndex(queryset, "book_available_updated_idx")
+
+    def test_category_filter_uses_lower_index(self):
+        queryset = BookFilter({"category": "Fiction"}, Book.objects.all()).qs
+        self.assertUsesIndex(queryset, "book_category_lower_idx")
+
+    def test_publisher_filter_uses_lower_index(self):
+        queryset = BookFilter({"publisher": "Penguin"}, Book.objects.all()).qs
+        self.assertUsesIndex(queryset, "book_publisher_lower_idx")
+
+    def test_borrows_of_book_use_book_due_date_index(self):
+        queryset = BorrowedBook.objects.filter(book_id=uuid.uuid4()).order_by("due_date")
+        self.assertUsesIndex(queryset, "borrowedbook_book_due_idx")
+
+    def assertRangeScan(self, queryset, index_name):
+        plan = queryset.order_by("-due_date", "-id").explain()
+        self.assertIn(f"SEARCH api_v1_borrowedbook USING INDEX {index_name}", plan)
+        self.assertNotIn("TEMP B-TREE", plan)
+
+    def test_borrows_of_user_use_user_due_date_index(self):
+        queryset = BorrowedBook.objects.filter(user_id=uuid.uuid4())
+        self.assertRangeScan(queryset, "borrowedbook_user_due_idx (user_id=?)")
+
+    def test_due_date_filters_use_due_date_index(self):
+        for name, bound in [("active", ">"), ("overdue", "<")]:
+            queryset = BorrowedBookFilter({name: "true"}, BorrowedBook.objects.all()).qs
+            self.assertRangeScan(queryset, f"borrowedbook_due_idx (due_date{bound}?)")
+
+            queryset = BorrowedBook.objects.filter(user_id=uuid.uuid4())
+            queryset = BorrowedBookFilter({name: "true"}, queryset).qs
+            self.assertRangeScan(
+                queryset, f"borrowedbook_user_due_idx (user_id=? AND due_date{bound}?)"
+            )
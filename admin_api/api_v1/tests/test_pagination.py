@@ -0,0 +1,80 @@
+from django.urls import reverse
+from django.utils import timezone
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APITestCase
+
+from api_v1.models import Book, BorrowedBook, User
+
+
+class KeysetPaginationTest(APITestCase):
+    def setUp(self):
+        self.book = Book.objects.create(
+            title="Book",
+            author="Author",
+            published_date="2024-01-01",
+            publisher="Publisher",
+            category="fiction",
+        )
+        for i in range(5):
+            user = User.objects.create(
+                email=f"user{i}@example.com", first_name="John", last_name="Doe"
+            )
+            BorrowedBook.objects.create(
+                book=self.book, user=user, due_date=timezone.now()
+            )
+
+    def walk(self, url, params):
+        ids = []
+        while url:
+            response = self.client.get(url, params)
+            self.assertEqual(response.status_code, 200)
+            ids.extend(row["id"] for row in response.data["results"])
+            url, params = response.data["next"], None
+        return ids
+
+    def assertPagesCover(self, url, queryset, **params):
+        if not queryset.query.order_by:
+            queryset = queryset.order_by("-updated_at", "-id")
+        expected = [str(pk) for pk in queryset.values_list("id", flat=True)]
+        self.assertEqual(self.walk(url, {"limit": 2, **params}), expected)
+
+    def test_users_pages(self):
+        self.assertPagesCover(reverse("list-users"), User.objects.all())
+
+    def test_borrowed_books_pages(self):
+        self.assertPagesCover(
+            reverse("list-borrowed-books"),
+            BorrowedBook.objects.order_by("-due_date", "-id"),
+            fields="id",
+        )
+
+    def test_books_pages(self):
+        Book.objects.create(
+            title="Other Book",
+            author="Author",
+            published_date="2024-01-01",
+            publisher="Publisher",
+            category="fiction",
+            is_available=False,
+        )
+        self.assertPagesCover(
+            reverse("book-list"),
+            Book.objects.filter(is_available=False),
+            is_available="false",
+        )
+        self.assertPagesCover(reverse("book-list"), Book.objects.all())
+
+    def test_deep_page_is_read_from_the_index(self):
+        first_page = self.client.get(reverse("list-users"), {"limit": 2})
+
+        with CaptureQueriesContext(connection) as queries:
+            self.client.get(first_page.data["next"])
+
+        page_query = next(q["sql"] for q in queries if "ORDER BY" in q["sql"])
+        with connection.cursor() as cursor:
+            cursor.execute(f"EXPLAIN QUERY PLAN {page_query}")
+            plan = " ".join(row[-1] for row in cursor.fetchall())
+
+        self.assertIn("user_updated_idx", plan)
+        self.assertNotIn("TEMP B-TREE", plan)
@@ -0,0 +1,40 @@
+from datetime import datetime
+from django.test import TestCase
+from django.utils import timezone
+
+from api_v1.models import Book, BorrowedBook, User
+from api_v1.projections import BookProjection
+from api_v1.serializers import BookSerializer
+
+
+class BookProjectionTest(TestCase):
+    def setUp(self):
+        self.book = Book.objects.create(
+            title="Test Book",
+            author="John Doe",
+            published_date=datetime.date(datetime.today()),
+            publisher="Doe John",
+            category="test",
+            is_available=False,
+        )
+        user = User.objects.create(
+            email="testuser@example.com", first_name="John", last_name="Doe"
+        )
+        BorrowedBook.objects.create(book=self.book, user=user, due_date=timezone.now())
+
+    def test_project_book(self):
+        data = BookProjection.project(self.book)
+
+        self.assertEqual(data["id"], self.book.id)
+        self.assertEqual(data["title"], self.book.title)
+        self.assertEqual(data["published_date"], self.book.published_date)
+        self.assertFalse(data["is_available"])
+
+    def test_projection_has_serializer_fields_except_available_on(self):
+        serializer_fields = set(BookSerializer(self.book).data) - {"available_on"}
+
+        self.assertEqual(set(BookProjection.project(self.book)), serializer_fields)
+
+    def test_projection_does_not_query(self):
+        with self.assertNumQueries(0):
+            BookProjection.project(self.book)
@@ -1,8 +1,10 @@
 import uuid
 import json
-from datetime import datetime
+from datetime import datetime, timezone
 from unittest import TestCase
 from unittest.mock import patch, MagicMock
+from django.db import transaction
+from django.test import TestCase as DjangoTestCase
 
 from api_v1.models import Book, User
 from api_v1.rbmq.event_handlers import (
@@ -200,3 +202,118 @@ class EventHandlerTest(TestCase):
         mock_user_filter.assert_called_once_with(id="123")
         mock_user_filter.return_value.delete.assert_called_once()
         mock_logger.info.assert_called_once_with("Deleted user: test@example.com")
+
+
+class EchoSuppressionTest(DjangoTestCase):
+    def setUp(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            self.book = Book.objects.create(
+                title="Test Book",
+                author="John Doe",
+                published_date=datetime.date(datetime.today()),
+                publisher="Doe John",
+                category="test",
+            )
+
+    @patch("api_v1.signals.rbmq_client.publish_event")
+    def test_replicated_book_update_is_not_published(self, mock_publish):
+        body = json.dumps({"book": {"id": str(self.book.id), "is_available": False}})
+        handle_book_updated(None, None, None, body)
+
+        self.book.refresh_from_db()
+        self.assertFalse(self.book.is_available)
+        mock_publish.assert_not_called()
+
+    @patch("api_v1.signals.rbmq_client.publish_event")
+    def test_local_book_update_is_published(self, mock_publish):
+        with self.captureOnCommitCallbacks(execute=True):
+            self.book.is_available = False
+            self.book.save()
+
+        mock_publish.assert_called_once()
+        self.assertEqual(mock_publish.call_args.kwargs["routing_key"], "book.updated")
+
+
+class EventCoalescingTest(DjangoTestCase):
+    @patch("api_v1.signals.rbmq_client.publish_event")
+    def test_book_created_and_updated_in_one_transaction(self, mock_publish):
+        with self.captureOnCommitCallbacks(execute=True):
+            book = Book.objects.create(
+                title="Test Book",
+                author="John Doe",
+                published_date=datetime.date(datetime.today()),
+                publisher="Doe John",
+                category="test",
+            )
+            book.title = "Updated Title"
+            book.save()
+
+        mock_publish.assert_called_once()
+        kwargs = mock_publish.call_args.kwargs
+        self.assertEqual(kwargs["routing_key"], "book.created")
+        self.assertEqual(kwargs["event_data"]["book"]["title"], "Updated Title")
+
+    @patch("api_v1.signals.rbmq_client.publish_event")
+    def test_events_of_rolled_back_savepoints_are_not_published(self, mock_publish):
+        book_data = {
+            "author": "John Doe",
+            "published_date": datetime.date(datetime.today()),
+            "publisher": "Doe John",
+            "category": "test",
+        }
+        with self.captureOnCommitCallbacks(execute=True):
+            with transaction.atomic():
+                Book.objects.create(title="Kept", **book_data)
+                try:
+                    with transaction.atomic():
+                        Book.objects.create(title="Rolled back", **book_data)
+                        raise ValueError
+                except ValueError:
+                    pass
+
+        mock_publish.assert_called_once()
+        kwargs = mock_publish.call_args.kwargs
+        self.assertEqual(kwargs["event_data"]["book"]["title"], "Kept")
+
+
+class BookAvailableOnTest(DjangoTestCase):
+    def setUp(self):
+        self.user = User.objects.create(
+            email="borrower@example.com", first_name="John", last_name="Doe"
+        )
+        self.book = Book.objects.create(
+            title="Test Book",
+            author="John Doe",
+            published_date=datetime.date(datetime.today()),
+            publisher="Doe John",
+            category="test",
+        )
+
+    def test_borrow_event_sets_available_on(self):
+        body = json.dumps(
+            {
+                "borrowed_book": {
+                    "id": str(uuid.uuid4()),
+                    "user": str(self.user.id),
+                    "book": str(self.book.id),
+                    "borrowed_date": "2024-01-01T00:00:00Z",
+                    "due_date": "2024-01-10T00:00:00Z",
+                }
+            }
+        )
+        handle_borrowed_book_created(None, None, None, body)
+
+        self.book.refresh_from_db()
+        self.assertEqual(self.book.available_on.isoformat(), "2024-01-11T00:00:00+00:00")
+
+    def test_return_clears_available_on(self):
+        Book.objects.filter(id=self.book.id).update(
+            is_available=False, available_on=datetime(2024, 1, 11, tzinfo=timezone.utc)
+        )
+
+        body = json.dumps({"book": {"id": str(self.book.id), "is_available": True}})
+        handle_book_updated(None, None, None, body)
+
+        self.book.refresh_from_db()
+        self.assertTrue(self.book.is_available)
+        self.assertIsNone(self.book.available_on)
@@ -0,0 +1,91 @@
+import json
+from django.test import TestCase
+from django.urls import reverse
+from django.db import connection
+from rest_framework.test import APITestCase
+
+from api_v1.models import Book
+from api_v1.search import book_search_index, build_match_expression
+
+
+def create_book(title, author, **kwargs):
+    defaults = {
+        "published_date": "2024-01-01",
+        "publisher": "Publisher",
+        "category": "fiction",
+    }
+    defaults.update(kwargs)
+    return Book.objects.create(title=title, author=author, **defaults)
+
+
+class SearchIndexTest(TestCase):
+    def search(self, query):
+        match = build_match_expression(query.split(), book_search_index.columns)
+        return list(book_search_index.search(Book.objects.all(), match))
+
+    def test_index_follows_writes(self):
+        book = create_book("The Hobbit", "J. R. R. Tolkien")
+        self.assertEqual(self.search("tolkien"), [book])
+
+        book.author = "John Ronald Reuel Tolkien"
+        book.save()
+        self.assertEqual(self.search("reuel"), [book])
+
+        Book.objects.filter(id=book.id).update(is_available=False)
+        self.assertEqual(self.search("hobbit"), [book])
+
+        book.delete()
+        self.assertEqual(self.search("hobbit"), [])
+
+    def test_migrations_create_the_triggers(self):
+        with connection.cursor() as cursor:
+            cursor.execute(
+                "SELECT name, sql FROM sqlite_master WHERE type = 'trigger' "
+                f"AND tbl_name = '{book_search_index.content_table}'"
+            )
+            triggers = dict(cursor.fetchall())
+
+        for name, definition in book_search_index.get_triggers().items():
+            self.assertEqual(triggers[name], f"CREATE TRIGGER {name} {definition}")
+
+    def test_install_rebuilds_missing_triggers(self):
+        with connection.cursor() as cursor:
+            cursor.execute(f"DROP TRIGGER {book_search_index.table}_ai")
+        book = create_book("Emma", "Jane Austen")
+
+        book_search_index.install(connection)
+
+        self.assertEqual(self.search("emma"), [book])
+
+
+class BookViewSearchTest(APITestCase):
+    def setUp(self):
+        self.hobbit = create_book("The Hobbit", "J. R. R. Tolkien")
+        self.hobbits = create_book("Hobbits and Dragons", "Tolkien Society")
+        self.dune = create_book("Dune", "Frank Herbert", is_available=False)
+
+    def search(self, query, **params):
+        response = self.client.get(reverse("book-list"), {"search": query, **params})
+        return response
+
+    def test_search_ranks_title_matches_first(self):
+        create_book("Tolkien: A Biography", "Humphrey Carpenter")
+
+        response = self.search("tolkien")
+
+        titles = [book["title"] for book in response.data["results"]]
+        self.assertEqual(titles[0], "Tolkien: A Biography")
+        self.assertEqual(len(titles), 3)
+
+    def test_prefix_search_with_filters(self):
+        response = self.search("hobbit*", is_available="true")
+        self.assertEqual(len(response.data["results"]), 2)
+
+        response = self.search("author:herb*", is_available="false")
+        self.assertEqual(response.data["results"][0]["id"], str(self.dune.id))
+
+    def test_streamed_search(self):
+        response = self.search("dune", stream="true")
+
+        books = json.loads(b"".join(response.streaming_content))
+        self.assertEqual([book["title"] for book in books], ["Dune"])
@@ -0,0 +1,43 @@
+import os
+import tempfile
+from django.conf import settings
+from django.db import connections
+from django.test import SimpleTestCase
+
+from api_v1.views import ListBorrowedBooksView, ListUsersView
+
+
+class SQLiteProfileTest(SimpleTestCase):
+    def connect(self, name):
+        default = connections["default"]
+        wrapper = type(default)({**default.settings_dict, "NAME": name}, "profile")
+        self.addCleanup(wrapper.close)
+        return wrapper
+
+    def read_pragma(self, wrapper, name):
+        with wrapper.cursor() as cursor:
+            cursor.execute(f"PRAGMA {name}")
+            return cursor.fetchone()[0]
+
+    def test_pragmas_are_applied_to_new_connections(self):
+        with tempfile.TemporaryDirectory() as directory:
+            wrapper = self.connect(os.path.join(directory, "db.sqlite3"))
+
+            self.assertEqual(self.read_pragma(wrapper, "journal_mode"), "wal")
+            self.assertEqual(self.read_pragma(wrapper, "synchronous"), 1)
+            self.assertEqual(
+                self.read_pragma(wrapper, "busy_timeout"),
+                settings.SQLITE_PRAGMAS["busy_timeout"],
+            )
+            self.assertEqual(
+                self.read_pragma(wrapper, "cache_size"),
+                settings.SQLITE_PRAGMAS["cache_size"],
+            )
+            wrapper.close()
+
+    def test_transactions_take_the_write_lock(self):
+        self.assertEqual(connections["default"].transaction_mode, "IMMEDIATE")
+
+    def test_read_only_views_are_not_atomic(self):
+        for view in (ListUsersView, ListBorrowedBooksView):
+            self.assertIn("default", view.as_view()._non_atomic_requests)
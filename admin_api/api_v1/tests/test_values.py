@@ -0,0 +1,102 @@
+from unittest import mock
+from datetime import datetime, timedelta
+from django.test import TestCase
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework.renderers import JSONRenderer
+from drf_spectacular.generators import SchemaGenerator
+
+from api_v1.models import Book, BorrowedBook, User
+from api_v1.serializers import BookSerializer, UserSerializer
+
+
+def create_books(count, **kwargs):
+    Book.objects.bulk_create(
+        Book(
+            title=f"Book {i}",
+            author="John Doe",
+            published_date=datetime.date(datetime.today()),
+            publisher="Doe John",
+            category="test",
+            **kwargs,
+        )
+        for i in range(count)
+    )
+
+
+class ValuesListSerializerTest(TestCase):
+    def setUp(self):
+        create_books(2)
+        self.user = User.objects.create(
+            email="testuser@example.com", first_name="John", last_name="Doe"
+        )
+        self.borrowed = Book.objects.create(
+            title="Borrowed Book",
+            author="John Doe",
+            published_date=datetime.date(datetime.today()),
+            publisher="Doe John",
+            category="test",
+            is_available=False,
+        )
+        self.borrowed_book = BorrowedBook.objects.create(
+            book=self.borrowed, user=self.user, due_date=timezone.now()
+        )
+
+    def test_matches_model_serializer_output(self):
+        expected = [BookSerializer(book).data for book in Book.objects.all()]
+        data = BookSerializer(Book.objects.all(), many=True).data
+
+        for row in expected + list(data):
+            if row["id"] != str(self.borrowed.id):
+                row.pop("available_on")
+
+        self.assertEqual(JSONRenderer().render(data), JSONRenderer().render(expected))
+
+    def test_available_on_of_borrowed_book(self):
+        data = BookSerializer(Book.objects.filter(is_available=False), many=True).data
+
+        self.assertEqual(
+            data[0]["available_on"], self.borrowed_book.due_date + timedelta(days=1)
+        )
+
+    def test_book_list_uses_one_query_per_page(self):
+        with self.assertNumQueries(1):
+            list(BookSerializer(Book.objects.all(), many=True).data)
+
+    def test_list_users(self):
+        data = UserSerializer(User.objects.all(), many=True).data
+
+        self.assertEqual(
+            JSONRenderer().render(data),
+            JSONRenderer().render([UserSerializer(self.user).data]),
+        )
+
+    def test_book_list_view(self):
+        response = self.client.get(reverse("book-list"))
+
+        self.assertEqual(len(response.data["results"]), 3)
+        self.assertEqual(set(response.data["results"][0]), set(BookSerializer().fields))
+
+    def test_schema_is_unchanged(self):
+        schema = SchemaGenerator().get_schema(request=None, public=True)
+
+        properties = schema["components"]["schemas"]["Book"]["properties"]
+        self.assertEqual(set(properties), set(BookSerializer().fields))
+
+
+class ValuesListSerializerPageTest(TestCase):
+    def setUp(self):
+        create_books(500)
+
+    def test_rows_are_rendered_without_model_instances(self):
+        expected = [BookSerializer(book).data for book in Book.objects.all()]
+
+        from_db = mock.patch.object(Book, "from_db", side_effect=AssertionError)
+        with from_db, self.assertNumQueries(1):
+            data = BookSerializer(Book.objects.all(), many=True).data
+
+        for row in expected + list(data):
+            # Computed from the time of the request for available books.
+            row.pop("available_on")
+
+        self.assertEqual(JSONRenderer().render(data), JSONRenderer().render(expected))
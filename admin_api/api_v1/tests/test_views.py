@@ -1,12 +1,19 @@
+import json
 import uuid
 from datetime import datetime
 from django.utils import timezone
 from rest_framework import status
 from rest_framework.test import APITestCase
 from django.urls import reverse
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
 from django.contrib.auth.hashers import make_password
 
-from api_v1.models import Admin, Book, User, BorrowedBook
+from api_v1.ids import uuid7
+from api_v1.models import Admin, Book, User, BorrowedBook, BorrowedBookHistory
+
+# Most queries a paginated list request may issue, whatever the page size.
+MAX_LIST_QUERIES = 2
 
 
 class BookViewTest(APITestCase):
@@ -42,6 +49,59 @@ class BookViewTest(APITestCase):
         self.assertEqual(len(response.data["results"]), 1)
         self.assertEqual(response.data["results"][0]["title"], self.book.title)
 
+    def test_stream_books(self):
+        Book.objects.create(**{**self.book_data, "title": "Test Book2"})
+
+        response = self.client.get(self.url, {"stream": "true"})
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertTrue(response.streaming)
+        data = json.loads(b"".join(response.streaming_content))
+        self.assertEqual(
+            sorted(book["title"] for book in data), ["Test Book", "Test Book2"]
+        )
+
+    def test_stream_books_is_filtered(self):
+        Book.objects.create(**{**self.book_data, "title": "Other", "category": "x"})
+
+        response = self.client.get(self.url, {"stream": "true", "category": "x"})
+
+        data = json.loads(b"".join(response.streaming_content))
+        self.assertEqual([book["title"] for book in data], ["Other"])
+
+    def test_list_books_publisher_filter_keeps_non_ascii_case(self):
+        Book.objects.create(**{**self.book_data, "publisher": "Ångström Press"})
+
+        for publisher, count in [
+            ("Ångström Press", 1),
+            ("ÅNGSTRöM PRESS", 1),
+            ("ångström press", 0),
+        ]:
+            response = self.client.get(self.url, {"publisher": publisher})
+            self.assertEqual(len(response.data["results"]), count, publisher)
+
+    def test_list_books_sparse_fieldset(self):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(self.url, {"fields": "id,title"})
+
+        self.assertEqual(set(response.data["results"][0]), {"id", "title"})
+        page_query = next(
+            query["sql"] for query in queries if 'FROM "api_v1_book" ' in query["sql"]
+        )
+        self.assertIn('"title"', page_query)
+        self.assertNotIn('"author"', page_query)
+
+    def test_get_book_by_id_excluding_fields(self):
+        url = reverse("book-detail", kwargs={"pk": self.book.id})
+
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(url, {"exclude": "author,available_on"})
+
+        self.assertEqual(response.data["title"], self.book.title)
+        self.assertNotIn("author", response.data)
+        self.assertNotIn("available_on", response.data)
+        self.assertFalse(any('"author"' in query["sql"] for query in queries))
+
     def test_create_book(self):
         url = reverse("book-list")
         data = {**self.book_data, "title": "Test Book2"}
@@ -65,6 +125,11 @@ class ListUsersViewTest(APITestCase):
         self.assertEqual(len(response.data["results"]), 1)
         self.assertEqual(response.data["results"][0]["email"], self.user.email)
 
+    def test_list_users_sparse_fieldset(self):
+        response = self.client.get(self.url, {"fields": "email"})
+
+        self.assertEqual(response.data["results"], [{"email": self.user.email}])
+
 
 class ListBorrowedBooksViewTest(APITestCase):
     def setUp(self):
@@ -96,6 +161,159 @@ class ListBorrowedBooksViewTest(APITestCase):
         self.assertEqual(len(response.data["results"]), 1)
         self.assertEqual(response.data["results"][0]["book"], self.book.id)
 
+    def test_filter_borrowed_books(self):
+        now = timezone.now()
+        borrowed_book = self.book_data | {"is_available": False}
+
+        other_user = User.objects.create(email="other@example.com")
+        overdue = BorrowedBook.objects.create(
+            book=Book.objects.create(**borrowed_book),
+            user=other_user,
+            due_date=now - timezone.timedelta(days=1),
+        )
+        book = Book.objects.create(**borrowed_book)
+        active = BorrowedBook.objects.create(
+            book=book, user=self.user, due_date=now + timezone.timedelta(days=3)
+        )
+        # Borrowed again since, so returned.
+        BorrowedBook.objects.create(
+            book=book,
+            user=other_user,
+            borrowed_date=now - timezone.timedelta(days=10),
+            due_date=now - timezone.timedelta(days=5),
+        )
+
+        def get_ids(**params):
+            response = self.client.get(self.url, {"fields": "id", **params})
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            return [borrow["id"] for borrow in response.data["results"]]
+
+        self.assertEqual(
+            get_ids(user=self.user.id),
+            [str(self.borrowed_book.id), str(active.id)],
+        )
+        self.assertEqual(get_ids(active="true"), [str(active.id)])
+        self.assertEqual(get_ids(overdue="true"), [str(overdue.id)])
+        self.assertEqual(get_ids(user=self.user.id, overdue="true"), [])
+
+    def test_list_borrowed_books_query_count_is_constant(self):
+        def count_queries():
+            with CaptureQueriesContext(connection) as queries:
+                response = self.client.get(self.url, {"limit": 50})
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            return len(queries)
+
+        single_row_queries = count_queries()
+
+        for i in range(9):
+            user = User.objects.create(
+                email=f"user{i}@example.com", first_name="John", last_name="Doe"
+            )
+            BorrowedBook.objects.create(
+                book=self.book, user=user, due_date=timezone.now()
+            )
+
+        # Bounded count and page.
+        self.assertLessEqual(count_queries(), MAX_LIST_QUERIES)
+        self.assertEqual(count_queries(), single_row_queries)
+
+    def test_list_borrowed_books_sparse_fieldset(self):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(self.url, {"fields": "id,due_date"})
+
+        self.assertEqual(set(response.data["results"][0]), {"id", "due_date"})
+        self.assertFalse(any("JOIN" in query["sql"] for query in queries))
+
+    def test_stream_borrowed_books(self):
+        response = self.client.get(self.url, {"stream": "true"})
+
+        self.assertTrue(response.streaming)
+        data = json.loads(b"".join(response.streaming_content))
+        self.assertEqual(len(data), 1)
+        self.assertEqual(data[0]["book"]["id"], str(self.book.id))
+        self.assertEqual(data[0]["user"]["email"], self.user.email)
+
+
+class ListBorrowHistoryViewTest(APITestCase):
+    def setUp(self):
+        self.user = User.objects.create(email="testuser@example.com")
+        self.other_user = User.objects.create(email="other@example.com")
+        self.book = Book.objects.create(
+            title="Test Book",
+            author="John Doe",
+            published_date=datetime.date(datetime.today()),
+            publisher="Doe John",
+            category="test",
+        )
+        now = timezone.now()
+        self.borrows = []
+        for days, user, model in [
+            (7, self.user, BorrowedBook),
+            (-10, self.other_user, BorrowedBook),
+            (-40, self.user, BorrowedBookHistory),
+            (-400, self.other_user, BorrowedBookHistory),
+        ]:
+            # Archived borrows keep the id and the dates they were created with.
+            borrowed_date = now + timezone.timedelta(days=days - 7)
+            self.borrows.append(
+                model.objects.create(
+                    id=uuid7(),
+                    book=self.book,
+                    user=user,
+                    borrowed_date=borrowed_date,
+                    due_date=now + timezone.timedelta(days=days),
+                    created_at=borrowed_date,
+                    updated_at=borrowed_date,
+                )
+            )
+
+        self.url = reverse("list-borrow-history")
+
+    def get_pages(self, **params):
+        results = []
+        response = self.client.get(self.url, {"limit": 1, **params})
+        while True:
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            results += response.data["results"]
+            if not response.data["next"]:
+                return results
+            response = self.client.get(response.data["next"])
+
+    def test_pages_merge_current_and_archived_borrows(self):
+        results = self.get_pages()
+
+        self.assertEqual(
+            [borrow["id"] for borrow in results],
+            [str(borrow.id) for borrow in self.borrows],
+        )
+        self.assertEqual(
+            [borrow["archived"] for borrow in results], [False, False, True, True]
+        )
+        self.assertEqual(results[2]["user"]["email"], self.user.email)
+
+    def test_filter_by_user(self):
+        results = self.get_pages(user=self.user.id)
+
+        self.assertEqual(
+            [borrow["id"] for borrow in results],
+            [str(self.borrows[0].id), str(self.borrows[2].id)],
+        )
+
+    def test_sparse_fieldset_reads_only_its_columns(self):
+        with CaptureQueriesContext(connection) as queries:
+            results = self.get_pages(fields="id,due_date,archived")
+
+        self.assertEqual(set(results[0]), {"id", "due_date", "archived"})
+        self.assertEqual(
+            [borrow["archived"] for borrow in results], [False, False, True, True]
+        )
+        self.assertFalse(any('"borrowed_date"' in query["sql"] for query in queries))
+
+    def test_invalid_user(self):
+        response = self.client.get(self.url, {"user": "invalid"})
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
 
 class RegisterViewTest(APITestCase):
     def setUp(self):
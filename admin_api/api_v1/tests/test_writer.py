@@ -0,0 +1,96 @@
+from unittest import mock
+from django.test import TestCase, TransactionTestCase, override_settings
+from django.db import transaction
+
+from api_v1.models import Book
+from api_v1.rbmq.context import consuming_event, is_replicating
+from api_v1.writer import GroupCommitWriter, run_write
+
+
+def create_book(title):
+    return Book.objects.create(
+        title=title,
+        author="Author",
+        published_date="2024-01-01",
+        publisher="Publisher",
+        category="fiction",
+    )
+
+
+class GroupCommitWriterTest(TransactionTestCase):
+    def start_writer(self, **kwargs):
+        writer = GroupCommitWriter(**kwargs)
+        self.addCleanup(writer.stop)
+        return writer
+
+    def test_writes_are_committed_in_groups(self):
+        writer = self.start_writer(max_writes=4, max_delay=0.5)
+        group_sizes = []
+        commit = writer._commit
+
+        def record_group(group):
+            group_sizes.append(len(group))
+            commit(group)
+
+        with mock.patch.object(writer, "_commit", record_group):
+            futures = [writer.submit(create_book, f"Book {i}") for i in range(10)]
+            books = [future.result(timeout=5) for future in futures]
+
+        self.assertEqual(group_sizes, [4, 4, 2])
+        self.assertEqual(Book.objects.count(), 10)
+        self.assertEqual(books[0], Book.objects.get(title="Book 0"))
+
+    def test_failed_write_is_rolled_back_alone(self):
+        writer = self.start_writer(max_writes=2, max_delay=0.5)
+
+        def create_and_fail():
+            create_book("Rolled back")
+            raise ValueError("failed")
+
+        failed = writer.submit(create_and_fail)
+        created = writer.submit(create_book, "Committed")
+
+        with self.assertRaises(ValueError):
+            failed.result(timeout=5)
+        self.assertEqual(created.result(timeout=5).title, "Committed")
+        self.assertEqual(
+            list(Book.objects.values_list("title", flat=True)), ["Committed"]
+        )
+
+    def test_writes_run_in_the_callers_context(self):
+        writer = self.start_writer()
+
+        with consuming_event("event-id"):
+            future = writer.submit(is_replicating)
+
+        self.assertTrue(future.result(timeout=5))
+        self.assertFalse(writer.submit(is_replicating).result(timeout=5))
+
+    @override_settings(GROUP_COMMIT={"ENABLED": True, "MAX_DELAY_MS": 0})
+    def test_run_write_uses_the_writer(self):
+        writer = self.start_writer()
+
+        with mock.patch("api_v1.writer.get_writer", return_value=writer):
+            book = run_write(create_book, "Grouped")
+            self.assertTrue(run_write(writer.is_writer_thread))
+
+        self.assertTrue(Book.objects.filter(id=book.id).exists())
+
+
+class RunWriteTest(TestCase):
+    def test_runs_in_place_inside_a_transaction(self):
+        writer = mock.Mock()
+
+        with mock.patch("api_v1.writer.get_writer", return_value=writer):
+            with transaction.atomic():
+                book = run_write(create_book, "Direct")
+
+        writer.submit.assert_not_called()
+        self.assertEqual(book.title, "Direct")
+
+    def test_runs_in_a_transaction_when_disabled(self):
+        def in_atomic_block():
+            return transaction.get_connection().in_atomic_block
+
+        with mock.patch("api_v1.writer.get_writer", return_value=None):
+            self.assertTrue(run_write(in_atomic_block))
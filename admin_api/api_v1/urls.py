@@ -8,6 +8,7 @@ from api_v1.views import (
     LogoutView,
     ListUsersView,
     ListBorrowedBooksView,
+    ListBorrowHistoryView,
     JWTRefreshView,
 )
 
@@ -20,6 +21,11 @@ urlpatterns = [
     path(
         "borrowed_books/", ListBorrowedBooksView.as_view(), name="list-borrowed-books"
     ),
+    path(
+        "borrowed_books/history/",
+        ListBorrowHistoryView.as_view(),
+        name="list-borrow-history",
+    ),
     path("admin/register/", RegisterView.as_view(), name="register-user"),
     path("admin/login/", LoginView.as_view(), name="login"),
     path("admin/logout/", LogoutView.as_view(), name="logout"),
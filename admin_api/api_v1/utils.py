@@ -1,7 +1,10 @@
+import json
+from operator import itemgetter
+from urllib.parse import urlencode
 from uuid import UUID
 from decimal import Decimal
 from django.db import models
-from datetime import datetime, date
+from datetime import datetime, date, time
 
 
 class LowercaseCharField(models.CharField):
@@ -10,30 +13,74 @@ class LowercaseCharField(models.CharField):
         return value if value is None else value.lower()
 
 
-def convert_to_serializable(data):
+class EventJSONEncoder(json.JSONEncoder):
     """
-    Recursively converts non-serializable fields like datetime and Decimal to strings.
+    JSON encoder for event payloads.
 
-    Args:
-        data (dict, list, or primitive types): The data to process.
-
-    Returns:
-        The data with all non-serializable fields converted to strings.
+    Datetimes, dates, UUIDs and Decimals are converted while the payload is
+    encoded, in the same pass, so no converted copy of the payload is built
+    beforehand. The converter of each type is resolved once and cached.
     """
-    if isinstance(data, dict):
-        return {key: convert_to_serializable(value) for key, value in data.items()}
 
-    elif isinstance(data, list):
-        return [convert_to_serializable(item) for item in data]
+    converters = {
+        datetime: datetime.isoformat,
+        date: date.isoformat,
+        time: time.isoformat,
+        UUID: str,
+        Decimal: str,
+    }
+
+    _converter_cache = {}
+
+    @classmethod
+    def get_converter(cls, value_type):
+        try:
+            return cls._converter_cache[value_type]
+        except KeyError:
+            pass
+
+        # Resolve subclasses (e.g. a datetime subclass) through the MRO.
+        converter = next(
+            (cls.converters[t] for t in value_type.__mro__ if t in cls.converters),
+            None,
+        )
+        cls._converter_cache[value_type] = converter
+        return converter
+
+    def default(self, o):
+        converter = self.get_converter(type(o))
+        if converter is None:
+            return super().default(o)
+
+        return converter(o)
+
 
-    elif isinstance(data, (datetime, date)):
-        return data.isoformat()
+_event_encoder = EventJSONEncoder(separators=(",", ":"))
 
-    elif isinstance(data, Decimal):
-        return str(data)
 
-    elif isinstance(data, UUID):
-        return str(data)
+def encode_event(event_data):
+    """
+    Serialize an event payload to a compact JSON string in a single pass.
+
+    Args:
+        event_data (dict): The event data to serialize.
 
-    else:
-        return data
+    Returns:
+        str: The JSON document.
+    """
+    return _event_encoder.encode(event_data)
+
+
+def normalize_query(query_params):
+    """
+    Return the query string of `query_params` with its parameters sorted by
+    name and the empty ones left out, so that the requests for the same
+    response normalize to the same string.
+    """
+    items = [
+        (name, value)
+        for name, values in query_params.lists()
+        for value in values
+        if value != ""
+    ]
+    return urlencode(sorted(items, key=itemgetter(0)))
@@ -1,13 +1,13 @@
 from django.utils import timezone
-from drf_spectacular.utils import extend_schema
+from django.db import transaction
+from drf_spectacular.types import OpenApiTypes
+from drf_spectacular.utils import OpenApiParameter, extend_schema, extend_schema_view
 from django.utils.decorators import method_decorator
 from django_filters.rest_framework import DjangoFilterBackend
 from django.views.decorators.debug import sensitive_post_parameters
 from rest_framework import status
 from rest_framework.response import Response
-from rest_framework.filters import SearchFilter
 from rest_framework.viewsets import GenericViewSet
-from rest_framework_simplejwt.tokens import RefreshToken
 from rest_framework_simplejwt.exceptions import TokenError
 from rest_framework_simplejwt.views import TokenRefreshView
 from rest_framework.permissions import AllowAny, IsAuthenticated
@@ -22,13 +22,24 @@ from api_v1.serializers import (
     AdminSerializer,
     BookSerializer,
     BorrowedBookSerializer,
+    BorrowHistorySerializer,
     RegisterSerializer,
     LoginSerializer,
     LogoutSerializer,
+    JWTRefreshSerializer,
     UserSerializer,
 )
-from api_v1.filters import BookFilter
-from api_v1.models import Admin, Book, BorrowedBook, User
+from api_v1.filters import BookFilter, BorrowedBookFilter, BorrowHistoryFilter
+from api_v1.counts import count_filtered_books
+from api_v1.blacklist import RefreshToken
+from api_v1.pagination import DueDatePagination, MergedListModelMixin
+from api_v1.replica import ReplicaReadMixin
+from api_v1.conditional import ConditionalListMixin, ConditionalRetrieveMixin
+from api_v1.search import FullTextSearchFilter, book_search_index
+from api_v1.values import ValuesListModelMixin
+from api_v1.fieldsets import SPARSE_FIELDSET_PARAMETERS, ColumnPruningMixin
+from api_v1.streaming import STREAM_PARAMETER, StreamingListModelMixin
+from api_v1.models import Admin, Book, BorrowedBook, BorrowedBookHistory, User
 
 
 sensitive_post_parameters_m = method_decorator(
@@ -37,32 +48,94 @@ sensitive_post_parameters_m = method_decorator(
 
 
 @extend_schema(tags=["Admin_api"])
+@extend_schema_view(
+    list=extend_schema(parameters=[STREAM_PARAMETER, *SPARSE_FIELDSET_PARAMETERS]),
+    retrieve=extend_schema(parameters=SPARSE_FIELDSET_PARAMETERS),
+)
+@method_decorator(transaction.non_atomic_requests, name="dispatch")
 class BookView(
+    ConditionalListMixin,
+    ConditionalRetrieveMixin,
+    ReplicaReadMixin,
+    ColumnPruningMixin,
+    StreamingListModelMixin,
     mixins.CreateModelMixin,
     mixins.RetrieveModelMixin,
     mixins.DestroyModelMixin,
-    mixins.ListModelMixin,
+    ValuesListModelMixin,
     GenericViewSet,
 ):
     serializer_class = BookSerializer
     queryset = Book.objects.all()
 
-    search_fields = ["title"]
+    search_index = book_search_index
+    search_fields = ["title", "author"]
     filterset_class = BookFilter
-    filter_backends = [DjangoFilterBackend, SearchFilter]
+    filter_backends = [DjangoFilterBackend, FullTextSearchFilter]
 
+    def get_row_count(self, request):
+        return count_filtered_books(self, request)
 
-@extend_schema(tags=["Admin_api"])
-class ListUsersView(ListAPIView):
+    def reads_from_replica(self, request):
+        return self.action == "list"
+
+    # Only the writes run in a transaction, so reads don't take the lock.
+
+    def create(self, request, *args, **kwargs):
+        with transaction.atomic():
+            return super().create(request, *args, **kwargs)
+
+    def destroy(self, request, *args, **kwargs):
+        with transaction.atomic():
+            return super().destroy(request, *args, **kwargs)
+
+
+@extend_schema(tags=["Admin_api"], parameters=SPARSE_FIELDSET_PARAMETERS)
+@method_decorator(transaction.non_atomic_requests, name="dispatch")
+class ListUsersView(ColumnPruningMixin, ValuesListModelMixin, ListAPIView):
     queryset = User.objects.all()
     serializer_class = UserSerializer
 
 
-@extend_schema(tags=["Admin_api"])
-class ListBorrowedBooksView(ListAPIView):
-    queryset = BorrowedBook.objects.all()
+@extend_schema(
+    tags=["Admin_api"], parameters=[STREAM_PARAMETER, *SPARSE_FIELDSET_PARAMETERS]
+)
+@method_decorator(transaction.non_atomic_requests, name="dispatch")
+class ListBorrowedBooksView(
+    ColumnPruningMixin, StreamingListModelMixin, ListAPIView
+):
+    # Each borrow is loaded with its user and book in one query, and
+    # ColumnPruningMixin reads only the columns the serializer renders.
+    queryset = BorrowedBook.objects.select_related("user", "book")
     serializer_class = BorrowedBookSerializer
 
+    filterset_class = BorrowedBookFilter
+    filter_backends = [DjangoFilterBackend]
+    pagination_class = DueDatePagination
+
+
+@extend_schema(
+    tags=["Admin_api"],
+    summary="List the borrows, including the archived ones",
+    parameters=[
+        OpenApiParameter(name="user", type=OpenApiTypes.UUID),
+        *SPARSE_FIELDSET_PARAMETERS,
+    ],
+)
+@method_decorator(transaction.non_atomic_requests, name="dispatch")
+class ListBorrowHistoryView(ColumnPruningMixin, MergedListModelMixin, ListAPIView):
+    serializer_class = BorrowHistorySerializer
+    filterset_class = BorrowHistoryFilter
+    pagination_class = DueDatePagination
+
+    def get_querysets(self):
+        return [
+            self.prune_columns(BorrowedBook.objects.select_related("user", "book")),
+            self.prune_columns(
+                BorrowedBookHistory.objects.select_related("user", "book")
+            ),
+        ]
+
 
 def get_login_data(user):
     from rest_framework_simplejwt.settings import (
@@ -173,4 +246,4 @@ class LogoutView(GenericAPIView):
 
 @extend_schema(tags=["Auth"])
 class JWTRefreshView(TokenRefreshView):
-    pass
+    serializer_class = JWTRefreshSerializer
@@ -1,4 +1,5 @@
 from django.apps import AppConfig
+from django.db.backends.signals import connection_created
 
 
 class ApiV1Config(AppConfig):
@@ -7,3 +8,6 @@ class ApiV1Config(AppConfig):
 
     def ready(self):
         import api_v1.signals
+        from api_v1.sqlite import configure_sqlite_connection
+
+        connection_created.connect(configure_sqlite_connection)
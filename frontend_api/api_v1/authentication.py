@@ -0,0 +1,114 @@
+import copy
+import time
+import threading
+from collections import OrderedDict
+from django.conf import settings
+from django.utils.translation import gettext_lazy as _
+from drf_spectacular.contrib.rest_framework_simplejwt import SimpleJWTScheme
+from rest_framework.exceptions import AuthenticationFailed
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.utils import get_md5_hash_password
+
+from api_v1.caching import USER_GENERATION, get_generation
+
+
+class UserCache:
+    """
+    Users by id, least recently used first, for at most
+    `JWT_USER_CACHE["TTL_SECONDS"]` seconds each and `["MAX_SIZE"]` in all.
+
+    Saving or deleting a user drops it (see api_v1.signals) and starts a
+    new USER_GENERATION. Every `["SYNC_SECONDS"]` the cache reads the
+    generation and drops all users if another process started one since.
+    """
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.entries = OrderedDict()
+        self.generation = None
+        self.synced_at = None
+
+    def sync(self, now):
+        generation = get_generation(USER_GENERATION)
+        if generation != self.generation:
+            self.entries.clear()
+            self.generation = generation
+        self.synced_at = now
+
+    def get(self, user_id):
+        sync_seconds = settings.JWT_USER_CACHE["SYNC_SECONDS"]
+        with self.lock:
+            now = time.monotonic()
+            if self.synced_at is None or now - self.synced_at >= sync_seconds:
+                self.sync(now)
+
+            entry = self.entries.get(user_id)
+            if entry is None:
+                return None
+
+            user, expires_at = entry
+            if expires_at <= now:
+                del self.entries[user_id]
+                return None
+
+            self.entries.move_to_end(user_id)
+            return user
+
+    def set(self, user_id, user):
+        options = settings.JWT_USER_CACHE
+        with self.lock:
+            self.entries[user_id] = (user, time.monotonic() + options["TTL_SECONDS"])
+            self.entries.move_to_end(user_id)
+            while len(self.entries) > options["MAX_SIZE"]:
+                self.entries.popitem(last=False)
+
+    def invalidate(self, user_id):
+        with self.lock:
+            self.entries.pop(user_id, None)
+
+    def clear(self):
+        with self.lock:
+            self.entries.clear()
+            self.synced_at = None
+
+
+user_cache = UserCache()
+
+
+def invalidate_cached_user(user_id):
+    user_cache.invalidate(str(user_id))
+
+
+class CachedJWTAuthentication(JWTAuthentication):
+    """
+    JWTAuthentication reading the user of a token from `user_cache`, so
+    that authenticated requests don't query the user table.
+
+    Each request gets its own copy of the cached user.
+    """
+
+    def get_user(self, validated_token):
+        user_id = validated_token.get(api_settings.USER_ID_CLAIM)
+        if user_id is None:
+            return super().get_user(validated_token)
+
+        user = user_cache.get(str(user_id))
+        if user is None:
+            # Raises for missing and inactive users, which aren't cached.
+            user = super().get_user(validated_token)
+            user_cache.set(str(user_id), user)
+        elif not user.is_active:
+            raise AuthenticationFailed(_("User is inactive"), code="user_inactive")
+        elif api_settings.CHECK_REVOKE_TOKEN and validated_token.get(
+            api_settings.REVOKE_TOKEN_CLAIM
+        ) != get_md5_hash_password(user.password):
+            raise AuthenticationFailed(
+                _("The user's password has been changed."), code="password_changed"
+            )
+
+        return copy.copy(user)
+
+
+class CachedJWTScheme(SimpleJWTScheme):
+    target_class = "api_v1.authentication.CachedJWTAuthentication"
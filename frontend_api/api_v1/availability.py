@@ -0,0 +1,202 @@
+import json
+import asyncio
+import logging
+import weakref
+from datetime import timedelta
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.db import transaction
+from django.utils import timezone
+
+from api_v1.models import BookAvailabilityEvent
+
+logger = logging.getLogger("api_v1")
+
+# Events read from the log per query.
+READ_BATCH_SIZE = 500
+
+
+def record_availability_change(book_id, is_available):
+    """
+    Log that the book `book_id` became available or unavailable, and wake
+    the hubs of this process once the change commits. Hubs of the other
+    processes read it on their next poll.
+    """
+    BookAvailabilityEvent.objects.create(book_id=book_id, is_available=is_available)
+    transaction.on_commit(wake_hubs)
+
+
+def read_availability_events(after_id, limit=READ_BATCH_SIZE):
+    """Return up to `limit` `(id, book_id, is_available)` events after `after_id`."""
+    return list(
+        BookAvailabilityEvent.objects.filter(id__gt=after_id)
+        .order_by("id")
+        .values_list("id", "book_id", "is_available")[:limit]
+    )
+
+
+def get_last_event_id():
+    events = BookAvailabilityEvent.objects.order_by("-id")
+    return events.values_list("id", flat=True).first() or 0
+
+
+def prune_availability_events(now=None):
+    """
+    Delete the events older than `AVAILABILITY_STREAM["KEEP_HOURS"]` hours,
+    past which subscribers can't resume. Return the number deleted.
+    """
+    now = now or timezone.now()
+    keep_hours = settings.AVAILABILITY_STREAM["KEEP_HOURS"]
+    events = BookAvailabilityEvent.objects.filter(
+        created_at__lt=now - timedelta(hours=keep_hours)
+    )
+    deleted, _ = events.delete()
+    return deleted
+
+
+class AvailabilityHub:
+    """
+    Fans the availability events out to the subscribers of an event loop.
+
+    One task reads the log while there are subscribers, every POLL_SECONDS
+    or as soon as a write of this process commits, and puts each event in
+    the queues of the subscribers to its book and to all books. A waiting
+    subscriber only costs its queue, however many there are.
+
+    A subscriber whose queue is full is dropped; it can resume from the
+    last event it received.
+    """
+
+    def __init__(self, loop):
+        self.loop = loop
+        self.subscribers = {}
+        self.wakeup = asyncio.Event()
+        self.starting = asyncio.Lock()
+        self.task = None
+        self.last_id = 0
+
+    def wake(self):
+        """Make the hub read the log now. Safe to call from any thread."""
+        if not self.loop.is_closed():
+            self.loop.call_soon_threadsafe(self.wakeup.set)
+
+    async def subscribe(self, book_ids=()):
+        """
+        Return a queue receiving the events of `book_ids`, or of all books,
+        and the id of the last event before them.
+        """
+        options = settings.AVAILABILITY_STREAM
+        queue = asyncio.Queue(maxsize=options["QUEUE_SIZE"])
+
+        async with self.starting:
+            if self.task is None or self.task.done():
+                self.last_id = await sync_to_async(get_last_event_id)()
+                self.task = self.loop.create_task(self.poll())
+
+            for book_id in book_ids or [None]:
+                self.subscribers.setdefault(book_id, set()).add(queue)
+            return queue, self.last_id
+
+    def unsubscribe(self, queue):
+        for book_id, queues in list(self.subscribers.items()):
+            queues.discard(queue)
+            if not queues:
+                del self.subscribers[book_id]
+        if not self.subscribers:
+            self.wakeup.set()
+
+    def is_subscribed(self, queue):
+        return any(queue in queues for queues in self.subscribers.values())
+
+    def publish(self, event):
+        _, book_id, _ = event
+        queues = self.subscribers.get(book_id, set())
+        queues = queues | self.subscribers.get(None, set())
+        for queue in queues:
+            try:
+                queue.put_nowait(event)
+            except asyncio.QueueFull:
+                self.unsubscribe(queue)
+
+    async def poll(self):
+        poll_seconds = settings.AVAILABILITY_STREAM["POLL_SECONDS"]
+        while self.subscribers:
+            try:
+                await asyncio.wait_for(self.wakeup.wait(), poll_seconds)
+            except asyncio.TimeoutError:
+                pass
+            self.wakeup.clear()
+
+            while self.subscribers:
+                try:
+                    events = await sync_to_async(read_availability_events)(
+                        self.last_id
+                    )
+                except Exception:
+                    logger.exception("Failed to read the availability events")
+                    break
+
+                for event in events:
+                    self.publish(event)
+                if events:
+                    self.last_id = events[-1][0]
+                if len(events) < READ_BATCH_SIZE:
+                    break
+
+
+_hubs = weakref.WeakKeyDictionary()
+
+
+def get_hub():
+    """Return the hub of the running event loop."""
+    loop = asyncio.get_running_loop()
+    hub = _hubs.get(loop)
+    if hub is None:
+        hub = _hubs[loop] = AvailabilityHub(loop)
+    return hub
+
+
+def wake_hubs():
+    for hub in list(_hubs.values()):
+        hub.wake()
+
+
+def format_event(event):
+    event_id, book_id, is_available = event
+    data = json.dumps({"book": str(book_id), "is_available": is_available})
+    return f"id: {event_id}\nevent: availability\ndata: {data}\n\n"
+
+
+async def stream_availability(book_ids=(), last_event_id=None):
+    """
+    Yield the availability events of `book_ids`, or of all books, as
+    server-sent events, starting after `last_event_id` when given, and a
+    comment every HEARTBEAT_SECONDS to keep the connection open.
+    """
+    hub = get_hub()
+    heartbeat_seconds = settings.AVAILABILITY_STREAM["HEARTBEAT_SECONDS"]
+    queue, position = await hub.subscribe(book_ids)
+    try:
+        # The events missed before subscribing are read from the log.
+        after_id = position if last_event_id is None else last_event_id
+        while after_id < position:
+            events = await sync_to_async(read_availability_events)(after_id)
+            for event in events:
+                if event[0] <= position and (not book_ids or event[1] in book_ids):
+                    yield format_event(event)
+            if not events:
+                break
+            after_id = events[-1][0]
+
+        while True:
+            try:
+                event = await asyncio.wait_for(queue.get(), heartbeat_seconds)
+            except asyncio.TimeoutError:
+                if not hub.is_subscribed(queue):
+                    # Dropped by the hub for falling behind.
+                    return
+                yield ": keep-alive\n\n"
+            else:
+                yield format_event(event)
+    finally:
+        hub.unsubscribe(queue)
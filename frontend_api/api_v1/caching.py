@@ -0,0 +1,128 @@
+import time
+import hashlib
+import logging
+import threading
+from django.core.cache import caches
+from rest_framework import status
+from rest_framework.response import Response
+
+from api_v1.ids import uuid7
+from api_v1.utils import normalize_query
+from api_v1.conditional import conditional_response
+from api_v1.models import CacheGeneration
+
+logger = logging.getLogger("api_v1")
+
+# Generation of the book catalog, replaced on every book write.
+BOOK_GENERATION = "books"
+# Generation of the users, replaced when one is updated or deleted.
+USER_GENERATION = "users"
+
+
+def get_generation(name, using=None):
+    """
+    Return the current generation of `name`, or None until it first
+    changes, read from the database `using`.
+    """
+    generations = CacheGeneration.objects.using(using).filter(name=name)
+    try:
+        return generations.values_list("generation", flat=True).get()
+    except CacheGeneration.DoesNotExist:
+        return None
+
+
+def bump_generation(name):
+    """Invalidate the cache entries of `name` by starting a new generation."""
+    generation = uuid7()
+    if not CacheGeneration.objects.filter(name=name).update(generation=generation):
+        CacheGeneration.objects.bulk_create(
+            [CacheGeneration(name=name, generation=generation)],
+            ignore_conflicts=True,
+        )
+
+
+class CacheStats:
+    """Hits, misses and time spent rebuilding the entries of a cache."""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.rebuild_seconds = 0.0
+
+    @property
+    def hit_rate(self):
+        requests = self.hits + self.misses
+        return self.hits / requests if requests else 0.0
+
+    def record_hit(self):
+        with self.lock:
+            self.hits += 1
+
+    def record_rebuild(self, seconds):
+        with self.lock:
+            self.misses += 1
+            self.rebuild_seconds += seconds
+
+
+class GenerationCacheMixin:
+    """
+    Caches the list responses of a view, keyed by their normalized query
+    string and by the `cache_generation` generation of the database they
+    are read from. Writes bump the generation (see api_v1.signals) instead
+    of the entries expiring, so entries are served until the data changes.
+
+    The ETag of a cached response is kept with it, so that hits are
+    revalidated without computing it again.
+    """
+
+    cache_alias = "pages"
+    cache_generation = BOOK_GENERATION
+    cache_stats = None
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        cls.cache_stats = CacheStats()
+
+    def get_cache_key(self, request, using):
+        generation = get_generation(self.cache_generation, using)
+        if generation is None:
+            return None
+
+        # Pages hold absolute links, so the key includes the host.
+        url = request.build_absolute_uri(request.path)
+        key = f"{url}?{normalize_query(request.query_params)}"
+        digest = hashlib.sha1(key.encode()).hexdigest()
+        return f"{self.cache_generation}:{generation.hex}:{using}:{digest}"
+
+    def get_cached_response(self, request, data):
+        return Response(data)
+
+    def list(self, request, *args, **kwargs):
+        cache = caches[self.cache_alias]
+        key = self.get_cache_key(request, self.get_queryset().db)
+
+        if key is not None:
+            cached = cache.get(key)
+            if cached is not None:
+                self.cache_stats.record_hit()
+                data, etag = cached
+                return conditional_response(
+                    etag, self.get_cached_response, request, data
+                )
+
+        started = time.perf_counter()
+        response = super().list(request, *args, **kwargs)
+        elapsed = time.perf_counter() - started
+
+        if key is not None and response.status_code == status.HTTP_200_OK:
+            cache.set(key, (response.data, response.get("ETag")))
+
+        stats = self.cache_stats
+        stats.record_rebuild(elapsed)
+        logger.debug(
+            f"Rebuilt {type(self).__name__} page in {elapsed * 1000:.1f} ms "
+            f"(hit rate {stats.hit_rate:.1%} over {stats.hits + stats.misses} "
+            f"request(s))"
+        )
+        return response
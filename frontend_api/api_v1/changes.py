@@ -0,0 +1,119 @@
+import json
+import uuid
+from base64 import urlsafe_b64decode, urlsafe_b64encode
+from binascii import Error as BinasciiError
+from datetime import datetime, timedelta
+from operator import itemgetter
+from django.conf import settings
+from django.db.models import Q
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.exceptions import APIException, NotFound
+
+from api_v1.models import Book, BookTombstone
+
+
+class ChangesExpired(APIException):
+    status_code = status.HTTP_410_GONE
+    default_detail = (
+        "The changes since this token are no longer kept; sync again without it."
+    )
+    default_code = "changes_expired"
+
+
+def encode_token(cursor):
+    """
+    Return the opaque token of a change feed cursor `(time, id, synced)`:
+    the position of the last change the client has, and the time since
+    which it needs the deletions.
+    """
+    time, pk, synced = cursor
+    data = {"u": time.isoformat(), "i": pk.hex, "s": synced.isoformat()}
+    data = json.dumps(data, separators=(",", ":"))
+    return urlsafe_b64encode(data.encode()).decode().rstrip("=")
+
+
+def decode_token(token):
+    try:
+        data = json.loads(urlsafe_b64decode(token + "=" * (-len(token) % 4)))
+        return (
+            datetime.fromisoformat(data["u"]),
+            uuid.UUID(data["i"]),
+            datetime.fromisoformat(data["s"]),
+        )
+    except (BinasciiError, ValueError, TypeError, KeyError):
+        raise NotFound("Invalid token")
+
+
+def filter_after(queryset, time_field, id_field, position):
+    """Filter `queryset` on `(time_field, id_field) > position`."""
+    time, pk = position
+    # The first term bounds the index range (see KeysetPagination).
+    return queryset.filter(
+        Q(**{f"{time_field}__gte": time}),
+        Q(**{f"{time_field}__gt": time}) | Q(**{f"{id_field}__gt": pk}),
+    ).order_by(time_field, id_field)
+
+
+def get_book_changes(since, limit, now=None):
+    """
+    Return the changes to the catalog after the cursor `since`, oldest
+    first: at most `limit` books created or updated and ids of books
+    deleted in all. Without `since`, every book is a change.
+
+    Returns `(books, deleted_ids, cursor, has_more)`, where `cursor` is the
+    cursor to ask for the next changes with (see encode_token).
+
+    A page is read from each of the book (updated_at, id) and tombstone
+    (deleted_at, book_id) indexes, and the two are merged.
+    """
+    now = now or timezone.now()
+    options = settings.CHANGE_FEED
+    settled = now - timedelta(seconds=options["SETTLE_SECONDS"])
+
+    books = Book.objects.filter(updated_at__lte=settled)
+    tombstones = BookTombstone.objects.filter(deleted_at__lte=settled)
+    if since is None:
+        # The deletions before a full sync are of books it doesn't return.
+        position, synced = (settled, uuid.UUID(int=0)), settled
+        books = books.order_by("updated_at", "id")
+        tombstones = tombstones.none()
+    else:
+        *position, synced = since
+        # Neither a full sync nor a sync without more changes needs the
+        # deletions before `synced`, which may have been pruned since.
+        if max(position[0], synced) < now - timedelta(days=options["TOMBSTONE_DAYS"]):
+            raise ChangesExpired()
+        books = filter_after(books, "updated_at", "id", position)
+        tombstones = filter_after(tombstones, "deleted_at", "book_id", position)
+
+    changes = [((book.updated_at, book.id), book) for book in books[: limit + 1]]
+    changes += [
+        (tombstone, None)
+        for tombstone in tombstones.values_list("deleted_at", "book_id")[: limit + 1]
+    ]
+    changes.sort(key=itemgetter(0))
+
+    has_more = len(changes) > limit
+    changes = changes[:limit]
+
+    books = [book for _, book in changes if book is not None]
+    deleted_ids = [change[1] for change, book in changes if book is None]
+    if changes:
+        position = changes[-1][0]
+    if not has_more:
+        # No deletion can settle before `settled` anymore.
+        synced = max(synced, settled)
+    return books, deleted_ids, (*position, synced), has_more
+
+
+def prune_book_tombstones(now=None):
+    """
+    Delete the tombstones older than `CHANGE_FEED["TOMBSTONE_DAYS"]` days,
+    which no token still accepted can ask for. Return the number deleted.
+    """
+    now = now or timezone.now()
+    deleted_before = now - timedelta(days=settings.CHANGE_FEED["TOMBSTONE_DAYS"])
+
+    deleted, _ = BookTombstone.objects.filter(deleted_at__lt=deleted_before).delete()
+    return deleted
@@ -0,0 +1,93 @@
+import hashlib
+from django.db.models import Count, Max
+from django.core.exceptions import ValidationError
+from django.utils.cache import get_conditional_response
+from django.utils.http import quote_etag
+from rest_framework import status
+
+from api_v1.utils import normalize_query
+
+
+def make_etag(request, *version):
+    """
+    Return a strong ETag for the representation of `version` the request
+    asks for: its query string and media type are part of the tag.
+    """
+    parts = (
+        *version,
+        normalize_query(request.query_params),
+        request.accepted_media_type,
+    )
+    return quote_etag(hashlib.sha1(repr(parts).encode()).hexdigest())
+
+
+def conditional_response(etag, handler, request, *args, **kwargs):
+    """
+    Answer `If-None-Match` with 304 Not Modified when it matches `etag`,
+    before `handler` builds the response, and tag the other successful
+    responses with `etag`.
+    """
+    if etag is not None:
+        not_modified = get_conditional_response(request, etag=etag)
+        if not_modified is not None:
+            not_modified["ETag"] = etag
+            return not_modified
+
+    response = handler(request, *args, **kwargs)
+    if etag is not None and response.status_code == status.HTTP_200_OK:
+        response["ETag"] = etag
+    return response
+
+
+class ConditionalRetrieveMixin:
+    """
+    Tags an object by its (id, updated_at), read without loading the object.
+    """
+
+    def get_object_etag(self, request):
+        lookup_url_kwarg = self.lookup_url_kwarg or self.lookup_field
+        lookup = self.kwargs[lookup_url_kwarg]
+        queryset = self.filter_queryset(self.get_queryset())
+
+        try:
+            updated_at = (
+                queryset.filter(**{self.lookup_field: lookup})
+                .values_list("updated_at", flat=True)
+                .get()
+            )
+        except (queryset.model.DoesNotExist, TypeError, ValueError, ValidationError):
+            # Left to retrieve() to answer.
+            return None
+
+        return make_etag(request, str(lookup), updated_at.isoformat())
+
+    def retrieve(self, request, *args, **kwargs):
+        etag = self.get_object_etag(request)
+        return conditional_response(etag, super().retrieve, request, *args, **kwargs)
+
+
+class ConditionalListMixin:
+    """
+    Tags a list by the latest `updated_at` of the filtered rows and their
+    number, which change when a row is created, updated or deleted. The count
+    comes from the view's `get_row_count(request)` when it has one.
+    """
+
+    def get_list_etag(self, request):
+        queryset = self.filter_queryset(self.get_queryset()).order_by()
+
+        get_row_count = getattr(self, "get_row_count", None)
+        count = get_row_count(request) if get_row_count is not None else None
+        if count is None:
+            aggregates = queryset.aggregate(
+                watermark=Max("updated_at"), count=Count("pk")
+            )
+            watermark, count = aggregates["watermark"], aggregates["count"]
+        else:
+            watermark = queryset.aggregate(watermark=Max("updated_at"))["watermark"]
+
+        return make_etag(request, watermark and watermark.isoformat(), count)
+
+    def list(self, request, *args, **kwargs):
+        etag = self.get_list_etag(request)
+        return conditional_response(etag, super().list, request, *args, **kwargs)
@@ -0,0 +1,111 @@
+import json
+import timeit
+from uuid import UUID
+from decimal import Decimal
+from datetime import date, datetime
+from django.utils import timezone
+from django.core.management.base import BaseCommand
+
+from api_v1.ids import uuid7
+from api_v1.models import Book, BorrowedBook, User
+from api_v1.projections import BookProjection, BorrowedBookProjection, UserProjection
+from api_v1.utils import encode_event
+
+
+def convert_to_serializable(data):
+    """The recursive copy-then-dump conversion that encode_event replaced."""
+    if isinstance(data, dict):
+        return {key: convert_to_serializable(value) for key, value in data.items()}
+    elif isinstance(data, list):
+        return [convert_to_serializable(item) for item in data]
+    elif isinstance(data, (datetime, date)):
+        return data.isoformat()
+    elif isinstance(data, (Decimal, UUID)):
+        return str(data)
+    else:
+        return data
+
+
+def get_payloads():
+    """Payloads of the events this service publishes, as the signals build them."""
+    now = timezone.now()
+    user = User(
+        id=uuid7(),
+        email="user@example.com",
+        first_name="First",
+        last_name="Last",
+        last_login=now,
+    )
+    book = Book(
+        id=uuid7(),
+        title="Title",
+        author="Author",
+        published_date=date(2024, 1, 1),
+        publisher="Publisher",
+        category="Fiction",
+        created_at=now,
+        updated_at=now,
+    )
+    borrowed_book = BorrowedBook(
+        id=uuid7(),
+        user=user,
+        book=book,
+        borrowed_date=now,
+        due_date=now,
+        created_at=now,
+        updated_at=now,
+    )
+    return [
+        {"book": BookProjection.project(book)},
+        {"user": UserProjection.project(user), "action": "updated"},
+        {
+            "borrowed_book": BorrowedBookProjection.project(borrowed_book),
+            "action": "created",
+        },
+    ]
+
+
+class Command(BaseCommand):
+    help = (
+        "Measures how long encoding event payloads takes with encode_event, "
+        "and with the conversion to a serializable copy it replaced"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--number",
+            type=int,
+            default=10000,
+            help="Number of times the payloads are encoded per measurement.",
+        )
+        parser.add_argument(
+            "--repeat",
+            type=int,
+            default=5,
+            help="Number of measurements, of which the fastest is kept.",
+        )
+
+    def handle(self, *args, **options):
+        payloads = get_payloads()
+
+        def convert_and_dump():
+            for payload in payloads:
+                json.dumps(convert_to_serializable(payload))
+
+        def encode():
+            for payload in payloads:
+                encode_event(payload)
+
+        events = options["number"] * len(payloads)
+        timings = {}
+        for name, func in [
+            ("convert and dump", convert_and_dump),
+            ("encode_event", encode),
+        ]:
+            timings[name] = min(
+                timeit.repeat(func, number=options["number"], repeat=options["repeat"])
+            )
+            self.stdout.write(f"{name}: {timings[name] / events * 1e6:.2f} µs/event")
+
+        speedup = timings["convert and dump"] / timings["encode_event"]
+        self.stdout.write(f"encode_event is {speedup:.1f}x as fast")
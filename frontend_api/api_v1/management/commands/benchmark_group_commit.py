@@ -0,0 +1,117 @@
+import os
+import time
+import tempfile
+import threading
+from django.conf import settings
+from django.db import connections, transaction
+from django.db.models import F
+from django.core.management import call_command
+from django.core.management.base import BaseCommand
+
+from api_v1.models import BookCount
+from api_v1.writer import GroupCommitWriter
+
+ALIAS = "group_commit_benchmark"
+
+
+class Command(BaseCommand):
+    help = (
+        "Measures the write throughput of concurrent writers on a temporary "
+        "copy of the schema, committing each write on its own, then through "
+        "the GroupCommitWriter"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--writers",
+            type=int,
+            default=8,
+            help="Number of concurrent threads submitting writes.",
+        )
+        parser.add_argument(
+            "--writes",
+            type=int,
+            default=200,
+            help="Number of writes submitted by each thread.",
+        )
+        parser.add_argument(
+            "--max-delay-ms",
+            type=float,
+            default=settings.GROUP_COMMIT["MAX_DELAY_MS"],
+            help="Longest time the writer waits to fill a group.",
+        )
+        parser.add_argument(
+            "--synchronous",
+            default=None,
+            help="Overrides PRAGMA synchronous, e.g. FULL to fsync every commit.",
+        )
+
+    def handle(self, *args, **options):
+        with tempfile.TemporaryDirectory() as directory:
+            connections.settings[ALIAS] = {
+                **connections.settings["default"],
+                "NAME": os.path.join(directory, "benchmark.sqlite3"),
+            }
+            try:
+                call_command("migrate", database=ALIAS, verbosity=0)
+                self.run(options)
+            finally:
+                connections[ALIAS].close()
+                del connections[ALIAS]
+                del connections.settings[ALIAS]
+
+    def run(self, options):
+        if options["synchronous"]:
+            with connections[ALIAS].cursor() as cursor:
+                cursor.execute(f"PRAGMA synchronous = {options['synchronous']}")
+
+        keys = [
+            BookCount(is_available=True, category=f"category {i}", publisher="p")
+            for i in range(options["writers"])
+        ]
+        BookCount.objects.using(ALIAS).bulk_create(keys)
+        pks = list(BookCount.objects.using(ALIAS).values_list("pk", flat=True))
+
+        def write(pk):
+            BookCount.objects.using(ALIAS).filter(pk=pk).update(count=F("count") + 1)
+
+        def commit_each(pk):
+            with transaction.atomic(using=ALIAS):
+                write(pk)
+
+        writer = GroupCommitWriter(
+            max_writes=settings.GROUP_COMMIT["MAX_WRITES"],
+            max_delay=options["max_delay_ms"] / 1000,
+            using=ALIAS,
+        )
+
+        def group_commit(pk):
+            writer.submit(write, pk).result()
+
+        try:
+            for name, commit in [("each", commit_each), ("group", group_commit)]:
+                elapsed = self.measure(commit, pks, options["writes"])
+                writes = len(pks) * options["writes"]
+                self.stdout.write(
+                    f"{name:>6} commit: {writes} writes in {elapsed:.2f}s "
+                    f"({writes / elapsed:.0f}/s)"
+                )
+        finally:
+            writer.stop()
+
+    def measure(self, commit, pks, writes):
+        start = threading.Barrier(len(pks))
+
+        def run(pk):
+            start.wait()
+            for _ in range(writes):
+                commit(pk)
+            connections[ALIAS].close()
+
+        threads = [threading.Thread(target=run, args=(pk,)) for pk in pks]
+        started = time.perf_counter()
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        return time.perf_counter() - started
@@ -0,0 +1,100 @@
+import os
+import time
+import uuid
+import sqlite3
+import tempfile
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from api_v1.ids import uuid7
+from api_v1.sqlite import apply_pragmas
+
+SCHEMA = """
+CREATE TABLE book (
+    id {id_type} NOT NULL PRIMARY KEY,
+    title varchar(100) NOT NULL
+);
+CREATE TABLE borrowedbook (
+    id {id_type} NOT NULL PRIMARY KEY,
+    book_id {id_type} NOT NULL REFERENCES book (id),
+    due_date datetime NOT NULL
+);
+CREATE INDEX borrowedbook_book_id ON borrowedbook (book_id);
+"""
+
+KEYS = [
+    ("uuid4 text", "char(32)", lambda: uuid.uuid4().hex),
+    ("uuid7 text", "char(32)", lambda: uuid7().hex),
+    ("uuid7 blob", "blob", lambda: uuid7().bytes),
+]
+
+
+class Command(BaseCommand):
+    help = (
+        "Measures the insert rate and the index sizes of books and borrows "
+        "keyed by random UUIDs stored as text, as before, and by time-ordered "
+        "UUIDs stored as text and as 16-byte blobs"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--rows",
+            type=int,
+            default=1_000_000,
+            help="Number of books, and of borrows, inserted for each key.",
+        )
+        parser.add_argument(
+            "--batch",
+            type=int,
+            default=1000,
+            help="Number of rows inserted in each transaction.",
+        )
+
+    def handle(self, *args, **options):
+        for name, id_type, new_id in KEYS:
+            with tempfile.TemporaryDirectory() as directory:
+                path = os.path.join(directory, "benchmark.sqlite3")
+                elapsed, sizes = self.run(
+                    path, id_type, new_id, options["rows"], options["batch"]
+                )
+
+            rows = 2 * options["rows"]
+            sizes = ", ".join(
+                f"{index} {size / 2**20:.1f} MiB" for index, size in sizes.items()
+            )
+            self.stdout.write(
+                f"{name}: {rows} rows in {elapsed:.2f}s ({rows / elapsed:.0f}/s); "
+                f"{sizes}"
+            )
+
+    def run(self, path, id_type, new_id, rows, batch):
+        connection = sqlite3.connect(path, isolation_level=None)
+        apply_pragmas(connection, getattr(settings, "SQLITE_PRAGMAS", {}))
+        connection.executescript(SCHEMA.format(id_type=id_type))
+
+        started = time.perf_counter()
+        for offset in range(0, rows, batch):
+            book_ids = [new_id() for _ in range(min(batch, rows - offset))]
+            connection.execute("BEGIN")
+            connection.executemany(
+                "INSERT INTO book VALUES (?, 'Book')",
+                [(book_id,) for book_id in book_ids],
+            )
+            # Each new book is borrowed once, as they are created.
+            connection.executemany(
+                "INSERT INTO borrowedbook VALUES (?, ?, datetime('now'))",
+                [(new_id(), book_id) for book_id in book_ids],
+            )
+            connection.execute("COMMIT")
+        elapsed = time.perf_counter() - started
+
+        sizes = dict(
+            connection.execute(
+                "SELECT name, SUM(pgsize) FROM dbstat "
+                "WHERE name LIKE 'sqlite_autoindex_%' OR name LIKE 'borrowedbook_%' "
+                "GROUP BY name ORDER BY name"
+            )
+        )
+        sizes["file"] = os.path.getsize(path)
+        connection.close()
+        return elapsed, sizes
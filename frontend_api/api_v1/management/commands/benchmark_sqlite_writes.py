@@ -0,0 +1,150 @@
+import os
+import time
+import uuid
+import sqlite3
+import tempfile
+import threading
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from api_v1.sqlite import apply_pragmas
+
+SCHEMA = """
+CREATE TABLE book (
+    id char(32) PRIMARY KEY,
+    title varchar(100) NOT NULL,
+    is_available bool NOT NULL,
+    updated_at datetime NOT NULL
+);
+CREATE TABLE borrowedbook (
+    id char(32) PRIMARY KEY,
+    book_id char(32) NOT NULL REFERENCES book (id),
+    due_date datetime NOT NULL
+);
+"""
+
+
+class Command(BaseCommand):
+    help = (
+        "Measures the write throughput of concurrent writers sharing an SQLite "
+        "file, like the web server and the runrabbitmq consumer, with SQLite's "
+        "defaults and a new connection per transaction, then with "
+        "SQLITE_PRAGMAS, the configured transaction mode and persistent "
+        "connections"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--writers",
+            type=int,
+            default=2,
+            help="Number of concurrent writers, each with its own connection.",
+        )
+        parser.add_argument(
+            "--transactions",
+            type=int,
+            default=300,
+            help="Number of transactions committed by each writer.",
+        )
+
+    def handle(self, *args, **options):
+        database_options = settings.DATABASES["default"].get("OPTIONS", {})
+        profiles = [
+            ("defaults", {}, None, False),
+            (
+                "SQLITE_PRAGMAS",
+                getattr(settings, "SQLITE_PRAGMAS", {}),
+                database_options.get("transaction_mode"),
+                True,
+            ),
+        ]
+        for name, pragmas, transaction_mode, persistent in profiles:
+            with tempfile.TemporaryDirectory() as directory:
+                path = os.path.join(directory, "benchmark.sqlite3")
+                elapsed, commits, locked = self.run(
+                    path,
+                    pragmas,
+                    transaction_mode,
+                    persistent,
+                    options["writers"],
+                    options["transactions"],
+                )
+
+            self.stdout.write(
+                f"{name:>15}: {commits} commits in {elapsed:.2f}s "
+                f"({commits / elapsed:.0f}/s), {locked} 'database is locked' errors"
+            )
+
+    def run(self, path, pragmas, transaction_mode, persistent, writers, transactions):
+        with sqlite3.connect(path) as connection:
+            connection.executescript(SCHEMA)
+            book_ids = [uuid.uuid4().hex for _ in range(100)]
+            connection.executemany(
+                "INSERT INTO book VALUES (?, 'Book', 1, datetime('now'))",
+                [(book_id,) for book_id in book_ids],
+            )
+        connection.close()
+
+        results = []
+        start = threading.Barrier(writers)
+        begin = f"BEGIN {transaction_mode}" if transaction_mode else "BEGIN"
+
+        def connect():
+            # Like Django: autocommit, with BEGIN issued by atomic blocks.
+            connection = sqlite3.connect(path, isolation_level=None)
+            apply_pragmas(connection, pragmas)
+            return connection
+
+        def write(writer):
+            commits = locked = 0
+            connection = connect() if persistent else None
+            start.wait()
+
+            for i in range(transactions):
+                if not persistent:
+                    connection = connect()
+                book_id = book_ids[(writer * transactions + i) % len(book_ids)]
+                try:
+                    # A borrow: read the book, then write the borrow and the book.
+                    connection.execute(begin)
+                    connection.execute(
+                        "SELECT is_available FROM book WHERE id = ?", (book_id,)
+                    ).fetchone()
+                    connection.execute(
+                        "INSERT INTO borrowedbook VALUES (?, ?, datetime('now'))",
+                        (uuid.uuid4().hex, book_id),
+                    )
+                    connection.execute(
+                        "UPDATE book SET is_available = NOT is_available, "
+                        "updated_at = datetime('now') WHERE id = ?",
+                        (book_id,),
+                    )
+                    connection.execute("COMMIT")
+                    commits += 1
+                except sqlite3.OperationalError as e:
+                    if "locked" not in str(e):
+                        raise
+                    locked += 1
+                    if connection.in_transaction:
+                        connection.execute("ROLLBACK")
+                if not persistent:
+                    connection.close()
+
+            connection.close()
+            results.append((commits, locked))
+
+        threads = [
+            threading.Thread(target=write, args=(writer,)) for writer in range(writers)
+        ]
+        started = time.perf_counter()
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        elapsed = time.perf_counter() - started
+
+        return (
+            elapsed,
+            sum(commits for commits, _ in results),
+            sum(locked for _, locked in results),
+        )
@@ -0,0 +1,12 @@
+from django.core.management.base import BaseCommand
+
+from api_v1.availability import prune_availability_events
+
+
+class Command(BaseCommand):
+    help = "Deletes the availability events subscribers can no longer resume from"
+
+    def handle(self, *args, **options):
+        deleted = prune_availability_events()
+
+        self.stdout.write(self.style.SUCCESS(f"Pruned {deleted} event(s)."))
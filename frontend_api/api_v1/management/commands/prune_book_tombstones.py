@@ -0,0 +1,12 @@
+from django.core.management.base import BaseCommand
+
+from api_v1.changes import prune_book_tombstones
+
+
+class Command(BaseCommand):
+    help = "Deletes the tombstones of deleted books the change feed no longer serves"
+
+    def handle(self, *args, **options):
+        deleted = prune_book_tombstones()
+
+        self.stdout.write(self.style.SUCCESS(f"Pruned {deleted} tombstone(s)."))
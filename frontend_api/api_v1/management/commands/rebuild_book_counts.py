@@ -0,0 +1,12 @@
+from django.core.management.base import BaseCommand
+
+from api_v1.counts import rebuild_book_counts
+
+
+class Command(BaseCommand):
+    help = "Recomputes the book counts used to count paginated book lists"
+
+    def handle(self, *args, **options):
+        keys = rebuild_book_counts()
+
+        self.stdout.write(self.style.SUCCESS(f"Rebuilt {keys} book count(s)."))
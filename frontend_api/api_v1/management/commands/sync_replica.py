@@ -0,0 +1,17 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from api_v1.replica import REPLICA_DATABASE, copy_to_replica, has_replica
+
+
+class Command(BaseCommand):
+    help = "Copies the primary database into the local replica database"
+
+    def handle(self, *args, **options):
+        if not has_replica():
+            raise CommandError("No replica database is configured.")
+
+        copy_to_replica()
+
+        self.stdout.write(
+            self.style.SUCCESS(f"Copied the database to {REPLICA_DATABASE}.")
+        )
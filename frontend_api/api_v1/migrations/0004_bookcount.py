@@ -0,0 +1,48 @@
+# Generated by Django 5.1.1 on 2026-10-19 12:59
+
+from collections import Counter
+from django.db import migrations, models
+
+
+def populate_book_counts(apps, schema_editor):
+    Book = apps.get_model("api_v1", "Book")
+    BookCount = apps.get_model("api_v1", "BookCount")
+    db_alias = schema_editor.connection.alias
+
+    counts = Counter()
+    rows = (
+        Book.objects.using(db_alias)
+        .order_by()
+        .values_list("is_available", "category", "publisher")
+    )
+    for is_available, category, publisher in rows.iterator():
+        counts[(is_available, category.lower(), publisher.lower())] += 1
+
+    BookCount.objects.using(db_alias).bulk_create(
+        BookCount(is_available=key[0], category=key[1], publisher=key[2], count=count)
+        for key, count in counts.items()
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api_v1', '0003_keyset_pagination_indexes'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='BookCount',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('is_available', models.BooleanField()),
+                ('category', models.CharField(max_length=50)),
+                ('publisher', models.CharField(max_length=50)),
+                ('count', models.IntegerField(default=0)),
+            ],
+            options={
+                'constraints': [models.UniqueConstraint(fields=('is_available', 'category', 'publisher'), name='bookcount_key_unique')],
+            },
+        ),
+        migrations.RunPython(populate_book_counts, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,78 @@
+# Generated by Django 5.1.1 on 2026-10-19 13:22
+
+import api_v1.ids
+from django.db import migrations
+
+
+def get_id_columns(apps, connection):
+    """
+    Yield the table and column of every id, and of every foreign key to one,
+    including the ones of other apps, like token_blacklist.
+    """
+    ids = {
+        (model._meta.db_table, field.column)
+        for model in apps.get_app_config("api_v1").get_models()
+        for field in model._meta.local_fields
+        if isinstance(field, api_v1.ids.CompactUUIDField)
+    }
+    yield from ids
+
+    with connection.cursor() as cursor:
+        for table in connection.introspection.table_names(cursor):
+            relations = connection.introspection.get_relations(cursor, table)
+            for column, referenced in relations.items():
+                if tuple(reversed(referenced)) in ids:
+                    yield table, column
+
+
+def convert_ids(apps, schema_editor, stored_as, expression):
+    if schema_editor.connection.vendor != "sqlite":
+        return
+
+    quote_name = schema_editor.quote_name
+    columns = list(get_id_columns(apps, schema_editor.connection))
+    with schema_editor.connection.cursor() as cursor:
+        for table, column in columns:
+            column = quote_name(column)
+            cursor.execute(
+                f"UPDATE {quote_name(table)} SET {column} = {expression % column} "
+                f"WHERE typeof({column}) = '{stored_as}'"
+            )
+
+
+def ids_to_blobs(apps, schema_editor):
+    # The altered columns hold the hex text the ids were stored as.
+    schema_editor.connection.connection.create_function(
+        "uuid_bytes", 1, bytes.fromhex, deterministic=True
+    )
+    convert_ids(apps, schema_editor, "text", "uuid_bytes(%s)")
+
+
+def ids_to_text(apps, schema_editor):
+    convert_ids(apps, schema_editor, "blob", "lower(hex(%s))")
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api_v1', '0004_bookcount'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='book',
+            name='id',
+            field=api_v1.ids.CompactUUIDField(default=api_v1.ids.uuid7, editable=False, primary_key=True, serialize=False),
+        ),
+        migrations.AlterField(
+            model_name='borrowedbook',
+            name='id',
+            field=api_v1.ids.CompactUUIDField(default=api_v1.ids.uuid7, editable=False, primary_key=True, serialize=False),
+        ),
+        migrations.AlterField(
+            model_name='user',
+            name='id',
+            field=api_v1.ids.CompactUUIDField(default=api_v1.ids.uuid7, editable=False, primary_key=True, serialize=False),
+        ),
+        migrations.RunPython(ids_to_blobs, ids_to_text),
+    ]
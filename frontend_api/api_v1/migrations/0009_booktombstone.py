@@ -0,0 +1,25 @@
+# Generated by Django 5.1.1 on 2026-10-19 13:51
+
+import api_v1.ids
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api_v1', '0008_cachegeneration'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='BookTombstone',
+            fields=[
+                ('id', api_v1.ids.CompactUUIDField(default=api_v1.ids.uuid7, editable=False, primary_key=True, serialize=False)),
+                ('book_id', api_v1.ids.CompactUUIDField()),
+                ('deleted_at', models.DateTimeField(auto_now_add=True)),
+            ],
+            options={
+                'indexes': [models.Index(fields=['deleted_at', 'book_id'], name='booktombstone_deleted_idx')],
+            },
+        ),
+    ]
@@ -0,0 +1,23 @@
+# Generated by Django 5.1.1 on 2026-10-19 13:55
+
+import api_v1.ids
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api_v1', '0009_booktombstone'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='BookAvailabilityEvent',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('book_id', api_v1.ids.CompactUUIDField()),
+                ('is_available', models.BooleanField()),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+            ],
+        ),
+    ]
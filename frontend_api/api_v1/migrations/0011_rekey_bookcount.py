@@ -0,0 +1,46 @@
+# Generated by Django 5.1.1 on 2026-10-19 14:20
+
+import string
+from collections import Counter
+from django.db import migrations
+
+# The filters only lower ASCII letters, like SQLite's LOWER(), so BookCount
+# keys lowered with str.lower() missed every non-ASCII category/publisher.
+ASCII_LOWERCASE = str.maketrans(string.ascii_uppercase, string.ascii_lowercase)
+
+
+def rekey_book_counts(apps, schema_editor):
+    Book = apps.get_model("api_v1", "Book")
+    BookCount = apps.get_model("api_v1", "BookCount")
+    db_alias = schema_editor.connection.alias
+
+    counts = Counter()
+    rows = (
+        Book.objects.using(db_alias)
+        .order_by()
+        .values_list("is_available", "category", "publisher")
+    )
+    for is_available, category, publisher in rows.iterator():
+        key = (
+            is_available,
+            category.translate(ASCII_LOWERCASE),
+            publisher.translate(ASCII_LOWERCASE),
+        )
+        counts[key] += 1
+
+    BookCount.objects.using(db_alias).all().delete()
+    BookCount.objects.using(db_alias).bulk_create(
+        BookCount(is_available=key[0], category=key[1], publisher=key[2], count=count)
+        for key, count in counts.items()
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api_v1', '0010_bookavailabilityevent'),
+    ]
+
+    operations = [
+        migrations.RunPython(rekey_book_counts, migrations.RunPython.noop),
+    ]
@@ -1,10 +1,12 @@
-import uuid
 from django.db import models
+from django.db.models.functions import Lower
 from django.contrib.auth.models import AbstractBaseUser
 
+from api_v1.ids import CompactUUIDField, uuid7
+
 
 class BaseModel(models.Model):
-    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    id = CompactUUIDField(primary_key=True, default=uuid7, editable=False)
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
@@ -30,15 +32,135 @@ class Book(BaseModel):
     category = models.CharField(max_length=50)
     is_available = models.BooleanField(default=True)
 
+    class Meta(BaseModel.Meta):
+        indexes = [
+            # Pages of books in the KeysetPagination order.
+            models.Index(fields=["-updated_at", "-id"], name="book_updated_idx"),
+            # Pages of available books (ListBooksView). Django renders
+            # `is_available=True` as a bare `WHERE "is_available"`, which
+            # SQLite only matches against a partial index.
+            models.Index(
+                fields=["-updated_at", "-id"],
+                condition=models.Q(is_available=True),
+                name="book_available_updated_idx",
+            ),
+            # Case-insensitive category/publisher filters (BookFilter).
+            models.Index(Lower("category"), name="book_category_lower_idx"),
+            models.Index(Lower("publisher"), name="book_publisher_lower_idx"),
+        ]
+
     def __str__(self):
         return self.title
 
 
+class BookCount(models.Model):
+    """
+    Number of books per (is_available, category, publisher), maintained on
+    every book write (see api_v1.counts) so lists can be counted without
+    `COUNT(*)`. Category and publisher are stored lowercased.
+    """
+
+    is_available = models.BooleanField()
+    category = models.CharField(max_length=50)
+    publisher = models.CharField(max_length=50)
+    count = models.IntegerField(default=0)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=["is_available", "category", "publisher"],
+                name="bookcount_key_unique",
+            ),
+        ]
+
+
+class BookTombstone(models.Model):
+    """
+    A deleted book, kept for CHANGE_FEED["TOMBSTONE_DAYS"] days so that the
+    clients syncing from the change feed (see api_v1.changes) learn about
+    the deletion.
+    """
+
+    id = CompactUUIDField(primary_key=True, default=uuid7, editable=False)
+    book_id = CompactUUIDField()
+    deleted_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        indexes = [
+            # Change feed pages, in (deleted_at, book_id) order.
+            models.Index(
+                fields=["deleted_at", "book_id"], name="booktombstone_deleted_idx"
+            ),
+        ]
+
+
+class BookAvailabilityEvent(models.Model):
+    """
+    A book becoming available or unavailable, logged in the transaction of
+    the change for the availability stream (see api_v1.availability). Ids
+    are allocated under the write lock, so they increase in commit order
+    and the stream follows the log by id.
+    """
+
+    book_id = CompactUUIDField()
+    is_available = models.BooleanField()
+    created_at = models.DateTimeField(auto_now_add=True)
+
+
+class CacheGeneration(models.Model):
+    """
+    Generation of a cached data set, replaced by a new time-ordered id on
+    every change to it (see api_v1.caching). Cache entries are keyed by the
+    generation they were built at, so a change invalidates all of them.
+    """
+
+    name = models.CharField(primary_key=True, max_length=50)
+    generation = CompactUUIDField(default=uuid7)
+
+
 class BorrowedBook(BaseModel):
     user = models.ForeignKey(User, on_delete=models.CASCADE)
     book = models.ForeignKey(Book, on_delete=models.CASCADE)
     borrowed_date = models.DateTimeField(auto_now_add=True)
     due_date = models.DateTimeField()
 
+    class Meta(BaseModel.Meta):
+        indexes = [
+            models.Index(fields=["book", "due_date"], name="borrowedbook_book_due_idx"),
+            # Borrow lists, paginated by DueDatePagination: a user's borrows,
+            # and the borrows due in a range of dates (active, overdue).
+            models.Index(
+                fields=["user", "-due_date", "-id"], name="borrowedbook_user_due_idx"
+            ),
+            models.Index(fields=["-due_date", "-id"], name="borrowedbook_due_idx"),
+        ]
+
     def __str__(self):
         return f"{self.user.email} borrowed {self.book.title}"
+
+
+class BorrowedBookHistory(models.Model):
+    """
+    Borrows moved out of BorrowedBook once they are over (see
+    api_v1.archive), so that the queries on borrows in progress don't read
+    past ones. Rows keep their BorrowedBook id and timestamps, and only the
+    columns of the borrow itself.
+    """
+
+    id = CompactUUIDField(primary_key=True, editable=False)
+    created_at = models.DateTimeField()
+    updated_at = models.DateTimeField()
+    # Indexed by borrowhistory_user_due_idx.
+    user = models.ForeignKey(User, on_delete=models.CASCADE, db_index=False)
+    book = models.ForeignKey(Book, on_delete=models.CASCADE)
+    borrowed_date = models.DateTimeField()
+    due_date = models.DateTimeField()
+    archived_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        indexes = [
+            models.Index(
+                fields=["user", "-due_date", "-id"], name="borrowhistory_user_due_idx"
+            ),
+            models.Index(fields=["-due_date", "-id"], name="borrowhistory_due_idx"),
+        ]
@@ -0,0 +1,303 @@
+import json
+import uuid
+from base64 import urlsafe_b64decode, urlsafe_b64encode
+from binascii import Error as BinasciiError
+from datetime import datetime
+from operator import itemgetter
+from django.db.models import F, Q
+from django_filters.utils import translate_validation
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import BasePagination
+from rest_framework.response import Response
+from rest_framework.settings import api_settings
+from rest_framework.utils.urls import remove_query_param, replace_query_param
+
+
+class KeysetPagination(BasePagination):
+    """
+    Cursor pagination keyed on `(updated_at, id)`, newest first.
+
+    A page is read as `WHERE (updated_at, id) < position ORDER BY updated_at
+    DESC, id DESC LIMIT n`, which an index on `(updated_at, id)` serves
+    without scanning the rows of the previous pages, so every page costs
+    the same however deep it is.
+
+    The count comes from the view's `get_row_count(request)` when it has
+    one and it doesn't return None, e.g. from BookCount. Otherwise at most
+    `count_limit` rows are counted and `count_is_exact` is false when
+    there are more.
+
+    Querysets a filter backend has explicitly ordered, e.g. by search
+    relevance, are kept in that order and paginated by an offset carried in
+    the cursor. Ranking already reads every match, so the offset doesn't
+    add to the cost of such pages.
+
+    Cursors are opaque base64 strings and are only valid with the query
+    parameters they were issued with.
+    """
+
+    cursor_query_param = "cursor"
+    cursor_query_description = "The pagination cursor value."
+    limit_query_param = "limit"
+    limit_query_description = "Number of results to return per page."
+    max_limit = 100
+    count_limit = 1000
+
+    position_fields = ("updated_at", "id")
+    # Aliases the position is read from, so that it is available whatever
+    # columns the serializer loads.
+    position_aliases = ("_cursor_updated_at", "_cursor_id")
+
+    def get_limit(self, request):
+        try:
+            limit = int(request.query_params[self.limit_query_param])
+        except (KeyError, ValueError):
+            return api_settings.PAGE_SIZE
+        return min(max(limit, 1), self.max_limit)
+
+    def encode_cursor(self, cursor):
+        data = json.dumps(cursor, separators=(",", ":")).encode()
+        encoded = urlsafe_b64encode(data).decode().rstrip("=")
+        return replace_query_param(self.base_url, self.cursor_query_param, encoded)
+
+    def decode_cursor(self, request):
+        encoded = request.query_params.get(self.cursor_query_param)
+        if not encoded:
+            return None
+
+        try:
+            data = urlsafe_b64decode(encoded + "=" * (-len(encoded) % 4))
+            cursor = json.loads(data)
+            if "o" in cursor:
+                cursor["o"] = max(int(cursor["o"]), 0)
+            else:
+                cursor["u"] = datetime.fromisoformat(cursor["u"])
+                cursor["i"] = uuid.UUID(cursor["i"])
+            cursor["r"] = bool(cursor.get("r"))
+        except (BinasciiError, ValueError, TypeError, KeyError):
+            raise NotFound("Invalid cursor")
+        return cursor
+
+    def get_count(self, queryset, request, view):
+        """Return the number of rows of `queryset` and whether it is exact."""
+        get_row_count = getattr(view, "get_row_count", None)
+        if get_row_count is not None:
+            count = get_row_count(request)
+            if count is not None:
+                return count, True
+
+        count = queryset.order_by()[: self.count_limit + 1].count()
+        return min(count, self.count_limit), count <= self.count_limit
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.base_url = request.build_absolute_uri()
+        self.limit = self.get_limit(request)
+        cursor = self.decode_cursor(request)
+        self.count, self.count_is_exact = self.get_count(queryset, request, view)
+
+        if queryset.query.order_by:
+            return self.paginate_by_offset(queryset, cursor)
+        return self.paginate_by_position([queryset], cursor)
+
+    def paginate_querysets(self, querysets, request, view=None):
+        """
+        Paginate the rows of several querysets, e.g. of a table and of its
+        archive, as one list. A page is read from each queryset and the
+        pages are merged, so every read is still an index range.
+        """
+        self.base_url = request.build_absolute_uri()
+        self.limit = self.get_limit(request)
+        cursor = self.decode_cursor(request)
+
+        counts = [self.get_count(queryset, request, None) for queryset in querysets]
+        self.count = sum(count for count, _ in counts)
+        self.count_is_exact = all(is_exact for _, is_exact in counts)
+
+        return self.paginate_by_position(querysets, cursor)
+
+    def paginate_by_offset(self, queryset, cursor):
+        offset = cursor["o"] if cursor and "o" in cursor else 0
+        page = list(queryset[offset : offset + self.limit + 1])
+
+        self.next_cursor = None
+        if len(page) > self.limit:
+            self.next_cursor = {"o": offset + self.limit}
+            page = page[: self.limit]
+
+        self.previous_cursor = None
+        if offset:
+            self.previous_cursor = {"o": max(offset - self.limit, 0)}
+
+        return page
+
+    def paginate_by_position(self, querysets, cursor):
+        if cursor and "o" in cursor:
+            raise NotFound("Invalid cursor")
+
+        reverse = cursor is not None and cursor["r"]
+
+        rows = []
+        for queryset in querysets:
+            queryset = self.get_position_queryset(queryset, cursor, reverse)
+            page, positions = self.split_positions(list(queryset[: self.limit + 1]))
+            rows.extend(zip(positions, page))
+        if len(querysets) > 1:
+            rows.sort(key=itemgetter(0), reverse=not reverse)
+
+        has_more = len(rows) > self.limit
+        rows = rows[: self.limit]
+        if reverse:
+            rows.reverse()
+
+        positions = [position for position, _ in rows]
+        page = [row for _, row in rows]
+
+        # A backward page was requested from the page after it, and a
+        # forward page with a cursor from the page before it.
+        has_next = has_more or reverse
+        has_previous = has_more if reverse else cursor is not None
+
+        self.next_cursor = self.previous_cursor = None
+        if page and has_next:
+            self.next_cursor = self.get_position_cursor(positions[-1])
+        if page and has_previous:
+            self.previous_cursor = self.get_position_cursor(positions[0], reverse=True)
+
+        return page
+
+    def get_position_queryset(self, queryset, cursor, reverse):
+        time_field, id_field = self.position_fields
+
+        # `time <= t AND (time < t OR id < i)` rather than the equivalent
+        # `time < t OR (time = t AND id < i)`: the first term bounds the
+        # index range, which SQLite doesn't derive from the disjunction.
+        if cursor is None:
+            queryset = queryset.order_by(f"-{time_field}", f"-{id_field}")
+        elif reverse:
+            queryset = queryset.filter(
+                Q(**{f"{time_field}__gte": cursor["u"]}),
+                Q(**{f"{time_field}__gt": cursor["u"]})
+                | Q(**{f"{id_field}__gt": cursor["i"]}),
+            ).order_by(time_field, id_field)
+        else:
+            queryset = queryset.filter(
+                Q(**{f"{time_field}__lte": cursor["u"]}),
+                Q(**{f"{time_field}__lt": cursor["u"]})
+                | Q(**{f"{id_field}__lt": cursor["i"]}),
+            ).order_by(f"-{time_field}", f"-{id_field}")
+
+        return queryset.annotate(
+            **{
+                alias: F(field)
+                for alias, field in zip(self.position_aliases, self.position_fields)
+            }
+        )
+
+    def split_positions(self, rows):
+        """Separate the page from the positions of its rows."""
+        if rows and isinstance(rows[0], tuple):
+            size = len(self.position_aliases)
+            return [row[:-size] for row in rows], [row[-size:] for row in rows]
+
+        positions = [
+            tuple(getattr(row, alias) for alias in self.position_aliases)
+            for row in rows
+        ]
+        return rows, positions
+
+    def get_position_cursor(self, position, reverse=False):
+        time, pk = position
+        cursor = {"u": time.isoformat(), "i": uuid.UUID(str(pk)).hex}
+        if reverse:
+            cursor["r"] = 1
+        return cursor
+
+    def get_next_link(self):
+        if self.next_cursor is None:
+            return None
+        return self.encode_cursor(self.next_cursor)
+
+    def get_previous_link(self):
+        if self.previous_cursor is None:
+            return None
+        if self.previous_cursor == {"o": 0}:
+            return remove_query_param(self.base_url, self.cursor_query_param)
+        return self.encode_cursor(self.previous_cursor)
+
+    def get_paginated_response(self, data):
+        return Response(
+            {
+                "count": self.count,
+                "count_is_exact": self.count_is_exact,
+                "next": self.get_next_link(),
+                "previous": self.get_previous_link(),
+                "results": data,
+            }
+        )
+
+    def get_paginated_response_schema(self, schema):
+        return {
+            "type": "object",
+            "required": ["count", "count_is_exact", "results"],
+            "properties": {
+                "count": {"type": "integer", "example": 123},
+                "count_is_exact": {"type": "boolean"},
+                "next": {"type": "string", "nullable": True, "format": "uri"},
+                "previous": {"type": "string", "nullable": True, "format": "uri"},
+                "results": schema,
+            },
+        }
+
+    def get_schema_operation_parameters(self, view):
+        return [
+            {
+                "name": self.cursor_query_param,
+                "required": False,
+                "in": "query",
+                "description": self.cursor_query_description,
+                "schema": {"type": "string"},
+            },
+            {
+                "name": self.limit_query_param,
+                "required": False,
+                "in": "query",
+                "description": self.limit_query_description,
+                "schema": {"type": "integer"},
+            },
+        ]
+
+
+class DueDatePagination(KeysetPagination):
+    """KeysetPagination keyed on `(due_date, id)`, latest due date first."""
+
+    position_fields = ("due_date", "id")
+    position_aliases = ("_cursor_due_date", "_cursor_id")
+
+
+class MergedListModelMixin:
+    """
+    List view mixin listing the rows of the querysets of `get_querysets()`,
+    e.g. of a table and of its archive, as one list paginated by the
+    pagination class's `paginate_querysets`. Each queryset is filtered by the
+    view's `filterset_class`.
+    """
+
+    def get_querysets(self):
+        raise NotImplementedError
+
+    def filter_querysets(self, querysets):
+        filtered = []
+        for queryset in querysets:
+            filterset = self.filterset_class(
+                self.request.query_params, queryset=queryset, request=self.request
+            )
+            if not filterset.is_valid():
+                raise translate_validation(filterset.errors)
+            filtered.append(filterset.qs)
+        return filtered
+
+    def list(self, request, *args, **kwargs):
+        querysets = self.filter_querysets(self.get_querysets())
+        page = self.paginator.paginate_querysets(querysets, request, self)
+        serializer = self.get_serializer(page, many=True)
+        return self.get_paginated_response(serializer.data)
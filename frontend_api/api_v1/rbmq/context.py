@@ -0,0 +1,46 @@
+import contextvars
+from functools import wraps
+from contextlib import contextmanager
+
+from api_v1.writer import run_write
+
+# Id of the event whose writes are currently being applied by a queue event
+# handler. Writes made while it is set are replicas of another service's
+# state and must not be published back to it.
+_consumed_event_id = contextvars.ContextVar("consumed_event_id", default=None)
+
+
+def get_causation_id():
+    """Return the id of the event currently being applied, if any."""
+    return _consumed_event_id.get()
+
+
+def is_replicating():
+    """Check if writes are being applied from another service's event."""
+    return _consumed_event_id.get() is not None
+
+
+@contextmanager
+def consuming_event(event_id):
+    """Mark every write made inside the block as caused by `event_id`."""
+    token = _consumed_event_id.set(event_id or "")
+    try:
+        yield
+    finally:
+        _consumed_event_id.reset(token)
+
+
+def replicated_event_handler(handler):
+    """
+    Wrap a queue event handler so the writes it makes are treated as
+    replicated and are not re-published by the signal receivers, and are
+    applied as one write (see api_v1.writer).
+    """
+
+    @wraps(handler)
+    def wrapper(ch, method, properties, body):
+        event_id = getattr(properties, "message_id", None)
+        with consuming_event(event_id):
+            return run_write(handler, ch, method, properties, body)
+
+    return wrapper
@@ -1,10 +1,16 @@
 import json
 import logging
+from django.utils import timezone
+from api_v1.rbmq.context import replicated_event_handler
 from api_v1.models import Book
+from api_v1.counts import update_books
+from api_v1.caching import BOOK_GENERATION, bump_generation
+from api_v1.availability import record_availability_change
 
 logger = logging.getLogger("api_v1")
 
 
+@replicated_event_handler
 def handle_book_events(ch, method, properties, body):
     """Handle Created, Updated, and Deleted book events"""
     event_data = json.loads(body)
@@ -15,10 +21,23 @@ def handle_book_events(ch, method, properties, body):
     if action == "created":
         Book.objects.create(**book_data)
     elif action == "updated":
-        Book.objects.filter(id=book_data["id"]).update(**book_data)
+        books = Book.objects.filter(id=book_data["id"])
+        was_available = books.values_list("is_available", flat=True).first()
+        # Stamped with the time the update is applied here rather than the
+        # sender's, so that the change feed (see api_v1.changes) serves it
+        # after the changes applied before it.
+        update_books(books, **{**book_data, "updated_at": timezone.now()})
+
+        is_available = book_data.get("is_available", was_available)
+        if was_available is not None and is_available != was_available:
+            record_availability_change(book_data["id"], is_available)
     elif action == "deleted":
         Book.objects.filter(id=book_data["id"]).delete()
 
+    # Updates bypass the Book signals, which bump it for the other actions.
+    if action == "updated":
+        bump_generation(BOOK_GENERATION)
+
     if action:
         logger.info(
             f"{action.title()} book: {book_data['title']} by {book_data['author']}"
@@ -1,4 +1,4 @@
-import json
+import uuid
 import logging
 import time
 from datetime import datetime
@@ -6,6 +6,9 @@ from os import getenv
 import dotenv
 import pika
 
+from api_v1.utils import encode_event
+from api_v1.rbmq.context import get_causation_id
+
 dotenv.load_dotenv()
 
 logger = logging.getLogger("api_v1")
@@ -69,6 +72,10 @@ class RBMQ:
         """
         Publish an event to RabbitMQ.
 
+        The message is tagged with this service as its origin (`app_id`), a
+        unique event id (`message_id`) and, when published while applying
+        another event, the id of that event (`correlation_id`).
+
         Args:
             event_data (dict): The event data to publish.
             routing_key (str): The routing key for the event.
@@ -82,10 +89,17 @@ class RBMQ:
 
         try:
             event_data["timestamp"] = str(datetime.now())
+            properties = pika.BasicProperties(
+                app_id=self.exchange_name,
+                message_id=uuid.uuid4().hex,
+                correlation_id=get_causation_id() or None,
+                content_type="application/json",
+            )
             self.channel.basic_publish(
                 exchange=self.exchange_name,
                 routing_key=routing_key,
-                body=json.dumps(event_data),
+                body=encode_event(event_data),
+                properties=properties,
             )
             logger.info(f"Successfully published event for '{routing_key}'")
             return True
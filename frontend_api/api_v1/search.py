@@ -0,0 +1,182 @@
+from django.db import connections
+from django.db.models import BooleanField, FloatField
+from django.db.models.expressions import RawSQL
+from rest_framework.filters import SearchFilter
+
+from api_v1.models import Book
+
+
+class SearchIndex:
+    """
+    SQLite FTS5 index over text columns of a model.
+
+    The index is an external-content FTS5 table keyed by the rowid of the
+    model table, kept in sync by triggers so that every write is indexed,
+    including `QuerySet.update()` calls from the event handlers. Matches
+    are ranked by bm25 with the given column weights.
+
+    The table and its triggers are created by a migration. The model table
+    has no INTEGER primary key, so its rowids aren't stable: VACUUM may
+    renumber them, and so do migrations that alter the table, which SQLite
+    recreates without the triggers. Run the `rebuild_search_index` command
+    after a VACUUM, and end such migrations with the operations of the one
+    creating the index.
+    """
+
+    def __init__(self, model, weights):
+        self.model = model
+        self.weights = weights
+
+    @property
+    def content_table(self):
+        return self.model._meta.db_table
+
+    @property
+    def table(self):
+        return f"{self.content_table}_fts"
+
+    @property
+    def columns(self):
+        return list(self.weights)
+
+    def get_triggers(self):
+        columns = ", ".join(self.columns)
+        new_values = ", ".join(f"new.{column}" for column in self.columns)
+        old_values = ", ".join(f"old.{column}" for column in self.columns)
+
+        insert = (
+            f"INSERT INTO {self.table}(rowid, {columns}) "
+            f"VALUES (new.rowid, {new_values});"
+        )
+        delete = (
+            f"INSERT INTO {self.table}({self.table}, rowid, {columns}) "
+            f"VALUES ('delete', old.rowid, {old_values});"
+        )
+        return {
+            f"{self.table}_ai": f"AFTER INSERT ON {self.content_table} BEGIN {insert} END",
+            f"{self.table}_ad": f"AFTER DELETE ON {self.content_table} BEGIN {delete} END",
+            f"{self.table}_au": (
+                f"AFTER UPDATE OF {columns} ON {self.content_table} "
+                f"BEGIN {delete} {insert} END"
+            ),
+        }
+
+    def install(self, connection):
+        """
+        Create the index and its triggers if they are missing, and rebuild
+        the index when a trigger had to be created.
+        """
+        if connection.vendor != "sqlite":
+            return
+
+        triggers = self.get_triggers()
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f"CREATE VIRTUAL TABLE IF NOT EXISTS {self.table} USING fts5("
+                f"{', '.join(self.columns)}, content='{self.content_table}', "
+                "content_rowid='rowid', prefix='2 3', "
+                "tokenize='unicode61 remove_diacritics 2')"
+            )
+            cursor.execute(
+                "SELECT name FROM sqlite_master WHERE type = 'trigger' "
+                f"AND tbl_name = '{self.content_table}'"
+            )
+            existing = {name for (name,) in cursor.fetchall()}
+            missing = [name for name in triggers if name not in existing]
+
+            for name in missing:
+                cursor.execute(f"CREATE TRIGGER {name} {triggers[name]}")
+
+        if missing:
+            self.rebuild(connection)
+
+    def rebuild(self, connection):
+        """Reindex every row of the model table."""
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f"INSERT INTO {self.table}({self.table}) VALUES ('rebuild')"
+            )
+
+    def search(self, queryset, match):
+        """
+        Filter `queryset` to the rows matching the FTS5 query `match`,
+        best matches first.
+        """
+        weights = ", ".join(str(weight) for weight in self.weights.values())
+        # The rowids matching are read once, and their rows looked up by
+        # rowid. Only those rows are ranked.
+        matches = RawSQL(
+            f"{self.content_table}.rowid IN "
+            f"(SELECT rowid FROM {self.table} WHERE {self.table} MATCH %s)",
+            (match,),
+            output_field=BooleanField(),
+        )
+        rank = RawSQL(
+            f"SELECT bm25({self.table}, {weights}) FROM {self.table} "
+            f"WHERE {self.table} MATCH %s "
+            f"AND {self.table}.rowid = {self.content_table}.rowid",
+            (match,),
+            output_field=FloatField(),
+        )
+        return queryset.filter(matches).order_by(rank, "pk")
+
+
+book_search_index = SearchIndex(Book, {"title": 2.0, "author": 1.0})
+
+
+def quote_term(term):
+    """Quote a search term as an FTS5 string, keeping a trailing `*`."""
+    prefix = term.endswith("*")
+    term = term.rstrip("*")
+    if not term:
+        return None
+    return '"{}"{}'.format(term.replace('"', '""'), "*" if prefix else "")
+
+
+def build_match_expression(search_terms, columns):
+    """
+    Build an FTS5 query matching every term in any of `columns`.
+
+    A term ending in `*` matches as a prefix and `column:term` restricts a
+    term to one of the columns, e.g. `author:tolk*`.
+    """
+    expressions = []
+    for term in search_terms:
+        term_columns = columns
+        column, separator, value = term.partition(":")
+        if separator and column in columns:
+            term_columns, term = [column], value
+
+        phrase = quote_term(term)
+        if phrase is None:
+            continue
+        expressions.append("{%s} : %s" % (" ".join(term_columns), phrase))
+
+    return " AND ".join(expressions)
+
+
+class FullTextSearchFilter(SearchFilter):
+    """
+    `SearchFilter` backed by the view's `search_index` on SQLite, falling
+    back to `LIKE` lookups on `search_fields` otherwise.
+    """
+
+    def filter_queryset(self, request, queryset, view):
+        search_index = getattr(view, "search_index", None)
+        search_fields = self.get_search_fields(view, request)
+        if (
+            search_index is None
+            or connections[queryset.db].vendor != "sqlite"
+            or not search_fields
+            or not set(search_fields) <= set(search_index.columns)
+        ):
+            return super().filter_queryset(request, queryset, view)
+
+        search_terms = self.get_search_terms(request)
+        if not search_terms:
+            return queryset
+
+        match = build_match_expression(search_terms, search_fields)
+        if not match:
+            return queryset.none()
+        return search_index.search(queryset, match)
@@ -1,15 +1,29 @@
 from rest_framework import serializers
 from rest_framework.validators import UniqueValidator
+from rest_framework_simplejwt.serializers import TokenRefreshSerializer
 from django.contrib.auth import authenticate
 from django.contrib.auth.password_validation import validate_password
 
-from api_v1.models import Book, BorrowedBook, User
+from api_v1.models import Book, BorrowedBook, BorrowedBookHistory, User
+from api_v1.blacklist import RefreshToken
+from api_v1.values import ValuesListSerializer
+from api_v1.fieldsets import SparseFieldsetMixin
 
 
-class BookSerializer(serializers.ModelSerializer):
+class BookSerializer(SparseFieldsetMixin, serializers.ModelSerializer):
     class Meta:
         model = Book
         fields = "__all__"
+        list_serializer_class = ValuesListSerializer
+
+
+class BookChangesSerializer(serializers.Serializer):
+    books = BookSerializer(many=True, help_text="Books created or updated.")
+    deleted = serializers.ListField(
+        child=serializers.UUIDField(), help_text="Ids of the books deleted."
+    )
+    token = serializers.CharField(help_text="Token to request the next changes with.")
+    has_more = serializers.BooleanField()
 
 
 class BorrowedBookSerializer(serializers.ModelSerializer):
@@ -31,6 +45,29 @@ class BorrowedBookSerializer(serializers.ModelSerializer):
         return book
 
 
+class BorrowHistorySerializer(SparseFieldsetMixin, serializers.ModelSerializer):
+    """Renders borrows of both BorrowedBook and BorrowedBookHistory."""
+
+    archived = serializers.SerializerMethodField()
+
+    class Meta:
+        model = BorrowedBookHistory
+        fields = [
+            "id",
+            "created_at",
+            "updated_at",
+            "user",
+            "book",
+            "borrowed_date",
+            "due_date",
+            "archived",
+        ]
+        columnless_fields = ["archived"]
+
+    def get_archived(self, borrow) -> bool:
+        return isinstance(borrow, BorrowedBookHistory)
+
+
 class UserSerializer(serializers.ModelSerializer):
     class Meta:
         model = User
@@ -115,3 +152,7 @@ class LoginSerializer(serializers.Serializer):
 
 class LogoutSerializer(serializers.Serializer):
     refresh = serializers.CharField()
+
+
+class JWTRefreshSerializer(TokenRefreshSerializer):
+    token_class = RefreshToken
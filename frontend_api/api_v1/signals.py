@@ -2,80 +2,163 @@ import sys
 import signal
 import logging
 from django.dispatch import receiver, Signal
-from django.db.models.signals import post_save, post_delete
+from django.db import transaction
+from django.db.models.signals import pre_save, post_save, post_delete
 
 from api_v1.rbmq.manager import get_rbmq_client
-from api_v1.utils import convert_to_serializable
-from api_v1.models import Book, BorrowedBook, User
-from api_v1.serializers import BookSerializer, BorrowedBookSerializer, UserSerializer
+from api_v1.rbmq.context import is_replicating
+from api_v1.rbmq.buffer import publish_on_commit
+from api_v1.models import Book, BookTombstone, BorrowedBook, User
+from api_v1.caching import BOOK_GENERATION, USER_GENERATION, bump_generation
+from api_v1.availability import record_availability_change
+from api_v1.authentication import invalidate_cached_user
+from api_v1.counts import (
+    COUNTED_FIELDS,
+    adjust_book_count,
+    get_book_count_key,
+    get_count_key,
+    move_book_count,
+)
+from api_v1.projections import BookProjection, BorrowedBookProjection, UserProjection
 
 logger = logging.getLogger("api_v1")
 rbmq_client = get_rbmq_client(exchange_name="frontend_api")
 
+# Fields a login saves (see api_v1.views).
+LOGIN_FIELDS = {"last_login", "updated_at"}
+
 
 @receiver(post_save, sender=Book)
 def publish_book_updated_event(sender, instance, **kwargs):
-    serializer = BookSerializer(instance)
+    if is_replicating():
+        # Replicated write; the originating service already published it.
+        return
 
-    event_data = {"book": serializer.data}
-    routing_key = "book.updated"
+    publish_on_commit(instance, "updated", publish_book_event)
+
+
+@receiver(pre_save, sender=Book)
+def remember_book_count_key(sender, instance, update_fields=None, **kwargs):
+    """Remember the BookCount key of the row a book save overwrites."""
+    instance._count_key = None
+    if update_fields is not None and not set(update_fields) & set(COUNTED_FIELDS):
+        return
+
+    row = sender.objects.filter(pk=instance.pk).values_list(*COUNTED_FIELDS).first()
+    if row is not None:
+        instance._count_key = get_count_key(*row)
+
+
+@receiver(post_save, sender=Book)
+def update_book_count(sender, instance, update_fields=None, **kwargs):
+    if update_fields is not None and not set(update_fields) & set(COUNTED_FIELDS):
+        return
+
+    move_book_count(instance._count_key, get_book_count_key(instance))
 
-    ok = rbmq_client.publish_event(event_data=event_data, routing_key=routing_key)
-    if not ok:
-        logger.error(f"Failed to publish {routing_key} event for {instance.id}")
+
+@receiver(post_delete, sender=Book)
+def update_deleted_book_count(sender, instance, **kwargs):
+    adjust_book_count(get_book_count_key(instance), -1)
+
+
+@receiver(post_save, sender=Book)
+@receiver(post_delete, sender=Book)
+def invalidate_cached_books(sender, instance, **kwargs):
+    bump_generation(BOOK_GENERATION)
+
+
+@receiver(post_delete, sender=Book)
+def record_book_tombstone(sender, instance, **kwargs):
+    """Keep the deletion for the change feed (see api_v1.changes)."""
+    BookTombstone.objects.create(book_id=instance.id)
+
+
+@receiver(post_save, sender=Book)
+def record_book_availability(sender, instance, **kwargs):
+    # The BookCount key of the row the save overwrote (see
+    # remember_book_count_key) has its previous availability.
+    old_key = instance._count_key
+    if old_key is not None and old_key[0] != bool(instance.is_available):
+        record_availability_change(instance.id, instance.is_available)
 
 
 @receiver(post_save, sender=BorrowedBook)
 def publish_borrowed_book_created_event(sender, instance, created, **kwargs):
-    serializer = BorrowedBookSerializer(instance)
-    book_data = convert_to_serializable(serializer.data)
+    if is_replicating():
+        return
 
     if created:
-        event_data = {
-            "borrowed_book": book_data,
-            "action": "created",
-        }
-        routing_key = "borrowed_book.created"
-
-        ok = rbmq_client.publish_event(event_data=event_data, routing_key=routing_key)
-        if not ok:
-            logger.error(f"Failed to publish {routing_key} event for {instance.id}")
+        publish_on_commit(instance, "created", publish_borrowed_book_event)
 
 
 @receiver(post_save, sender=User)
 def publish_user_create_updated_event(sender, instance, created, **kwargs):
-    serializer = UserSerializer(instance)
-    user_data = convert_to_serializable(serializer.data)
+    if is_replicating():
+        return
 
     action = "created" if created else "updated"
+    publish_on_commit(instance, action, publish_user_event)
+
+
+@receiver(post_delete, sender=User)
+def publish_user_deleted_event(sender, instance, **kwargs):
+    """Handler to trigger when a user is deleted."""
+    if is_replicating():
+        return
+
+    publish_on_commit(instance, "deleted", publish_user_event)
+
+
+def publish_book_event(instance, action):
+    event_data = {"book": BookProjection.project(instance)}
+    routing_key = "book.updated"
+
+    ok = rbmq_client.publish_event(event_data=event_data, routing_key=routing_key)
+    if not ok:
+        logger.error(f"Failed to publish {routing_key} event for {instance.id}")
+
+
+def publish_borrowed_book_event(instance, action):
     event_data = {
-        "user": user_data,
+        "borrowed_book": BorrowedBookProjection.project(instance),
         "action": action,
     }
-    routing_key = f"user.{action}"
+    routing_key = f"borrowed_book.{action}"
 
     ok = rbmq_client.publish_event(event_data=event_data, routing_key=routing_key)
     if not ok:
         logger.error(f"Failed to publish {routing_key} event for {instance.id}")
 
 
-@receiver(post_delete, sender=User)
-def publish_user_deleted_event(sender, instance, **kwargs):
-    """Handler to trigger when a user is deleted."""
-    serializer = UserSerializer(instance)
-    user_data = convert_to_serializable(serializer.data)
-
+def publish_user_event(instance, action):
     event_data = {
-        "user": user_data,
-        "action": "deleted",
+        "user": UserProjection.project(instance),
+        "action": action,
     }
-    routing_key = "user.deleted"
+    routing_key = f"user.{action}"
 
     ok = rbmq_client.publish_event(event_data=event_data, routing_key=routing_key)
     if not ok:
         logger.error(f"Failed to publish {routing_key} event for {instance.id}")
 
 
+@receiver(post_save, sender=User)
+@receiver(post_delete, sender=User)
+def drop_cached_user(sender, instance, created=False, update_fields=None, **kwargs):
+    """
+    Drop the user from the JWT user cache of this process, and from the
+    caches of the others by starting a new USER_GENERATION. New users and
+    logins, which only save last_login, don't change a cached user.
+    """
+    user_id = instance.pk
+    transaction.on_commit(lambda: invalidate_cached_user(user_id))
+
+    if created or (update_fields and set(update_fields) <= LOGIN_FIELDS):
+        return
+    bump_generation(USER_GENERATION)
+
+
 # Custom signal to indicate Django app termination
 sigterm_received = Signal()
 
@@ -0,0 +1,64 @@
+from io import StringIO
+from django.test import TestCase, override_settings
+from django.utils import timezone
+from django.core.management import call_command
+
+from api_v1.archive import archive_borrows
+from api_v1.models import Book, BorrowedBook, BorrowedBookHistory, User
+
+
+@override_settings(BORROW_ARCHIVE={"RETURNED_DAYS": 30, "DAYS": 365, "CHUNK_SIZE": 2})
+class ArchiveBorrowsTest(TestCase):
+    def setUp(self):
+        self.user = User.objects.create(email="borrower@example.com")
+        self.now = timezone.now()
+
+    def borrow(self, days, is_available=False):
+        book = Book.objects.create(
+            title="Book",
+            author="Author",
+            published_date="2024-01-01",
+            publisher="Publisher",
+            category="Fiction",
+            is_available=is_available,
+        )
+        return BorrowedBook.objects.create(
+            book=book, user=self.user, due_date=self.now + timezone.timedelta(days)
+        )
+
+    def test_finished_borrows_are_moved_to_the_history(self):
+        returned = self.borrow(-40, is_available=True)
+        old = self.borrow(-400)
+        kept = [
+            self.borrow(7),
+            # Overdue, not returned yet.
+            self.borrow(-40),
+            # Returned recently.
+            self.borrow(-10, is_available=True),
+        ]
+
+        self.assertEqual(archive_borrows(now=self.now), 2)
+
+        self.assertQuerySetEqual(
+            BorrowedBook.objects.order_by("due_date"), kept, ordered=False
+        )
+        history = BorrowedBookHistory.objects.order_by("due_date")
+        self.assertEqual(
+            [(borrow.id, borrow.book_id, borrow.due_date) for borrow in history],
+            [
+                (borrow.id, borrow.book_id, borrow.due_date)
+                for borrow in [old, returned]
+            ],
+        )
+
+    def test_borrows_are_archived_in_chunks(self):
+        for days in range(-45, -40):
+            self.borrow(days, is_available=True)
+
+        out = StringIO()
+        call_command("archive_borrows", chunk_size=2, stdout=out)
+
+        self.assertIn("Archived 5 borrow(s)", out.getvalue())
+        self.assertFalse(BorrowedBook.objects.exists())
+        self.assertEqual(BorrowedBookHistory.objects.count(), 5)
+        self.assertEqual(archive_borrows(), 0)
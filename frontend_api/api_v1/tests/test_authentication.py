@@ -0,0 +1,99 @@
+from unittest import mock
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from rest_framework.exceptions import AuthenticationFailed
+from rest_framework_simplejwt.tokens import AccessToken
+
+from api_v1.models import User
+from api_v1.authentication import CachedJWTAuthentication, user_cache
+from api_v1.views import log_in
+from api_v1.caching import USER_GENERATION, bump_generation, get_generation
+
+
+@override_settings(
+    JWT_USER_CACHE={"MAX_SIZE": 2, "TTL_SECONDS": 60, "SYNC_SECONDS": 5}
+)
+class CachedJWTAuthenticationTest(TestCase):
+    def setUp(self):
+        user_cache.clear()
+        self.addCleanup(user_cache.clear)
+        self.authentication = CachedJWTAuthentication()
+        self.user = self.create_user("user@example.com")
+
+    def create_user(self, email):
+        return User.objects.create(email=email)
+
+    def get_user(self, user):
+        return self.authentication.get_user(AccessToken.for_user(user))
+
+    def test_cached_users_are_not_queried(self):
+        self.get_user(self.user)
+
+        with CaptureQueriesContext(connection) as queries:
+            user = self.get_user(self.user)
+
+        self.assertEqual(len(queries), 0)
+        self.assertEqual(user, self.user)
+        self.assertIsNot(user, self.get_user(self.user))
+
+    def test_saved_and_deleted_users_are_dropped(self):
+        self.get_user(self.user)
+        with self.captureOnCommitCallbacks(execute=True):
+            self.user.first_name = "Renamed"
+            self.user.save()
+
+        self.assertEqual(self.get_user(self.user).first_name, "Renamed")
+
+        token = AccessToken.for_user(self.user)
+        with self.captureOnCommitCallbacks(execute=True):
+            self.user.delete()
+
+        with self.assertRaises(AuthenticationFailed):
+            self.authentication.get_user(token)
+
+    def test_users_expire(self):
+        self.get_user(self.user)
+        User.objects.filter(id=self.user.id).update(first_name="Renamed")
+
+        with mock.patch("api_v1.authentication.time.monotonic") as monotonic:
+            monotonic.return_value = 10**9
+            user = self.get_user(self.user)
+
+        self.assertEqual(user.first_name, "Renamed")
+
+    def test_users_changed_by_other_processes_are_dropped(self):
+        self.get_user(self.user)
+        # Another process renames the user.
+        User.objects.filter(id=self.user.id).update(first_name="Renamed")
+        bump_generation(USER_GENERATION)
+
+        self.assertEqual(self.get_user(self.user).first_name, "")
+
+        with mock.patch("api_v1.authentication.time.monotonic") as monotonic:
+            monotonic.return_value = user_cache.synced_at + 5
+            user = self.get_user(self.user)
+
+        self.assertEqual(user.first_name, "Renamed")
+
+    def test_logins_keep_the_users_cached_by_other_processes(self):
+        log_in(self.user)
+
+        self.assertIsNone(get_generation(USER_GENERATION))
+
+    def test_inactive_cached_users_are_rejected(self):
+        self.get_user(self.user)
+        user_cache.get(str(self.user.id)).is_active = False
+
+        with self.assertRaises(AuthenticationFailed):
+            self.get_user(self.user)
+
+    def test_least_recently_used_users_are_evicted(self):
+        users = [self.user] + [
+            self.create_user(f"user{i}@example.com") for i in range(2)
+        ]
+        for user in users:
+            self.get_user(user)
+
+        self.assertIsNone(user_cache.get(str(self.user.id)))
+        self.assertIsNotNone(user_cache.get(str(users[2].id)))
@@ -0,0 +1,152 @@
+import json
+import asyncio
+from io import StringIO
+from asgiref.sync import sync_to_async
+from django.urls import reverse
+from django.utils import timezone
+from django.core.management import call_command
+from django.test import AsyncClient, TestCase, override_settings
+
+from api_v1.models import Book, BookAvailabilityEvent
+from api_v1.rbmq.event_handlers import handle_book_events
+from api_v1.availability import get_hub, record_availability_change
+
+AVAILABILITY_STREAM = {
+    "POLL_SECONDS": 0.01,
+    "HEARTBEAT_SECONDS": 0.05,
+    "QUEUE_SIZE": 2,
+    "KEEP_HOURS": 24,
+}
+
+
+def create_book(title="Book", **kwargs):
+    return Book.objects.create(
+        title=title,
+        author="Author",
+        published_date="2024-01-01",
+        publisher="Publisher",
+        category="Fiction",
+        **kwargs,
+    )
+
+
+class AvailabilityEventTest(TestCase):
+    def get_events(self):
+        events = BookAvailabilityEvent.objects.values_list("book_id", "is_available")
+        return list(events)
+
+    def test_saves_log_availability_transitions(self):
+        book = create_book()
+        book.title = "Renamed"
+        book.save()
+        self.assertEqual(self.get_events(), [])
+
+        book.is_available = False
+        book.save()
+        book.is_available = True
+        book.save()
+
+        self.assertEqual(self.get_events(), [(book.id, False), (book.id, True)])
+
+    def test_book_events_log_availability_transitions(self):
+        book = create_book()
+
+        for is_available in [True, False]:
+            book_data = {
+                "id": str(book.id),
+                "title": book.title,
+                "author": book.author,
+                "is_available": is_available,
+            }
+            body = json.dumps({"action": "updated", "book": book_data})
+            handle_book_events(None, None, None, body)
+
+        self.assertEqual(self.get_events(), [(book.id, False)])
+
+    @override_settings(AVAILABILITY_STREAM=AVAILABILITY_STREAM)
+    def test_prune_availability_events(self):
+        book = create_book()
+        record_availability_change(book.id, False)
+        BookAvailabilityEvent.objects.update(
+            created_at=timezone.now() - timezone.timedelta(hours=25)
+        )
+        record_availability_change(book.id, True)
+
+        out = StringIO()
+        call_command("prune_availability_events", stdout=out)
+
+        self.assertIn("Pruned 1 event(s)", out.getvalue())
+        self.assertEqual(self.get_events(), [(book.id, True)])
+
+
+@override_settings(AVAILABILITY_STREAM=AVAILABILITY_STREAM)
+class BookAvailabilityStreamViewTest(TestCase):
+    def setUp(self):
+        self.books = [create_book(f"Book {i}") for i in range(2)]
+        self.url = reverse("book-availability-stream")
+
+    async def read_event(self, content):
+        """Return the next event of the stream, skipping the heartbeats."""
+        while True:
+            chunk = await asyncio.wait_for(anext(content), timeout=5)
+            if not chunk.startswith(b":"):
+                fields = dict(
+                    line.split(": ", 1) for line in chunk.decode().strip().split("\n")
+                )
+                return fields["event"], json.loads(fields["data"])
+
+    async def test_subscribers_receive_the_transitions_of_their_books(self):
+        book = self.books[0]
+        response = await AsyncClient().get(self.url, {"book": str(book.id)})
+        self.assertEqual(response["Content-Type"], "text/event-stream")
+        content = aiter(response.streaming_content)
+        # The response starts streaming when it is first read.
+        first_event = asyncio.ensure_future(self.read_event(content))
+        await asyncio.sleep(0.05)
+
+        await sync_to_async(record_availability_change)(self.books[1].id, False)
+        await sync_to_async(record_availability_change)(book.id, False)
+
+        self.assertEqual(
+            await first_event,
+            ("availability", {"book": str(book.id), "is_available": False}),
+        )
+        await content.aclose()
+
+    async def test_subscribers_resume_after_the_last_event_id(self):
+        book = self.books[0]
+        await sync_to_async(record_availability_change)(book.id, False)
+        await sync_to_async(record_availability_change)(book.id, True)
+        events = BookAvailabilityEvent.objects.order_by("id")
+        first_id = await events.values_list("id", flat=True).afirst()
+
+        response = await AsyncClient().get(
+            self.url, {"book": str(book.id)}, headers={"Last-Event-ID": str(first_id)}
+        )
+        content = aiter(response.streaming_content)
+
+        self.assertEqual(
+            await self.read_event(content),
+            ("availability", {"book": str(book.id), "is_available": True}),
+        )
+        await content.aclose()
+
+    async def test_invalid_book_id(self):
+        response = await AsyncClient().get(self.url, {"book": "invalid"})
+
+        self.assertEqual(response.status_code, 400)
+
+    def test_not_served_over_wsgi(self):
+        response = self.client.get(self.url)
+
+        self.assertEqual(response.status_code, 501)
+
+    async def test_subscribers_falling_behind_are_dropped(self):
+        hub = get_hub()
+        queue, _ = await hub.subscribe()
+
+        for event_id in range(3):
+            hub.publish((event_id, self.books[0].id, False))
+
+        self.assertFalse(hub.is_subscribed(queue))
+        self.assertEqual(queue.qsize(), 2)
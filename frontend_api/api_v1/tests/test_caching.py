@@ -0,0 +1,64 @@
+import json
+from django.urls import reverse
+from django.db import connection
+from django.core.cache import caches
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APITestCase
+
+from api_v1.models import Book
+from api_v1.views import ListBooksView
+from api_v1.rbmq.event_handlers import handle_book_events
+
+
+class ListBooksCacheTest(APITestCase):
+    def setUp(self):
+        caches["pages"].clear()
+        self.book = Book.objects.create(
+            title="Cached",
+            author="Author",
+            published_date="2024-01-01",
+            publisher="Publisher",
+            category="Fiction",
+        )
+        self.url = reverse("list-books")
+
+    def get_titles(self, params=None):
+        response = self.client.get(self.url, params)
+        return [book["title"] for book in response.data["results"]]
+
+    def test_pages_are_served_from_the_cache(self):
+        stats = ListBooksView.cache_stats
+        hits = stats.hits
+
+        self.assertEqual(self.get_titles({"limit": 5}), ["Cached"])
+        with CaptureQueriesContext(connection) as queries:
+            self.assertEqual(self.get_titles({"limit": 5, "search": ""}), ["Cached"])
+
+        # Only the generation is read.
+        self.assertEqual(len(queries), 1)
+        self.assertEqual(stats.hits, hits + 1)
+
+    def test_book_writes_invalidate_the_cache(self):
+        self.get_titles()
+
+        self.book.title = "Saved"
+        self.book.save()
+        self.assertEqual(self.get_titles(), ["Saved"])
+
+        Book.objects.create(
+            title="Created",
+            author="Author",
+            published_date="2024-01-01",
+            publisher="Publisher",
+            category="Fiction",
+        )
+        self.assertEqual(self.get_titles(), ["Created", "Saved"])
+
+    def test_book_events_invalidate_the_cache(self):
+        self.get_titles()
+
+        book_data = {"id": str(self.book.id), "title": "Replicated", "author": "A"}
+        body = json.dumps({"action": "updated", "book": book_data})
+        handle_book_events(None, None, None, body)
+
+        self.assertEqual(self.get_titles(), ["Replicated"])
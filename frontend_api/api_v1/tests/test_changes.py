@@ -0,0 +1,129 @@
+from io import StringIO
+from django.urls import reverse
+from django.utils import timezone
+from django.core.management import call_command
+from django.test import override_settings
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from api_v1.models import Book, BookTombstone
+from api_v1.changes import encode_token, filter_after
+
+
+@override_settings(CHANGE_FEED={"SETTLE_SECONDS": 0, "TOMBSTONE_DAYS": 30})
+class ListBookChangesViewTest(APITestCase):
+    def setUp(self):
+        self.books = [self.create_book(f"Book {i}") for i in range(3)]
+        self.url = reverse("list-book-changes")
+
+    def create_book(self, title):
+        return Book.objects.create(
+            title=title,
+            author="Author",
+            published_date="2024-01-01",
+            publisher="Publisher",
+            category="Fiction",
+        )
+
+    def sync(self, token=None, limit=2):
+        """Follow the feed from `token`, returning its changes and last token."""
+        books, deleted = [], []
+        while True:
+            params = {"limit": limit}
+            if token is not None:
+                params["since"] = token
+            response = self.client.get(self.url, params)
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+            books += [book["title"] for book in response.data["books"]]
+            deleted += response.data["deleted"]
+            token = response.data["token"]
+            if not response.data["has_more"]:
+                return books, deleted, token
+
+    def test_sync_without_token_returns_every_book(self):
+        books, deleted, token = self.sync()
+
+        self.assertEqual(books, ["Book 0", "Book 1", "Book 2"])
+        self.assertEqual(deleted, [])
+        self.assertEqual(self.sync(token)[:2], ([], []))
+
+    def test_sync_returns_the_changes_since_the_token(self):
+        _, _, token = self.sync()
+
+        deleted_id = self.books[1].id
+        self.books[0].title = "Updated"
+        self.books[0].save()
+        self.books[1].delete()
+        self.create_book("Created")
+
+        books, deleted, token = self.sync(token, limit=1)
+
+        self.assertEqual(books, ["Updated", "Created"])
+        self.assertEqual(deleted, [str(deleted_id)])
+        self.assertEqual(self.sync(token)[:2], ([], []))
+
+    def test_changes_are_served_once_settled(self):
+        settling = {"SETTLE_SECONDS": 60, "TOMBSTONE_DAYS": 30}
+        with override_settings(CHANGE_FEED=settling):
+            books, _, token = self.sync()
+
+        self.assertEqual(books, [])
+        books, _, _ = self.sync(token)
+        self.assertEqual(books, ["Book 0", "Book 1", "Book 2"])
+
+    def test_full_sync_of_books_older_than_the_tombstones(self):
+        Book.objects.update(updated_at=timezone.now() - timezone.timedelta(days=60))
+
+        books, _, token = self.sync(limit=1)
+
+        self.assertEqual(books, ["Book 0", "Book 1", "Book 2"])
+        deleted_id = self.books[0].id
+        self.books[0].delete()
+        _, deleted, _ = self.sync(token)
+        self.assertEqual(deleted, [str(deleted_id)])
+
+    def test_expired_token(self):
+        old = timezone.now() - timezone.timedelta(days=31)
+        old = (old, self.books[0].id, old)
+
+        response = self.client.get(self.url, {"since": encode_token(old)})
+
+        self.assertEqual(response.status_code, status.HTTP_410_GONE)
+
+    def test_invalid_token(self):
+        response = self.client.get(self.url, {"since": "invalid"})
+
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_changes_are_read_from_the_indexes(self):
+        position = (timezone.now(), self.books[0].id)
+        for queryset, time_field, id_field, index in [
+            (Book.objects.all(), "updated_at", "id", "book_updated_idx"),
+            (
+                BookTombstone.objects.all(),
+                "deleted_at",
+                "book_id",
+                "booktombstone_deleted_idx",
+            ),
+        ]:
+            plan = filter_after(queryset, time_field, id_field, position).explain()
+            self.assertIn(f"USING INDEX {index} ({time_field}>?)", plan)
+            self.assertNotIn("TEMP B-TREE", plan)
+
+    def test_prune_book_tombstones(self):
+        pruned_id, kept_id = self.books[0].id, self.books[1].id
+        self.books[0].delete()
+        self.books[1].delete()
+        BookTombstone.objects.filter(book_id=pruned_id).update(
+            deleted_at=timezone.now() - timezone.timedelta(days=31)
+        )
+
+        out = StringIO()
+        call_command("prune_book_tombstones", stdout=out)
+
+        self.assertIn("Pruned 1 tombstone(s)", out.getvalue())
+        self.assertEqual(
+            list(BookTombstone.objects.values_list("book_id", flat=True)),
+            [kept_id],
+        )
@@ -0,0 +1,103 @@
+from django.urls import reverse
+from django.db import connection
+from django.core.cache import caches
+from django.test.utils import CaptureQueriesContext
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from api_v1.models import Book
+
+
+class ConditionalBookViewsTest(APITestCase):
+    def setUp(self):
+        caches["pages"].clear()
+        self.book = self.create_book("Tagged")
+        self.detail_url = reverse("retrieve-book", args=[self.book.id])
+        self.list_url = reverse("list-books")
+
+    def create_book(self, title):
+        return Book.objects.create(
+            title=title,
+            author="Author",
+            published_date="2024-01-01",
+            publisher="Publisher",
+            category="Fiction",
+        )
+
+    def get_revalidated(self, url, params=None):
+        etag = self.client.get(url, params)["ETag"]
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(url, params, HTTP_IF_NONE_MATCH=etag)
+        return response, queries
+
+    def test_unchanged_book_is_not_modified(self):
+        response, queries = self.get_revalidated(self.detail_url)
+
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+        self.assertEqual(response.content, b"")
+        self.assertTrue(response.has_header("ETag"))
+        # Only updated_at is read.
+        self.assertEqual(len(queries), 1)
+        self.assertIn('SELECT "api_v1_book"."updated_at"', queries[0]["sql"])
+
+    def test_unchanged_list_is_not_modified(self):
+        etag = self.client.get(self.list_url, {"limit": 5})["ETag"]
+        caches["pages"].clear()
+
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(
+                self.list_url, {"limit": 5}, HTTP_IF_NONE_MATCH=etag
+            )
+
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+        # The rows aren't loaded.
+        self.assertFalse(any('"api_v1_book"."title"' in q["sql"] for q in queries))
+
+    def test_cached_list_is_not_modified(self):
+        response, queries = self.get_revalidated(self.list_url, {"limit": 5})
+
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+        # Only the generation is read.
+        self.assertEqual(len(queries), 1)
+
+    def test_changes_modify_the_tags(self):
+        book_etag = self.client.get(self.detail_url)["ETag"]
+        list_etag = self.client.get(self.list_url)["ETag"]
+
+        self.book.title = "Retagged"
+        self.book.save()
+
+        response = self.client.get(self.detail_url, HTTP_IF_NONE_MATCH=book_etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertNotEqual(response["ETag"], book_etag)
+
+        response = self.client.get(self.list_url, HTTP_IF_NONE_MATCH=list_etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+    def test_deletes_modify_the_list_tag(self):
+        self.create_book("Latest")
+        etag = self.client.get(self.list_url)["ETag"]
+
+        # The latest update is kept, the count goes down.
+        self.book.delete()
+
+        response = self.client.get(self.list_url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+    def test_representations_have_their_own_tags(self):
+        etag = self.client.get(self.detail_url)["ETag"]
+
+        response = self.client.get(
+            self.detail_url, {"fields": "id"}, HTTP_IF_NONE_MATCH=etag
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(set(response.data), {"id"})
+
+    def test_missing_book_is_not_tagged(self):
+        url = reverse("retrieve-book", args=["00000000-0000-0000-0000-000000000000"])
+
+        response = self.client.get(url, HTTP_IF_NONE_MATCH="*")
+
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+        self.assertFalse(response.has_header("ETag"))
@@ -0,0 +1,125 @@
+import json
+from unittest import mock
+from django.urls import reverse
+from django.test import TestCase
+from django.db import connection
+from django.core.cache import caches
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APITestCase
+
+from api_v1.models import Book, BookCount
+from api_v1.counts import count_books, rebuild_book_counts
+from api_v1.pagination import KeysetPagination
+from api_v1.rbmq.event_handlers import handle_book_events
+
+
+def create_book(**kwargs):
+    defaults = {
+        "title": "Book",
+        "author": "Author",
+        "published_date": "2024-01-01",
+        "publisher": "Penguin",
+        "category": "Fiction",
+        "is_available": True,
+    }
+    defaults.update(kwargs)
+    return Book.objects.create(**defaults)
+
+
+class BookCountTest(TestCase):
+    def assertCountsMatchBooks(self):
+        counts = {
+            (row.is_available, row.category, row.publisher): row.count
+            for row in BookCount.objects.exclude(count=0)
+        }
+        rebuild_book_counts()
+        rebuilt = {
+            (row.is_available, row.category, row.publisher): row.count
+            for row in BookCount.objects.all()
+        }
+        self.assertEqual(counts, rebuilt)
+
+    def test_counts_follow_saves_and_deletes(self):
+        book = create_book()
+        create_book(category="fiction", publisher="PENGUIN")
+        create_book(category="History")
+        self.assertEqual(count_books(category="FICTION", publisher="penguin"), 2)
+
+        book.is_available = False
+        book.save()
+        self.assertEqual(count_books(is_available=True, category="fiction"), 1)
+        self.assertEqual(count_books(is_available=False), 1)
+
+        book.title = "Renamed"
+        book.save(update_fields=["title"])
+        book.delete()
+        self.assertEqual(count_books(), 2)
+        self.assertCountsMatchBooks()
+
+    def test_counts_follow_replicated_events(self):
+        book = create_book()
+        book_data = {
+            "id": str(book.id),
+            "title": book.title,
+            "author": book.author,
+            "is_available": False,
+        }
+        body = json.dumps({"action": "updated", "book": book_data})
+
+        handle_book_events(None, None, None, body)
+
+        self.assertEqual(count_books(is_available=False), 1)
+        self.assertEqual(count_books(is_available=True), 0)
+        self.assertCountsMatchBooks()
+
+
+class ListBooksCountTest(APITestCase):
+    def setUp(self):
+        create_book()
+        create_book(publisher="Vintage")
+        create_book(category="History")
+        create_book(is_available=False)
+
+    def get(self, **params):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(reverse("list-books"), {"limit": 1, **params})
+        self.assertFalse(any("COUNT(" in query["sql"] for query in queries))
+        return response
+
+    def test_count_of_available_books(self):
+        response = self.get()
+
+        self.assertEqual(response.data["count"], 3)
+        self.assertTrue(response.data["count_is_exact"])
+
+    def test_count_with_filters(self):
+        response = self.get(category="fiction", publisher="PENGUIN")
+
+        self.assertEqual(response.data["count"], 1)
+
+    def test_count_ignores_case_of_ascii_letters_only(self):
+        create_book(publisher="Ångström Press")
+
+        response = self.get(publisher="ångström press")
+        self.assertEqual(response.data["count"], 0)
+        self.assertEqual(response.data["results"], [])
+
+        response = self.get(publisher="ÅNGSTRÖM PRESS")
+        self.assertEqual(response.data["count"], 0)
+
+        response = self.get(publisher="Ångström press")
+        self.assertEqual(response.data["count"], 1)
+        self.assertEqual(len(response.data["results"]), 1)
+
+    def test_search_count_falls_back_to_bounded_count(self):
+        response = self.client.get(reverse("list-books"), {"search": "book"})
+
+        self.assertEqual(response.data["count"], 3)
+        self.assertTrue(response.data["count_is_exact"])
+
+        caches["pages"].clear()
+        with mock.patch.object(KeysetPagination, "count_limit", 2):
+            response = self.client.get(reverse("list-books"), {"search": "book"})
+
+        self.assertEqual(response.data["count"], 2)
+        self.assertFalse(response.data["count_is_exact"])
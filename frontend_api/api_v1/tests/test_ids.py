@@ -0,0 +1,158 @@
+import time
+from datetime import datetime, timezone
+from django.db import connection
+from django.db.migrations.executor import MigrationExecutor
+from django.test import SimpleTestCase, TestCase, TransactionTestCase
+
+from api_v1.ids import uuid7, uuid7_floor
+from api_v1.models import Book, BorrowedBook, User
+from api_v1.search import book_search_index, build_match_expression
+
+
+class UUID7Test(SimpleTestCase):
+    def test_version_and_variant(self):
+        value = uuid7()
+
+        self.assertEqual(value.version, 7)
+        self.assertEqual(value.variant, "specified in RFC 4122")
+
+    def test_ids_start_with_the_creation_time(self):
+        before = time.time_ns() // 1_000_000
+        value = uuid7()
+        after = time.time_ns() // 1_000_000
+
+        self.assertGreaterEqual(value.int >> 80, before)
+        self.assertLessEqual(value.int >> 80, after + 1)
+
+    def test_ids_are_strictly_increasing(self):
+        values = [uuid7() for _ in range(10000)]
+
+        self.assertEqual(values, sorted(set(values)))
+
+    def test_floor_is_before_the_ids_created_from_then(self):
+        floor = uuid7_floor(datetime.now(timezone.utc))
+        value = uuid7()
+
+        self.assertLess(floor, value)
+        self.assertLess(uuid7_floor(datetime(2024, 1, 1, tzinfo=timezone.utc)), floor)
+
+
+class CompactUUIDFieldTest(TestCase):
+    def setUp(self):
+        self.user = User.objects.create(email="user@example.com")
+        self.book = Book.objects.create(
+            title="Book",
+            author="Author",
+            published_date="2024-01-01",
+            publisher="Publisher",
+            category="Fiction",
+        )
+        self.borrowed_book = BorrowedBook.objects.create(
+            user=self.user, book=self.book, due_date="2024-01-15T00:00:00Z"
+        )
+
+    def test_ids_are_stored_in_16_bytes(self):
+        with connection.cursor() as cursor:
+            cursor.execute(
+                "SELECT typeof(id), length(id), typeof(book_id), length(book_id) "
+                "FROM api_v1_borrowedbook"
+            )
+            self.assertEqual(cursor.fetchone(), ("blob", 16, "blob", 16))
+
+    def test_ids_are_read_as_uuids(self):
+        borrowed_book = BorrowedBook.objects.select_related("book").get(
+            id=str(self.borrowed_book.id)
+        )
+
+        self.assertEqual(borrowed_book.book, self.book)
+        self.assertEqual(borrowed_book.book_id, self.book.id)
+        self.assertEqual(
+            list(BorrowedBook.objects.values_list("user_id", flat=True)),
+            [self.user.id],
+        )
+
+    def test_ids_are_ordered_by_creation(self):
+        later = Book.objects.create(
+            title="Later",
+            author="Author",
+            published_date="2024-01-01",
+            publisher="Publisher",
+            category="Fiction",
+        )
+
+        self.assertEqual(
+            list(Book.objects.order_by("id").values_list("id", flat=True)),
+            [self.book.id, later.id],
+        )
+        self.assertEqual(list(Book.objects.filter(id__gt=self.book.id)), [later])
+
+
+class CompactTimeOrderedIdsMigrationTest(TransactionTestCase):
+    migrate_from = [("api_v1", "0004_bookcount")]
+
+    def migrate(self, targets):
+        return MigrationExecutor(connection).migrate(targets).apps
+
+    def setUp(self):
+        self.migrate_to = MigrationExecutor(connection).loader.graph.leaf_nodes()
+        apps = self.migrate(self.migrate_from)
+        # Earlier versions installed the search index after every migration.
+        book_search_index.install(connection)
+
+        Book = apps.get_model("api_v1", "Book")
+        OutstandingToken = apps.get_model("token_blacklist", "OutstandingToken")
+        self.user = apps.get_model("api_v1", "User").objects.create(
+            email="user@example.com"
+        )
+        books = [
+            Book.objects.create(
+                title=title,
+                author="J. R. R. Tolkien",
+                published_date="2024-01-01",
+                publisher="Publisher",
+                category="fiction",
+            )
+            for title in ["Unfinished Tales", "The Hobbit"]
+        ]
+        # Leaves a gap in the rowids, which recreating the table closes.
+        books[0].delete()
+        self.book = books[1]
+        self.borrowed_book = apps.get_model("api_v1", "BorrowedBook").objects.create(
+            user=self.user, book=self.book, due_date="2024-01-15T00:00:00Z"
+        )
+        OutstandingToken.objects.create(
+            user=self.user,
+            jti="jti",
+            token="token",
+            expires_at="2024-01-15T00:00:00Z",
+        )
+
+    def tearDown(self):
+        self.migrate(self.migrate_to)
+
+    def test_ids_and_foreign_keys_are_stored_in_16_bytes(self):
+        self.migrate(self.migrate_to)
+
+        for table, column, value in [
+            ("api_v1_user", "id", self.user.id),
+            ("api_v1_book", "id", self.book.id),
+            ("api_v1_borrowedbook", "id", self.borrowed_book.id),
+            ("api_v1_borrowedbook", "user_id", self.user.id),
+            ("api_v1_borrowedbook", "book_id", self.book.id),
+            ("token_blacklist_outstandingtoken", "user_id", self.user.id),
+        ]:
+            with self.subTest(table=table, column=column):
+                with connection.cursor() as cursor:
+                    cursor.execute(f"SELECT {column} FROM {table}")
+                    self.assertEqual(cursor.fetchall(), [(value.bytes,)])
+
+        borrowed_book = BorrowedBook.objects.get()
+        self.assertEqual(borrowed_book.id, self.borrowed_book.id)
+        self.assertEqual(borrowed_book.book_id, self.book.id)
+
+    def test_search_index_is_rebuilt(self):
+        self.migrate(self.migrate_to)
+
+        match = build_match_expression(["hobbit"], book_search_index.columns)
+        books = book_search_index.search(Book.objects.all(), match)
+        self.assertEqual([book.id for book in books], [self.book.id])
@@ -0,0 +1,106 @@
+from datetime import timedelta
+from django.urls import reverse
+from django.utils import timezone
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APITestCase
+
+from api_v1.models import Book
+
+
+class KeysetPaginationTest(APITestCase):
+    def setUp(self):
+        now = timezone.now()
+        self.books = []
+        for i in range(7):
+            self.books.append(
+                Book.objects.create(
+                    title=f"Book {i}",
+                    author="Author",
+                    published_date="2024-01-01",
+                    publisher="Publisher",
+                    category="fiction" if i % 2 else "history",
+                )
+            )
+        # Books 2 to 4 share their updated_at, so pages must break ties by id.
+        for i, book in enumerate(self.books):
+            updated_at = now - timedelta(minutes=min(i, 2) if i < 5 else i)
+            Book.objects.filter(id=book.id).update(updated_at=updated_at)
+
+        self.expected = [
+            str(book.id)
+            for book in Book.objects.order_by("-updated_at", "-id")
+        ]
+
+    def walk(self, url, params=None, link="next"):
+        ids = []
+        while url:
+            response = self.client.get(url, params)
+            self.assertEqual(response.status_code, 200)
+            ids.extend(book["id"] for book in response.data["results"])
+            url, params = response.data[link], None
+        return ids, response
+
+    def test_pages_cover_every_book_once(self):
+        ids, _ = self.walk(reverse("list-books"), {"limit": 2})
+
+        self.assertEqual(ids, self.expected)
+
+    def test_previous_links_walk_back(self):
+        _, last_page = self.walk(reverse("list-books"), {"limit": 3})
+
+        ids, first_page = self.walk(last_page.data["previous"], link="previous")
+
+        self.assertEqual(ids, self.expected[3:6] + self.expected[:3])
+        self.assertIsNone(first_page.data["previous"])
+        self.assertIsNotNone(first_page.data["next"])
+
+    def test_cursors_keep_filters(self):
+        ids, _ = self.walk(reverse("list-books"), {"category": "fiction", "limit": 1})
+
+        fiction = {str(book.id) for book in self.books[1::2]}
+        self.assertEqual(
+            ids, [book_id for book_id in self.expected if book_id in fiction]
+        )
+
+    def test_rows_written_between_pages_do_not_shift_pages(self):
+        response = self.client.get(reverse("list-books"), {"limit": 3})
+        Book.objects.create(
+            title="New Book",
+            author="Author",
+            published_date="2024-01-01",
+            publisher="Publisher",
+            category="fiction",
+        )
+
+        ids, _ = self.walk(response.data["next"])
+
+        self.assertEqual(ids, self.expected[3:])
+
+    def test_invalid_cursor(self):
+        response = self.client.get(reverse("list-books"), {"cursor": "not-a-cursor"})
+
+        self.assertEqual(response.status_code, 404)
+
+    def test_page_is_read_from_the_index(self):
+        first_page = self.client.get(reverse("list-books"), {"limit": 2})
+
+        with CaptureQueriesContext(connection) as queries:
+            self.client.get(first_page.data["next"])
+
+        page_query = next(q["sql"] for q in queries if "ORDER BY" in q["sql"])
+        with connection.cursor() as cursor:
+            cursor.execute(f"EXPLAIN QUERY PLAN {page_query}")
+            plan = " ".join(row[-1] for row in cursor.fetchall())
+
+        self.assertIn("book_available_updated_idx", plan)
+        self.assertNotIn("TEMP B-TREE", plan)
+        self.assertNotIn("COUNT(", " ".join(q["sql"] for q in queries))
+
+    def test_search_results_keep_relevance_order(self):
+        Book.objects.filter(id=self.books[6].id).update(title="Dragons Dragons")
+        Book.objects.filter(id=self.books[0].id).update(title="Dragons and Other Book")
+
+        ids, _ = self.walk(reverse("list-books"), {"search": "dragons", "limit": 1})
+
+        self.assertEqual(ids, [str(self.books[6].id), str(self.books[0].id)])
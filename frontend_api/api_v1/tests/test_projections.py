@@ -0,0 +1,59 @@
+from django.test import TestCase
+from django.utils import timezone
+
+from api_v1.models import Book, BorrowedBook, User
+from api_v1.projections import (
+    BookProjection,
+    BorrowedBookProjection,
+    EventProjection,
+    UserProjection,
+)
+from api_v1.serializers import BookSerializer, UserSerializer
+
+
+class EventProjectionTest(TestCase):
+    def setUp(self):
+        self.user = User.objects.create(
+            email="testuser@example.com", first_name="Test", last_name="User"
+        )
+        self.book = Book.objects.create(
+            title="Test Book",
+            author="Test Author",
+            published_date="2024-01-01",
+            publisher="Test Publisher",
+            category="Fiction",
+        )
+        self.borrowed_book = BorrowedBook.objects.create(
+            user=self.user, book=self.book, due_date=timezone.now()
+        )
+
+    def test_project_book(self):
+        data = BookProjection.project(self.book)
+
+        self.assertEqual(set(data), set(BookSerializer(self.book).data))
+        self.assertEqual(data["id"], self.book.id)
+        self.assertEqual(data["title"], "Test Book")
+
+    def test_project_user(self):
+        data = UserProjection.project(self.user)
+
+        self.assertEqual(set(data), set(UserSerializer(self.user).data))
+        self.assertEqual(data["email"], self.user.email)
+        self.assertTrue(data["is_active"])
+
+    def test_project_borrowed_book_uses_foreign_key_ids(self):
+        borrowed_book = BorrowedBook.objects.get(id=self.borrowed_book.id)
+
+        with self.assertNumQueries(0):
+            data = BorrowedBookProjection.project(borrowed_book)
+
+        self.assertEqual(data["user"], self.user.id)
+        self.assertEqual(data["book"], self.book.id)
+        self.assertEqual(data["due_date"], borrowed_book.due_date)
+
+    def test_single_field_projection(self):
+        class BookTitleProjection(EventProjection):
+            model = Book
+            fields = ["title"]
+
+        self.assertEqual(BookTitleProjection.project(self.book), {"title": "Test Book"})
@@ -1,7 +1,12 @@
 import json
 from unittest import mock
 from django.test import TestCase
-from api_v1.models import Book
+from django.db import transaction
+from api_v1.models import Book, User
+from api_v1.rbmq import RBMQ
+from api_v1.rbmq.context import consuming_event
+from api_v1.rbmq.buffer import PendingEvent, merge_actions
+from api_v1.serializers import RegisterSerializer
 from api_v1.rbmq.event_handlers import handle_book_events
 
 
@@ -65,3 +70,183 @@ class HandleBookEventsTest(TestCase):
         mock_logger.info.assert_called_once_with(
             f"Deleted book: {self.book_data['title']} by {self.book_data['author']}"
         )
+
+
+class EchoSuppressionTest(TestCase):
+    def setUp(self):
+        self.book_data = {
+            "title": "Test Book",
+            "author": "Test Author",
+            "published_date": "2024-01-01",
+            "publisher": "Test Publisher",
+            "category": "Fiction",
+            "is_available": True,
+        }
+
+    @mock.patch("api_v1.signals.rbmq_client.publish_event")
+    def test_replicated_book_create_is_not_published(self, mock_publish):
+        body = json.dumps({"action": "created", "book": self.book_data})
+        handle_book_events(None, None, None, body)
+
+        self.assertTrue(Book.objects.filter(title="Test Book").exists())
+        mock_publish.assert_not_called()
+
+    @mock.patch("api_v1.signals.rbmq_client.publish_event")
+    def test_local_book_save_is_published(self, mock_publish):
+        with self.captureOnCommitCallbacks(execute=True):
+            Book.objects.create(**self.book_data)
+
+        mock_publish.assert_called_once()
+
+    def test_published_event_is_tagged_with_origin_and_causation(self):
+        client = RBMQ.__new__(RBMQ)
+        client.exchange_name = "frontend_api"
+        client.connection = mock.MagicMock(is_open=True)
+        client.channel = mock.MagicMock()
+
+        with consuming_event("incoming-event-id"):
+            ok = client.publish_event({"book": {}}, routing_key="book.updated")
+
+        self.assertTrue(ok)
+        properties = client.channel.basic_publish.call_args.kwargs["properties"]
+        self.assertEqual(properties.app_id, "frontend_api")
+        self.assertEqual(properties.correlation_id, "incoming-event-id")
+        self.assertIsNotNone(properties.message_id)
+
+
+class EventCoalescingTest(TestCase):
+    def test_merge_actions(self):
+        self.assertEqual(merge_actions("created", "updated"), "created")
+        self.assertEqual(merge_actions("updated", "updated"), "updated")
+        self.assertEqual(merge_actions("updated", "deleted"), "deleted")
+        self.assertEqual(merge_actions("deleted", "created"), "updated")
+        self.assertIsNone(merge_actions("created", "deleted"))
+
+    @mock.patch("api_v1.signals.rbmq_client.publish_event")
+    def test_register_publishes_single_user_event(self, mock_publish):
+        serializer = RegisterSerializer(
+            data={
+                "email": "test@example.com",
+                "password": "strongPassword123",
+                "password2": "strongPassword123",
+                "first_name": "John",
+                "last_name": "Doe",
+            }
+        )
+        serializer.is_valid(raise_exception=True)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            with transaction.atomic():
+                serializer.save()
+
+        mock_publish.assert_called_once()
+        self.assertEqual(mock_publish.call_args.kwargs["routing_key"], "user.created")
+
+    @mock.patch("api_v1.signals.rbmq_client.publish_event")
+    def test_events_of_rolled_back_savepoints_are_not_published(self, mock_publish):
+        with self.captureOnCommitCallbacks(execute=True):
+            with transaction.atomic():
+                user = User.objects.create(
+                    email="test@example.com", first_name="John", last_name="Doe"
+                )
+                with transaction.atomic():
+                    user.first_name = "Jane"
+                    user.save()
+                try:
+                    with transaction.atomic():
+                        User.objects.create(email="other@example.com")
+                        raise ValueError
+                except ValueError:
+                    pass
+
+        mock_publish.assert_called_once()
+        kwargs = mock_publish.call_args.kwargs
+        self.assertEqual(kwargs["routing_key"], "user.created")
+        self.assertEqual(kwargs["event_data"]["user"]["first_name"], "Jane")
+
+    @mock.patch("api_v1.signals.rbmq_client.publish_event")
+    def test_user_deleted_in_a_savepoint_is_published_deleted(self, mock_publish):
+        with self.captureOnCommitCallbacks(execute=True):
+            user = User.objects.create(
+                email="test@example.com", first_name="John", last_name="Doe"
+            )
+            with transaction.atomic():
+                user.delete()
+
+        routing_keys = [
+            call.kwargs["routing_key"] for call in mock_publish.call_args_list
+        ]
+        self.assertEqual(routing_keys[-1], "user.deleted")
+
+    @mock.patch("api_v1.signals.rbmq_client.publish_event")
+    def test_other_callbacks_keep_their_order(self, mock_publish):
+        callback = mock.Mock()
+        with self.captureOnCommitCallbacks() as callbacks:
+            user = User.objects.create(
+                email="test@example.com", first_name="John", last_name="Doe"
+            )
+            transaction.on_commit(callback)
+            with transaction.atomic():
+                user.first_name = "Jane"
+                user.save()
+
+        commits = [
+            index
+            for index, func in enumerate(callbacks)
+            if getattr(func, "__func__", None) is PendingEvent.commit
+        ]
+        self.assertLess(commits[0], callbacks.index(callback))
+        self.assertLess(callbacks.index(callback), commits[-1])
+        for func in callbacks:
+            func()
+        mock_publish.assert_called_once()
+        self.assertEqual(
+            mock_publish.call_args.kwargs["event_data"]["user"]["first_name"], "Jane"
+        )
+
+    @mock.patch("api_v1.signals.rbmq_client.publish_event")
+    def test_created_then_deleted_user_is_not_published(self, mock_publish):
+        with self.captureOnCommitCallbacks(execute=True):
+            user = User.objects.create(
+                email="test@example.com", first_name="John", last_name="Doe"
+            )
+            user.delete()
+
+        mock_publish.assert_not_called()
+
+    @mock.patch("api_v1.signals.rbmq_client.publish_event")
+    def test_deleted_user_event_keeps_id(self, mock_publish):
+        with self.captureOnCommitCallbacks(execute=True):
+            user = User.objects.create(
+                email="test@example.com", first_name="John", last_name="Doe"
+            )
+        user_id = user.id
+        mock_publish.reset_mock()
+
+        with self.captureOnCommitCallbacks(execute=True):
+            user.delete()
+
+        mock_publish.assert_called_once()
+        kwargs = mock_publish.call_args.kwargs
+        self.assertEqual(kwargs["routing_key"], "user.deleted")
+        self.assertEqual(kwargs["event_data"]["user"]["id"], user_id)
+
+    @mock.patch("api_v1.signals.rbmq_client.publish_event")
+    def test_rolled_back_events_are_discarded(self, mock_publish):
+        with self.captureOnCommitCallbacks(execute=True):
+            try:
+                with transaction.atomic():
+                    User.objects.create(
+                        email="test@example.com", first_name="John", last_name="Doe"
+                    )
+                    raise ValueError
+            except ValueError:
+                pass
+
+            User.objects.create(
+                email="other@example.com", first_name="Jane", last_name="Doe"
+            )
+
+        mock_publish.assert_called_once()
+        kwargs = mock_publish.call_args.kwargs
+        self.assertEqual(kwargs["event_data"]["user"]["email"], "other@example.com")
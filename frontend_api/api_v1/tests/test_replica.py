@@ -0,0 +1,134 @@
+import os
+import time
+import tempfile
+from django.urls import reverse
+from django.db import connections
+from django.http import HttpResponse
+from django.test import RequestFactory, TransactionTestCase
+from rest_framework.test import APIClient
+
+from api_v1.models import Book, User
+from api_v1.replica import (
+    REPLICA_DATABASE,
+    ReplicaRouter,
+    ReplicaRoutingMiddleware,
+    RoutingState,
+    _routing_state,
+    copy_to_replica,
+)
+
+
+class ReplicaTestCase(TransactionTestCase):
+    """
+    Runs against a primary and a replica held in two SQLite files. The
+    replica is configured once the test databases are set up, and copied
+    from the primary by each test.
+    """
+
+    @classmethod
+    def setUpClass(cls):
+        cls.directory = tempfile.TemporaryDirectory()
+        connections.settings[REPLICA_DATABASE] = {
+            **connections["default"].settings_dict,
+            "NAME": os.path.join(cls.directory.name, "replica.sqlite3"),
+        }
+        cls.databases = {*cls.databases, REPLICA_DATABASE}
+        super().setUpClass()
+
+    @classmethod
+    def tearDownClass(cls):
+        super().tearDownClass()
+        connections[REPLICA_DATABASE].close()
+        del connections[REPLICA_DATABASE]
+        del connections.settings[REPLICA_DATABASE]
+        cls.directory.cleanup()
+
+    def setUp(self):
+        self.client = APIClient()
+        self.book = Book.objects.create(
+            title="Replicated",
+            author="Author",
+            published_date="2024-01-01",
+            publisher="Publisher",
+            category="Fiction",
+        )
+        copy_to_replica()
+        # The replica lags behind this write.
+        Book.objects.filter(id=self.book.id).update(title="Written")
+
+
+class ReplicaRoutingTest(ReplicaTestCase):
+    def test_catalog_reads_are_served_by_the_replica(self):
+        response = self.client.get(reverse("list-books"))
+        self.assertEqual(response.data["results"][0]["title"], "Replicated")
+
+        response = self.client.get(reverse("retrieve-book", args=[self.book.id]))
+        self.assertEqual(response.data["title"], "Replicated")
+
+    def test_pinned_clients_read_from_the_primary(self):
+        self.client.cookies[ReplicaRoutingMiddleware.cookie_name] = str(time.time())
+
+        response = self.client.get(reverse("list-books"))
+        self.assertEqual(response.data["results"][0]["title"], "Written")
+
+    def test_expired_pins_are_ignored(self):
+        wrote_at = time.time() - 60
+        self.client.cookies[ReplicaRoutingMiddleware.cookie_name] = str(wrote_at)
+
+        response = self.client.get(reverse("list-books"))
+        self.assertEqual(response.data["results"][0]["title"], "Replicated")
+
+    def test_catalog_writes_pin_the_client(self):
+        def write(request):
+            Book.objects.filter(id=self.book.id).update(title="Written again")
+            return HttpResponse()
+
+        request = RequestFactory().post("/")
+        response = ReplicaRoutingMiddleware(write)(request)
+
+        self.assertIn(ReplicaRoutingMiddleware.cookie_name, response.cookies)
+
+    def test_other_writes_dont_pin_the_client(self):
+        def write(request):
+            User.objects.create(email="user@example.com")
+            return HttpResponse()
+
+        request = RequestFactory().post("/")
+        response = ReplicaRoutingMiddleware(write)(request)
+
+        self.assertNotIn(ReplicaRoutingMiddleware.cookie_name, response.cookies)
+
+
+class ReplicaRouterTest(ReplicaTestCase):
+    def route(self, state):
+        token = _routing_state.set(state)
+        self.addCleanup(_routing_state.reset, token)
+        return ReplicaRouter()
+
+    def test_only_catalog_reads_go_to_the_replica(self):
+        state = RoutingState()
+        state.replica_reads = True
+        router = self.route(state)
+
+        self.assertEqual(router.db_for_read(Book), REPLICA_DATABASE)
+        self.assertIsNone(router.db_for_read(User))
+
+    def test_reads_after_a_write_go_to_the_primary(self):
+        state = RoutingState()
+        state.replica_reads = True
+        router = self.route(state)
+
+        router.db_for_write(Book)
+
+        self.assertIsNone(router.db_for_read(Book))
+
+    def test_replica_instances_are_saved_to_the_primary(self):
+        book = Book.objects.using(REPLICA_DATABASE).get(id=self.book.id)
+        book.title = "Saved"
+        book.save()
+
+        self.assertEqual(Book.objects.get(id=self.book.id).title, "Saved")
+        self.assertEqual(
+            Book.objects.using(REPLICA_DATABASE).get(id=self.book.id).title,
+            "Replicated",
+        )
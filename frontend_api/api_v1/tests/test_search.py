@@ -0,0 +1,134 @@
+import json
+from django.test import TestCase
+from django.urls import reverse
+from django.db import connection
+from rest_framework.test import APITestCase
+
+from api_v1.models import Book
+from api_v1.rbmq.event_handlers import handle_book_events
+from api_v1.search import book_search_index, build_match_expression
+
+
+def create_book(title, author, **kwargs):
+    defaults = {
+        "published_date": "2024-01-01",
+        "publisher": "Publisher",
+        "category": "fiction",
+        "is_available": True,
+    }
+    defaults.update(kwargs)
+    return Book.objects.create(title=title, author=author, **defaults)
+
+
+class BuildMatchExpressionTest(TestCase):
+    def test_terms_are_quoted_and_combined(self):
+        self.assertEqual(
+            build_match_expression(["lord", 'ri"ngs'], ["title", "author"]),
+            '{title author} : "lord" AND {title author} : "ri""ngs"',
+        )
+
+    def test_prefix_and_column_terms(self):
+        self.assertEqual(
+            build_match_expression(["author:tolk*", "isbn:1"], ["title", "author"]),
+            '{author} : "tolk"* AND {title author} : "isbn:1"',
+        )
+
+    def test_empty_terms_are_skipped(self):
+        self.assertEqual(
+            build_match_expression(["*", "author:"], ["title", "author"]), ""
+        )
+
+
+class SearchIndexTest(TestCase):
+    def search(self, query):
+        match = build_match_expression(query.split(), book_search_index.columns)
+        return list(book_search_index.search(Book.objects.all(), match))
+
+    def test_search_is_driven_by_the_index(self):
+        match = build_match_expression(["tolk*"], book_search_index.columns)
+        queryset = book_search_index.search(Book.objects.filter(is_available=True), match)
+
+        plan = queryset.explain()
+        self.assertIn(f"SCAN {book_search_index.table} VIRTUAL TABLE INDEX", plan)
+        self.assertIn("SEARCH api_v1_book USING INTEGER PRIMARY KEY (rowid=?)", plan)
+
+    def test_index_follows_writes(self):
+        book = create_book("The Hobbit", "J. R. R. Tolkien")
+        self.assertEqual(self.search("hobbit"), [book])
+
+        Book.objects.filter(id=book.id).update(title="The Silmarillion")
+        self.assertEqual(self.search("hobbit"), [])
+        self.assertEqual(self.search("silmarillion"), [book])
+
+        book.delete()
+        self.assertEqual(self.search("silmarillion"), [])
+
+    def test_index_follows_replicated_events(self):
+        book = create_book("Dune", "Frank Herbert")
+        book_data = {"id": str(book.id), "title": "Dune Messiah", "author": book.author}
+        body = json.dumps({"action": "updated", "book": book_data})
+
+        handle_book_events(None, None, None, body)
+
+        self.assertEqual(self.search("messiah"), [book])
+
+    def test_title_matches_rank_above_author_matches(self):
+        by_author = create_book("Collected Stories", "Ray Bradbury")
+        by_title = create_book("Bradbury Country", "Someone Else")
+
+        self.assertEqual(self.search("bradbury"), [by_title, by_author])
+
+    def test_migrations_create_the_triggers(self):
+        with connection.cursor() as cursor:
+            cursor.execute(
+                "SELECT name, sql FROM sqlite_master WHERE type = 'trigger' "
+                f"AND tbl_name = '{book_search_index.content_table}'"
+            )
+            triggers = dict(cursor.fetchall())
+
+        for name, definition in book_search_index.get_triggers().items():
+            self.assertEqual(triggers[name], f"CREATE TRIGGER {name} {definition}")
+
+    def test_install_rebuilds_missing_triggers(self):
+        book = create_book("Emma", "Jane Austen")
+        with connection.cursor() as cursor:
+            cursor.execute(f"DROP TRIGGER {book_search_index.table}_au")
+        Book.objects.filter(id=book.id).update(title="Persuasion")
+
+        book_search_index.install(connection)
+
+        self.assertEqual(self.search("persuasion"), [book])
+        self.assertEqual(self.search("emma"), [])
+
+
+class ListBooksSearchTest(APITestCase):
+    def setUp(self):
+        self.hobbit = create_book("The Hobbit", "J. R. R. Tolkien")
+        self.silmarillion = create_book("The Silmarillion", "J. R. R. Tolkien")
+        self.dune = create_book("Dune", "Frank Herbert")
+        create_book("Unfinished Tales", "J. R. R. Tolkien", is_available=False)
+
+    def search(self, query):
+        response = self.client.get(reverse("list-books"), {"search": query})
+        return [book["title"] for book in response.data["results"]]
+
+    def test_search_by_author(self):
+        self.assertEqual(
+            sorted(self.search("tolkien")), ["The Hobbit", "The Silmarillion"]
+        )
+
+    def test_prefix_search(self):
+        self.assertEqual(self.search("hob*"), ["The Hobbit"])
+        self.assertEqual(self.search("hob"), [])
+
+    def test_column_search(self):
+        self.assertEqual(self.search("author:herb*"), ["Dune"])
+        self.assertEqual(self.search("title:herbert"), [])
+
+    def test_search_is_combined_with_filters(self):
+        response = self.client.get(
+            reverse("list-books"), {"search": "tolkien", "fields": "title"}
+        )
+
+        self.assertEqual(len(response.data["results"]), 2)
+        self.assertEqual(set(response.data["results"][0]), {"title"})
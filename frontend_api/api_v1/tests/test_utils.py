@@ -0,0 +1,99 @@
+import json
+from uuid import UUID, uuid4
+from decimal import Decimal
+from datetime import datetime, date
+from django.http import QueryDict
+from django.test import SimpleTestCase, TestCase
+from django.utils import timezone
+
+from api_v1.ids import uuid7
+from api_v1.models import Book
+from api_v1.projections import BookProjection
+from api_v1.utils import EventJSONEncoder, encode_event, normalize_query
+
+
+def convert_to_serializable(data):
+    """The recursive copy-then-dump conversion that encode_event replaced."""
+    if isinstance(data, dict):
+        return {key: convert_to_serializable(value) for key, value in data.items()}
+    elif isinstance(data, list):
+        return [convert_to_serializable(item) for item in data]
+    elif isinstance(data, (datetime, date)):
+        return data.isoformat()
+    elif isinstance(data, (Decimal, UUID)):
+        return str(data)
+    else:
+        return data
+
+
+class EncodeEventTest(TestCase):
+    def test_encodes_non_json_types(self):
+        book_id = uuid4()
+        now = timezone.now()
+        event_data = {
+            "book": {
+                "id": book_id,
+                "published_date": date(2024, 1, 1),
+                "updated_at": now,
+                "price": Decimal("9.99"),
+                "tags": [book_id],
+            }
+        }
+
+        decoded = json.loads(encode_event(event_data))
+
+        self.assertEqual(decoded["book"]["id"], str(book_id))
+        self.assertEqual(decoded["book"]["published_date"], "2024-01-01")
+        self.assertEqual(decoded["book"]["updated_at"], now.isoformat())
+        self.assertEqual(decoded["book"]["price"], "9.99")
+        self.assertEqual(decoded["book"]["tags"], [str(book_id)])
+
+    def test_matches_previous_conversion(self):
+        event_data = {"id": uuid4(), "at": timezone.now(), "n": [1, {"d": date.today()}]}
+
+        self.assertEqual(
+            json.loads(encode_event(event_data)),
+            convert_to_serializable(event_data),
+        )
+
+    def test_encodes_projected_instances(self):
+        now = timezone.now()
+        book = Book(
+            id=uuid7(),
+            title="Test Book",
+            published_date=date(2024, 1, 1),
+            created_at=now,
+            updated_at=now,
+        )
+
+        decoded = json.loads(encode_event({"book": BookProjection.project(book)}))
+
+        self.assertEqual(decoded["book"]["id"], str(book.id))
+        self.assertEqual(decoded["book"]["title"], "Test Book")
+        self.assertEqual(decoded["book"]["published_date"], "2024-01-01")
+        self.assertEqual(decoded["book"]["updated_at"], now.isoformat())
+
+    def test_unsupported_type_raises(self):
+        with self.assertRaises(TypeError):
+            encode_event({"value": object()})
+
+    def test_converter_is_cached_per_type(self):
+        class Timestamp(datetime):
+            pass
+
+        encode_event({"at": Timestamp(2024, 1, 1)})
+        self.assertIs(
+            EventJSONEncoder._converter_cache[Timestamp], datetime.isoformat
+        )
+
+
+class NormalizeQueryTest(SimpleTestCase):
+    def test_parameters_are_sorted_and_empty_ones_dropped(self):
+        self.assertEqual(
+            normalize_query(QueryDict("search=&limit=2&category=a&category=b")),
+            normalize_query(QueryDict("category=a&limit=2&category=b")),
+        )
+        self.assertNotEqual(
+            normalize_query(QueryDict("limit=2")),
+            normalize_query(QueryDict("limit=3")),
+        )
@@ -0,0 +1,71 @@
+from unittest import mock
+from django.test import TestCase
+from django.urls import reverse
+from rest_framework.renderers import JSONRenderer
+from drf_spectacular.generators import SchemaGenerator
+
+from api_v1.models import Book
+from api_v1.serializers import BookSerializer
+from api_v1.values import ValuesListSerializer
+
+
+def create_books(count):
+    Book.objects.bulk_create(
+        Book(
+            title=f"Book {i}",
+            author="Test Author",
+            published_date="2024-01-01",
+            publisher="Test Publisher",
+            category="Fiction",
+        )
+        for i in range(count)
+    )
+
+
+class ValuesListSerializerTest(TestCase):
+    def setUp(self):
+        create_books(3)
+
+    def test_matches_model_serializer_output(self):
+        books = list(Book.objects.all())
+        expected = [BookSerializer(book).data for book in books]
+
+        data = BookSerializer(Book.objects.all(), many=True).data
+
+        self.assertIsInstance(BookSerializer(many=True), ValuesListSerializer)
+        self.assertEqual(JSONRenderer().render(data), JSONRenderer().render(expected))
+
+    def test_accepts_model_instances(self):
+        books = list(Book.objects.all())
+
+        data = BookSerializer(books, many=True).data
+
+        self.assertEqual(data[0]["title"], books[0].title)
+
+    def test_list_books_view(self):
+        response = self.client.get(reverse("list-books"))
+
+        self.assertEqual(len(response.data["results"]), 3)
+        self.assertEqual(
+            set(response.data["results"][0]), set(BookSerializer().fields)
+        )
+
+    def test_schema_is_unchanged(self):
+        schema = SchemaGenerator().get_schema(request=None, public=True)
+
+        properties = schema["components"]["schemas"]["Book"]["properties"]
+        self.assertEqual(set(properties), set(BookSerializer().fields))
+
+
+class ValuesListSerializerPageTest(TestCase):
+    def setUp(self):
+        create_books(500)
+
+    def test_rows_are_rendered_without_model_instances(self):
+        expected = [BookSerializer(book).data for book in Book.objects.all()]
+
+        from_db = mock.patch.object(Book, "from_db", side_effect=AssertionError)
+        with from_db, self.assertNumQueries(1):
+            data = BookSerializer(Book.objects.all(), many=True).data
+
+        self.assertEqual(JSONRenderer().render(data), JSONRenderer().render(expected))
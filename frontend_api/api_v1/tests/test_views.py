@@ -1,10 +1,15 @@
 import uuid
+from datetime import timedelta
+from django.utils import timezone
 from django.urls import reverse
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
 from rest_framework import status
 from rest_framework.test import APITestCase
 from django.contrib.auth.hashers import make_password
 
-from api_v1.models import User, Book
+from api_v1.models import User, Book, BorrowedBook
+from api_v1.archive import archive_borrows
 
 
 class ListBooksViewTest(APITestCase):
@@ -35,6 +40,41 @@ class ListBooksViewTest(APITestCase):
         )
 
 
+    def test_list_books_sparse_fieldset(self):
+        fields = "id,title,author,is_available"
+
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(reverse("list-books"), {"fields": fields})
+
+        self.assertEqual(set(response.data["results"][0]), set(fields.split(",")))
+        page_query = queries[-1]["sql"]
+        self.assertIn('"author"', page_query)
+        self.assertNotIn('"publisher"', page_query)
+
+    def test_list_books_category_filter_is_case_insensitive(self):
+        response = self.client.get(reverse("list-books"), {"category": "FICTION"})
+
+        self.assertEqual(len(response.data["results"]), 1)
+
+    def test_list_books_publisher_filter_keeps_non_ascii_case(self):
+        self.available_book.publisher = "Ångström Press"
+        self.available_book.save()
+
+        for publisher, count in [
+            ("Ångström Press", 1),
+            ("ÅNGSTRöM PRESS", 1),
+            ("ångström press", 0),
+        ]:
+            response = self.client.get(reverse("list-books"), {"publisher": publisher})
+            self.assertEqual(len(response.data["results"]), count, publisher)
+
+    def test_list_books_excluding_fields(self):
+        response = self.client.get(reverse("list-books"), {"exclude": "category"})
+
+        self.assertIn("title", response.data["results"][0])
+        self.assertNotIn("category", response.data["results"][0])
+
+
 class RetrieveBookViewTest(APITestCase):
     def setUp(self):
         self.book = Book.objects.create(
@@ -51,6 +91,13 @@ class RetrieveBookViewTest(APITestCase):
         self.assertEqual(response.status_code, status.HTTP_200_OK)
         self.assertEqual(response.data["title"], self.book.title)
 
+    def test_retrieve_book_sparse_fieldset(self):
+        response = self.client.get(
+            reverse("retrieve-book", args=[self.book.id]), {"fields": "id,title"}
+        )
+
+        self.assertEqual(response.data, {"id": str(self.book.id), "title": "Test Book"})
+
     def test_retrieve_non_existent_book(self):
         response = self.client.get(reverse("retrieve-book", args=[uuid.uuid4()]))
         self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
@@ -93,6 +140,109 @@ class BorrowBookViewTest(APITestCase):
         self.assertIn("This book is not available.", str(response.content))
 
 
+class ListUserBorrowsViewTest(APITestCase):
+    def setUp(self):
+        self.user = User.objects.create(email="user@example.com")
+        now = timezone.now()
+
+        def borrow(user, is_available, due_in_days):
+            book = Book.objects.create(
+                title="Book",
+                author="Author",
+                published_date="2024-01-01",
+                publisher="Publisher",
+                category="Fiction",
+                is_available=is_available,
+            )
+            return BorrowedBook.objects.create(
+                user=user, book=book, due_date=now + timedelta(days=due_in_days)
+            )
+
+        self.active = borrow(self.user, False, 7)
+        self.returned = borrow(self.user, True, 3)
+        self.overdue = borrow(self.user, False, -1)
+        borrow(User.objects.create(email="other@example.com"), False, 5)
+
+        self.url = reverse("list-user-borrows")
+        self.client.force_authenticate(self.user)
+
+    def get_ids(self, **params):
+        response = self.client.get(self.url, params)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return [borrow["id"] for borrow in response.data["results"]]
+
+    def test_lists_own_borrows_by_due_date(self):
+        self.assertEqual(
+            self.get_ids(),
+            [str(self.active.id), str(self.returned.id), str(self.overdue.id)],
+        )
+
+    def test_active_and_overdue_filters(self):
+        self.assertEqual(self.get_ids(active="true"), [str(self.active.id)])
+        self.assertEqual(self.get_ids(overdue="true"), [str(self.overdue.id)])
+        self.assertEqual(
+            self.get_ids(active="false"),
+            [str(self.returned.id), str(self.overdue.id)],
+        )
+
+    def test_lists_archived_borrows(self):
+        returned = BorrowedBook.objects.create(
+            user=self.user,
+            book=self.returned.book,
+            due_date=timezone.now() - timedelta(days=60),
+        )
+        archive_borrows()
+
+        response = self.client.get(self.url)
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        borrows = {borrow["id"]: borrow for borrow in response.data["results"]}
+        self.assertEqual(
+            list(borrows),
+            [
+                str(self.active.id),
+                str(self.returned.id),
+                str(self.overdue.id),
+                str(returned.id),
+            ],
+        )
+        self.assertTrue(borrows[str(returned.id)]["archived"])
+        self.assertFalse(borrows[str(self.active.id)]["archived"])
+        self.assertEqual(
+            borrows[str(returned.id)]["created_at"],
+            returned.created_at.isoformat().replace("+00:00", "Z"),
+        )
+        self.assertIn("updated_at", borrows[str(self.active.id)])
+        self.assertEqual(self.get_ids(overdue="true"), [str(self.overdue.id)])
+
+    def test_archived_later_borrows_return_earlier_ones(self):
+        # The overdue book was borrowed again since, by a borrow archived
+        # since too, which is the one overdue now.
+        later = BorrowedBook.objects.create(
+            user=self.user,
+            book=self.overdue.book,
+            due_date=timezone.now() - timedelta(days=400),
+        )
+        archive_borrows()
+
+        self.assertEqual(self.get_ids(overdue="true"), [str(later.id)])
+
+    def test_sparse_fieldset_reads_only_its_columns(self):
+        archive_borrows()
+
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(self.url, {"fields": "id,archived"})
+
+        self.assertEqual(set(response.data["results"][0]), {"id", "archived"})
+        self.assertFalse(any('"borrowed_date"' in query["sql"] for query in queries))
+
+    def test_requires_authentication(self):
+        self.client.force_authenticate(None)
+
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+
+
 class RegisterViewTest(APITestCase):
     def setUp(self):
         self.register_url = reverse("register-user")
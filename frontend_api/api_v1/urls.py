@@ -5,16 +5,26 @@ from api_v1.views import (
     LogoutView,
     RegisterView,
     ListBooksView,
+    ListBookChangesView,
+    BookAvailabilityStreamView,
     BorrowBookView,
     JWTRefreshView,
     RetrieveBookView,
+    ListUserBorrowsView,
 )
 
 
 urlpatterns = [
     path("books/", ListBooksView.as_view(), name="list-books"),
+    path("books/changes/", ListBookChangesView.as_view(), name="list-book-changes"),
+    path(
+        "books/availability/",
+        BookAvailabilityStreamView.as_view(),
+        name="book-availability-stream",
+    ),
     path("books/<uuid:pk>/", RetrieveBookView.as_view(), name="retrieve-book"),
     path("borrow/", BorrowBookView.as_view(), name="borrow-book"),
+    path("user/borrows/", ListUserBorrowsView.as_view(), name="list-user-borrows"),
     path("user/register/", RegisterView.as_view(), name="register-user"),
     path("user/login/", LoginView.as_view(), name="login"),
     path("user/logout/", LogoutView.as_view(), name="logout"),
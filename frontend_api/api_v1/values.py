@@ -0,0 +1,224 @@
+from datetime import date, timezone as dt_timezone
+from django.db.models import QuerySet
+from django.db.models.query import ValuesListIterable
+from django.core.exceptions import ImproperlyConfigured
+from rest_framework import ISO_8601, fields, mixins, relations, serializers
+from rest_framework.response import Response
+from rest_framework.settings import api_settings
+
+# Serializer fields whose representation of a database value is the value
+# itself, so rows can be rendered without calling `to_representation`.
+PASSTHROUGH_FIELDS = (
+    fields.BooleanField,
+    fields.CharField,
+    fields.IntegerField,
+    fields.FloatField,
+    relations.PrimaryKeyRelatedField,
+)
+
+
+def is_utc(tz):
+    return tz is dt_timezone.utc or getattr(tz, "key", None) in ("UTC", "Etc/UTC")
+
+
+def is_iso_8601(output_format):
+    return isinstance(output_format, str) and output_format.lower() == ISO_8601
+
+
+def datetime_to_iso_8601(value):
+    """Render an aware UTC datetime the way `DateTimeField` does."""
+    value = value.isoformat()
+    if value.endswith("+00:00"):
+        value = value[:-6] + "Z"
+    return value
+
+
+def get_converter(field):
+    """
+    Return a function rendering a database value of `field`, or None if the
+    value can be used as is.
+    """
+    if isinstance(field, relations.PrimaryKeyRelatedField) and field.pk_field:
+        return field.pk_field.to_representation
+
+    if isinstance(field, PASSTHROUGH_FIELDS):
+        return None
+
+    if isinstance(field, fields.UUIDField) and field.uuid_format == "hex_verbose":
+        return str
+
+    if isinstance(field, fields.DateTimeField):
+        output_format = getattr(field, "format", api_settings.DATETIME_FORMAT)
+        field_timezone = getattr(field, "timezone", None) or field.default_timezone()
+        # Database datetimes are aware and in UTC, so with a UTC field
+        # timezone `enforce_timezone` would leave them unchanged.
+        if is_iso_8601(output_format) and is_utc(field_timezone):
+            return datetime_to_iso_8601
+
+    if isinstance(field, fields.DateField):
+        output_format = getattr(field, "format", api_settings.DATE_FORMAT)
+        if is_iso_8601(output_format):
+            return date.isoformat
+
+    return field.to_representation
+
+
+def get_serializer_columns(serializer, prefix=""):
+    """
+    Return the model columns read by a model serializer and its nested model
+    serializers, for `.only()`, or None if some field may read any column.
+    Fields named in `Meta.columnless_fields` read no column.
+    """
+    values_fields = getattr(serializer.Meta, "values_fields", {})
+    columnless_fields = getattr(serializer.Meta, "columnless_fields", ())
+
+    columns = []
+    for name, field in serializer.fields.items():
+        if field.write_only or name in columnless_fields:
+            continue
+
+        if name in values_fields:
+            source = values_fields[name][0]
+            if not isinstance(source, str):
+                return None
+            columns.append(prefix + source)
+        elif isinstance(field, serializers.ModelSerializer):
+            nested = get_serializer_columns(field, f"{prefix}{field.source}__")
+            if nested is None:
+                return None
+            columns.append(prefix + field.source)
+            columns.extend(nested)
+        elif (
+            field.source == "*"
+            or "." in field.source
+            or isinstance(field, (serializers.BaseSerializer, fields.SerializerMethodField))
+        ):
+            return None
+        else:
+            columns.append(prefix + field.source)
+
+    return columns
+
+
+class ValuesReader:
+    """
+    Renders `values_list()` rows of a queryset with the output of a model
+    serializer, compiled once per serializer class.
+
+    Serializer method fields are supported when the serializer declares them
+    in `Meta.values_fields` as `{name: (source, converter)}`, where `source`
+    is a column name or a query expression to annotate. The converter
+    receives the value, including None.
+    """
+
+    def __init__(self, serializer):
+        values_fields = getattr(serializer.Meta, "values_fields", {})
+
+        self.names = []
+        self.columns = []
+        self.annotations = {}
+        self.converters = []
+        self.values_field_converters = []
+
+        for name, field in serializer.fields.items():
+            if field.write_only:
+                continue
+
+            if name in values_fields:
+                source, converter = values_fields[name]
+                if isinstance(source, str):
+                    self.columns.append(source)
+                else:
+                    self.annotations[name] = source
+                    self.columns.append(name)
+                self.values_field_converters.append((name, converter))
+            elif field.source == "*" or "." in field.source or isinstance(
+                field, (serializers.BaseSerializer, fields.SerializerMethodField)
+            ):
+                raise ImproperlyConfigured(
+                    f"{type(serializer).__name__}.{name} can't be read from "
+                    "values; declare it in Meta.values_fields."
+                )
+            else:
+                self.columns.append(field.source)
+                converter = get_converter(field)
+                if converter is not None:
+                    self.converters.append((name, converter))
+
+            self.names.append(name)
+
+    def values_queryset(self, queryset):
+        if self.annotations:
+            queryset = queryset.annotate(**self.annotations)
+        return queryset.values_list(*self.columns)
+
+    def read(self, row):
+        item = dict(zip(self.names, row))
+
+        for name, convert in self.converters:
+            value = item[name]
+            if value is not None:
+                item[name] = convert(value)
+
+        for name, convert in self.values_field_converters:
+            item[name] = convert(item[name])
+
+        return item
+
+
+class ValuesListSerializer(serializers.ListSerializer):
+    """
+    Read-only list serializer that renders rows fetched with `values_list()`
+    instead of model instances, skipping model instantiation and the
+    per-field `to_representation` calls.
+
+    Set it as `Meta.list_serializer_class` of a model serializer. The child
+    serializer still describes the output, so the OpenAPI schema is unchanged.
+    Model instances are still accepted and rendered by the child serializer.
+    """
+
+    _readers = {}
+
+    def get_reader(self):
+        # Readers are keyed by field names as well, since the fields of a
+        # serializer may depend on the request (see SparseFieldsetMixin).
+        key = (type(self.child), tuple(self.child.fields))
+        reader = self._readers.get(key)
+        if reader is None:
+            reader = self._readers[key] = ValuesReader(self.child)
+        return reader
+
+    def values_queryset(self, queryset):
+        return self.get_reader().values_queryset(queryset)
+
+    def to_representation(self, data):
+        if isinstance(data, QuerySet):
+            if data._iterable_class is not ValuesListIterable:
+                data = self.values_queryset(data)
+        elif data and not isinstance(data[0], tuple):
+            return super().to_representation(data)
+
+        read = self.get_reader().read
+        return [read(row) for row in data]
+
+
+class ValuesListModelMixin(mixins.ListModelMixin):
+    """
+    List a queryset through `ValuesListSerializer` when the view's serializer
+    uses it, fetching the page as `values_list()` rows.
+    """
+
+    def list(self, request, *args, **kwargs):
+        queryset = self.filter_queryset(self.get_queryset())
+
+        list_serializer = self.get_serializer([], many=True)
+        if isinstance(list_serializer, ValuesListSerializer):
+            queryset = list_serializer.values_queryset(queryset)
+
+        page = self.paginate_queryset(queryset)
+        if page is not None:
+            serializer = self.get_serializer(page, many=True)
+            return self.get_paginated_response(serializer.data)
+
+        serializer = self.get_serializer(queryset, many=True)
+        return Response(serializer.data)
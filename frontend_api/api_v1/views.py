@@ -1,13 +1,17 @@
+import uuid
 from django.utils import timezone
+from django.db import transaction
+from django.views import View
+from django.core.handlers.asgi import ASGIRequest
+from django.http import JsonResponse, StreamingHttpResponse
 from datetime import timedelta, datetime
-from drf_spectacular.utils import extend_schema
+from drf_spectacular.utils import OpenApiParameter, extend_schema
 from django.utils.decorators import method_decorator
 from django_filters.rest_framework import DjangoFilterBackend
 from django.views.decorators.debug import sensitive_post_parameters
 from rest_framework import status
 from rest_framework.response import Response
-from rest_framework.filters import SearchFilter
-from rest_framework_simplejwt.tokens import RefreshToken
+from rest_framework.exceptions import ValidationError
 from rest_framework_simplejwt.exceptions import TokenError
 from rest_framework_simplejwt.views import TokenRefreshView
 from rest_framework.permissions import AllowAny, IsAuthenticated
@@ -18,35 +22,195 @@ from rest_framework.generics import (
     GenericAPIView,
 )
 
-from api_v1.filters import BookFilter
-from api_v1.models import User, Book, BorrowedBook
+from api_v1.filters import BookFilter, BorrowedBookFilter
+from api_v1.writer import run_write
+from api_v1.blacklist import RefreshToken
+from api_v1.changes import decode_token, encode_token, get_book_changes
+from api_v1.availability import stream_availability
+from api_v1.caching import GenerationCacheMixin
+from api_v1.conditional import ConditionalListMixin, ConditionalRetrieveMixin
+from api_v1.replica import ReplicaReadMixin
+from api_v1.counts import count_filtered_books
+from api_v1.pagination import DueDatePagination, MergedListModelMixin
+from api_v1.search import FullTextSearchFilter, book_search_index
+from api_v1.values import ValuesListModelMixin
+from api_v1.fieldsets import SPARSE_FIELDSET_PARAMETERS, ColumnPruningMixin
+from api_v1.models import User, Book, BorrowedBook, BorrowedBookHistory
 from api_v1.serializers import (
     BookSerializer,
+    BookChangesSerializer,
     BorrowedBookSerializer,
+    BorrowHistorySerializer,
     RegisterSerializer,
     LoginSerializer,
     LogoutSerializer,
+    JWTRefreshSerializer,
     UserSerializer,
 )
 
 
-@extend_schema(tags=["Frontend_api"], summary="List all available books")
-class ListBooksView(ListAPIView):
+@extend_schema(
+    tags=["Frontend_api"],
+    summary="List all available books",
+    parameters=SPARSE_FIELDSET_PARAMETERS,
+)
+@method_decorator(transaction.non_atomic_requests, name="dispatch")
+class ListBooksView(
+    GenerationCacheMixin,
+    ConditionalListMixin,
+    ReplicaReadMixin,
+    ColumnPruningMixin,
+    ValuesListModelMixin,
+    ListAPIView,
+):
     queryset = Book.objects.filter(is_available=True)
     serializer_class = BookSerializer
 
-    search_fields = ["title"]
+    search_index = book_search_index
+    search_fields = ["title", "author"]
     filterset_class = BookFilter
-    filter_backends = [DjangoFilterBackend, SearchFilter]
+    filter_backends = [DjangoFilterBackend, FullTextSearchFilter]
+
+    def get_row_count(self, request):
+        return count_filtered_books(self, request, is_available=True)
 
 
-@extend_schema(tags=["Frontend_api"], summary="Get a single book by its ID")
-class RetrieveBookView(RetrieveAPIView):
+@extend_schema(
+    tags=["Frontend_api"],
+    summary="Get a single book by its ID",
+    parameters=SPARSE_FIELDSET_PARAMETERS,
+)
+@method_decorator(transaction.non_atomic_requests, name="dispatch")
+class RetrieveBookView(
+    ConditionalRetrieveMixin, ReplicaReadMixin, ColumnPruningMixin, RetrieveAPIView
+):
     queryset = Book.objects.all()
     serializer_class = BookSerializer
 
 
+@extend_schema(
+    tags=["Frontend_api"],
+    summary="List the books changed since a token",
+    parameters=[
+        OpenApiParameter(
+            name="since",
+            type=str,
+            description="Token of the previous changes; all books without it.",
+        ),
+        OpenApiParameter(
+            name="limit",
+            type=int,
+            description="Number of changes to return.",
+        ),
+    ],
+)
+@method_decorator(transaction.non_atomic_requests, name="dispatch")
+class ListBookChangesView(GenericAPIView):
+    """
+    Change feed for clients keeping a copy of the catalog: the books
+    created or updated and the ids of the books deleted since the `since`
+    token, and the token to ask for the next changes with.
+    """
+
+    serializer_class = BookChangesSerializer
+    default_limit = 100
+    max_limit = 1000
+
+    def get_limit(self, request):
+        try:
+            limit = int(request.query_params["limit"])
+        except (KeyError, ValueError):
+            return self.default_limit
+        return min(max(limit, 1), self.max_limit)
+
+    def get(self, request, *args, **kwargs):
+        since = request.query_params.get("since")
+        since = decode_token(since) if since else None
+
+        books, deleted, cursor, has_more = get_book_changes(
+            since, self.get_limit(request)
+        )
+
+        serializer = self.get_serializer(
+            {
+                "books": books,
+                "deleted": deleted,
+                "token": encode_token(cursor),
+                "has_more": has_more,
+            }
+        )
+        return Response(serializer.data)
+
+
+@method_decorator(transaction.non_atomic_requests, name="dispatch")
+class BookAvailabilityStreamView(View):
+    """
+    Server-sent events of the books becoming available or unavailable, of
+    all books or of the ones in `?book=`. Clients resume after reconnecting
+    from the `Last-Event-ID` header. Served by ASGI servers only: a WSGI
+    server would hold a worker for as long as each stream stays open.
+    """
+
+    async def get(self, request):
+        if not isinstance(request, ASGIRequest):
+            return JsonResponse(
+                {"detail": "The availability stream is only served over ASGI."},
+                status=status.HTTP_501_NOT_IMPLEMENTED,
+            )
+
+        try:
+            book_ids = {uuid.UUID(value) for value in request.GET.getlist("book")}
+            last_event_id = request.headers.get("Last-Event-ID")
+            if last_event_id is not None:
+                last_event_id = int(last_event_id)
+        except ValueError:
+            return JsonResponse(
+                {"detail": "Invalid book id or Last-Event-ID."},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
+        response = StreamingHttpResponse(
+            stream_availability(book_ids, last_event_id),
+            content_type="text/event-stream",
+        )
+        response["Cache-Control"] = "no-cache"
+        # Stops proxies from buffering the events.
+        response["X-Accel-Buffering"] = "no"
+        return response
+
+
+@extend_schema(
+    tags=["Frontend_api"],
+    summary="List the borrows of the current user",
+    parameters=SPARSE_FIELDSET_PARAMETERS,
+)
+@method_decorator(transaction.non_atomic_requests, name="dispatch")
+class ListUserBorrowsView(ColumnPruningMixin, MergedListModelMixin, ListAPIView):
+    """Borrows of the current user, archived ones included (see api_v1.archive)."""
+
+    permission_classes = [IsAuthenticated]
+    queryset = BorrowedBook.objects.all()
+    serializer_class = BorrowHistorySerializer
+
+    filterset_class = BorrowedBookFilter
+    filter_backends = [DjangoFilterBackend]
+    pagination_class = DueDatePagination
+
+    def get_querysets(self):
+        user = self.request.user
+        return [
+            self.get_queryset().filter(user=user),
+            self.prune_columns(BorrowedBookHistory.objects.filter(user=user)),
+        ]
+
+
+# The views below write through run_write(), which holds the write lock for
+# the write only, or commits it with other writes (see api_v1.writer), so
+# they don't run in a request transaction.
+
+
 @extend_schema(tags=["Frontend_api"], summary="Borrow book by id")
+@method_decorator(transaction.non_atomic_requests, name="dispatch")
 class BorrowBookView(CreateAPIView):
     permission_classes = []
     queryset = BorrowedBook.objects.all()
@@ -54,9 +218,16 @@ class BorrowBookView(CreateAPIView):
 
     def perform_create(self, serializer):
         serializer.is_valid(raise_exception=True)
+        run_write(self.borrow, serializer)
+
+    def borrow(self, serializer):
         data = serializer.validated_data
 
         book = data["book"]
+        # The book was validated outside of this transaction.
+        book.refresh_from_db(fields=["is_available"])
+        if not book.is_available:
+            raise ValidationError({"book": ["This book is not available."]})
 
         borrow_days = data.pop("days")
         due_date = timezone.now() + timedelta(days=borrow_days)
@@ -100,7 +271,19 @@ def get_login_data(user):
     return data
 
 
+def register(serializer):
+    user = serializer.save(is_active=True)
+    return get_login_data(user)
+
+
+def log_in(user):
+    user.last_login = timezone.now()
+    user.save(update_fields=["last_login", "updated_at"])
+    return get_login_data(user)
+
+
 @extend_schema(tags=["Auth"], summary="Enroll user into the library")
+@method_decorator(transaction.non_atomic_requests, name="dispatch")
 class RegisterView(CreateAPIView):
     queryset = User.objects.all()
     permission_classes = (AllowAny,)
@@ -114,14 +297,13 @@ class RegisterView(CreateAPIView):
         serializer = self.get_serializer(data=request.data)
         serializer.is_valid(raise_exception=True)
 
-        user = serializer.save(is_active=True)
-
-        login_data = get_login_data(user)
+        login_data = run_write(register, serializer)
 
         return Response(login_data, status=status.HTTP_201_CREATED)
 
 
 @extend_schema(tags=["Auth"])
+@method_decorator(transaction.non_atomic_requests, name="dispatch")
 class LoginView(GenericAPIView):
     permission_classes = (AllowAny,)
     serializer_class = LoginSerializer
@@ -136,10 +318,7 @@ class LoginView(GenericAPIView):
         self.serializer.is_valid(raise_exception=True)
 
         user = self.serializer.validated_data["user"]
-        user.last_login = timezone.now()
-        user.save()
-
-        data = get_login_data(user)
+        data = run_write(log_in, user)
 
         return Response(data, status=status.HTTP_200_OK)
 
@@ -187,4 +366,4 @@ class LogoutView(GenericAPIView):
 
 @extend_schema(tags=["Auth"])
 class JWTRefreshView(TokenRefreshView):
-    pass
+    serializer_class = JWTRefreshSerializer
@@ -0,0 +1,155 @@
+import time
+import queue
+import logging
+import threading
+import contextvars
+from concurrent.futures import Future
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS, connections, transaction
+
+logger = logging.getLogger("api_v1")
+
+_STOP = object()
+
+
+class GroupCommitWriter:
+    """
+    Runs write functions submitted from any thread on a single writer
+    thread, committing them in groups of up to `max_writes` writes, or of
+    the writes submitted within `max_delay` seconds of the first one.
+
+    SQLite has one write lock, so concurrent writers each wait for it to
+    commit their own small transaction. Funnelling the writes into one
+    transaction per group pays for the lock and the commit once per group.
+
+    Each write runs in a savepoint, so a failing write is rolled back
+    without failing the rest of its group. Futures are resolved once the
+    group is committed, and `on_commit` callbacks run after that commit.
+    """
+
+    def __init__(self, max_writes=64, max_delay=0, using=DEFAULT_DB_ALIAS):
+        self.max_writes = max_writes
+        self.max_delay = max_delay
+        self.using = using
+
+        self._queue = queue.SimpleQueue()
+        self._thread = threading.Thread(
+            target=self._run, name="group-commit-writer", daemon=True
+        )
+        self._thread.start()
+
+    def is_writer_thread(self):
+        return threading.current_thread() is self._thread
+
+    def submit(self, function, *args, **kwargs):
+        """
+        Schedule `function(*args, **kwargs)` on the writer thread and return
+        a future of its result. It runs in a copy of the caller's context.
+        """
+        future = Future()
+        context = contextvars.copy_context()
+        self._queue.put((future, context, function, args, kwargs))
+        return future
+
+    def stop(self):
+        """Commit the writes already submitted and stop the writer thread."""
+        self._queue.put(_STOP)
+        self._thread.join()
+
+    def _run(self):
+        stopping = False
+        while not stopping:
+            item = self._queue.get()
+            if item is _STOP:
+                break
+
+            group = [item]
+            deadline = time.monotonic() + self.max_delay
+            while len(group) < self.max_writes:
+                try:
+                    item = self._queue.get(timeout=max(deadline - time.monotonic(), 0))
+                except queue.Empty:
+                    break
+                if item is _STOP:
+                    stopping = True
+                    break
+                group.append(item)
+
+            self._commit(group)
+
+        connections[self.using].close()
+
+    def _commit(self, group):
+        connection = connections[self.using]
+        connection.close_if_unusable_or_obsolete()
+
+        outcomes = []
+        try:
+            with transaction.atomic(using=self.using):
+                for future, context, function, args, kwargs in group:
+                    if not future.set_running_or_notify_cancel():
+                        continue
+                    try:
+                        with transaction.atomic(using=self.using):
+                            result = context.run(function, *args, **kwargs)
+                    except Exception as e:
+                        outcomes.append((future, None, e))
+                    else:
+                        outcomes.append((future, result, None))
+        except Exception as e:
+            logger.exception(f"Failed to commit a group of {len(group)} write(s)")
+            for future, *_ in group:
+                if not future.done():
+                    future.set_exception(e)
+            return
+
+        for future, result, error in outcomes:
+            if error is None:
+                future.set_result(result)
+            else:
+                future.set_exception(error)
+
+
+_writer = None
+_writer_lock = threading.Lock()
+
+
+def get_writer():
+    """
+    Return the process' GroupCommitWriter, started on first use, or None
+    unless `settings.GROUP_COMMIT["ENABLED"]` is set.
+    """
+    global _writer
+
+    options = getattr(settings, "GROUP_COMMIT", {})
+    if not options.get("ENABLED"):
+        return None
+
+    with _writer_lock:
+        if _writer is None:
+            _writer = GroupCommitWriter(
+                max_writes=options.get("MAX_WRITES", 64),
+                max_delay=options.get("MAX_DELAY_MS", 0) / 1000,
+            )
+    return _writer
+
+
+def run_write(function, *args, **kwargs):
+    """
+    Run `function(*args, **kwargs)` as one write and return its result.
+
+    With group commit enabled it is committed with other writes by the
+    writer thread. Otherwise, or when called inside a transaction, whose
+    lock the writer thread would wait for, it runs in `transaction.atomic()`
+    on the calling thread.
+    """
+    writer = get_writer()
+    if (
+        writer is None
+        or writer.is_writer_thread()
+        or transaction.get_connection().in_atomic_block
+    ):
+        with transaction.atomic():
+            return function(*args, **kwargs)
+
+    return writer.submit(function, *args, **kwargs).result()
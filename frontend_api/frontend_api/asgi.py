@@ -9,8 +9,14 @@ https://docs.djangoproject.com/en/5.1/howto/deployment/asgi/
 
 import os
 
+from django.conf import settings
 from django.core.asgi import get_asgi_application
+from django.contrib.staticfiles.handlers import ASGIStaticFilesHandler
 
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'frontend_api.settings')
 
 application = get_asgi_application()
+
+# Serve the static files in development, like runserver did.
+if settings.DEBUG:
+    application = ASGIStaticFilesHandler(application)
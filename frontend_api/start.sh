@@ -2,6 +2,7 @@
 
 python manage.py migrate
 
-python manage.py runserver 0.0.0.0:8000 &
+# ASGI, which the availability stream (api_v1.availability) needs.
+uvicorn frontend_api.asgi:application --host 0.0.0.0 --port 8000 &
 
 python manage.py runrabbitmq